@@ -0,0 +1,102 @@
+import io
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "example")))
+
+from example_classes import Customer
+from example_classes import Order
+from example_classes import OrderProduct
+from example_classes import Payment
+from example_classes import Product
+
+from fake_schema_generator import ChangeStream
+from fake_schema_generator import FakeSchemaGenerator
+
+MODELS = (Customer, Product, Order, OrderProduct, Payment)
+ROWS = 20_000
+CHANGES = 200_000
+# The statuses cycle, so the rows that can change don't run out.
+ORDER_STATUSES = {"Pending": "Shipped", "Shipped": "Delivered", "Delivered": "Returned", "Returned": "Pending"}
+PAYMENT_STATUSES = {"Pending": "Paid", "Paid": "Failed", "Failed": "Pending"}
+
+
+def status_updates(stream: ChangeStream) -> None:
+    stream.update(Order, "status", ORDER_STATUSES, weight=5)
+    stream.update(Payment, "status", PAYMENT_STATUSES, weight=3)
+
+
+def aggregate_updates(stream: ChangeStream) -> None:
+    # Every change updates the total of an order and the amount of its payments.
+    stream.update(OrderProduct, "quantity")
+
+
+def mixed(stream: ChangeStream) -> None:
+    stream.update(Order, "status", ORDER_STATUSES, weight=5)
+    stream.update(Payment, "status", PAYMENT_STATUSES, weight=3)
+    stream.update(OrderProduct, "quantity")
+    stream.delete(Order, weight=0.01)
+
+
+def run(sg: FakeSchemaGenerator, declare, write: bool) -> tuple[int, float]:
+    """
+    Time generating `CHANGES` changes against the rows of `sg`.
+
+    Args:
+        sg (FakeSchemaGenerator): The generator, with its rows generated.
+        declare (Callable): Declares the kinds of change of the stream.
+        write (bool): Whether to write the events to NDJSON, in memory, or only generate them.
+
+    Returns:
+        tuple[int, float]: The number of events and the time taken in seconds.
+    """
+    stream = ChangeStream(sg, seed=0)
+    declare(stream)
+    # Read the tables and find the rows each kind of change can change before timing.
+    for _ in stream.events(0):
+        pass
+
+    start = perf_counter()
+    if write:
+        events = stream.write(io.StringIO(), CHANGES)
+    else:
+        events = sum(1 for _ in stream.events(CHANGES))
+    return events, perf_counter() - start
+
+
+def large_groups() -> FakeSchemaGenerator:
+    """
+    Generate `ROWS` order lines for `ROWS / 100` orders, so an order total aggregates about 100 lines.
+
+    Returns:
+        FakeSchemaGenerator: The generator, with its rows generated.
+    """
+    sg = FakeSchemaGenerator()
+    sg._fake.seed_instance(0)
+    for model in MODELS:
+        sg.register(model)
+    sg.generate_from_dag(rows=ROWS // 100)
+    sg.generate_from_dag({"OrderProduct"}, ROWS)
+    sg.derive()
+    return sg
+
+
+if __name__ == "__main__":
+    sg = FakeSchemaGenerator()
+    sg._fake.seed_instance(0)
+    for model in MODELS:
+        sg.register(model)
+    sg.generate(ROWS)
+
+    for name, generator, declare in [
+        ("status updates", sg, status_updates),
+        ("aggregate updates", sg, aggregate_updates),
+        ("mixed", sg, mixed),
+        ("aggregate updates, 100 lines", large_groups(), aggregate_updates),
+    ]:
+        for write in (False, True):
+            events, elapsed = run(generator, declare, write)
+            label = f"{name}{' to NDJSON' if write else ''}"
+            print(f"{label:<40}{events:>10} events {elapsed * 1000:>10.2f} ms {events / elapsed:>12.0f} events/s")
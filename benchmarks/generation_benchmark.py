@@ -0,0 +1,42 @@
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "example")))
+
+from example_classes import Customer
+from example_classes import Order
+from example_classes import OrderProduct
+from example_classes import Payment
+from example_classes import Product
+
+from fake_schema_generator import FakeSchemaGenerator
+
+MODELS = (Customer, Product, Order, OrderProduct, Payment)
+
+
+def generate(rows: int) -> float:
+    """
+    Time generating `rows` rows of every model in the example schema.
+
+    Args:
+        rows (int): The number of rows to generate for every model.
+
+    Returns:
+        float: The time taken in seconds.
+    """
+    sg = FakeSchemaGenerator()
+    sg._fake.seed_instance(0)
+    for model in MODELS:
+        sg.register(model)
+
+    start = perf_counter()
+    sg.generate(rows)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    for rows in (100, 1_000, 5_000):
+        elapsed = generate(rows)
+        print(f"{rows:>8} rows/model {elapsed * 1000:>10.2f} ms {rows * len(MODELS) / elapsed:>12.0f} rows/s")
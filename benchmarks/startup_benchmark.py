@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from timeit import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "example")))
+
+from example_classes import Customer
+from example_classes import Order
+from example_classes import OrderProduct
+from example_classes import Payment
+from example_classes import Product
+from faker import Faker
+
+from fake_schema_generator import FakeSchemaGenerator
+
+REPEAT = 50
+
+
+def import_time() -> float:
+    """
+    Time a cold import of the package in a fresh interpreter.
+
+    Returns:
+        float: The import time in seconds.
+    """
+    code = "import time; t = time.perf_counter(); import fake_schema_generator; print(time.perf_counter() - t)"
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, cwd=root, text=True)
+    return float(result.stdout)
+
+
+def eager_faker() -> None:
+    Faker()
+
+
+def construct() -> None:
+    FakeSchemaGenerator()
+
+
+def construct_and_register() -> None:
+    sg = FakeSchemaGenerator()
+    for model in (Customer, Product, Order, OrderProduct, Payment):
+        sg.register(model)
+
+
+def first_row() -> None:
+    sg = FakeSchemaGenerator()
+    for model in (Customer, Product, Order, OrderProduct, Payment):
+        sg.register(model)
+    sg.generate()
+
+
+if __name__ == "__main__":
+    print(f"{'cold import':<32}{import_time() * 1000:>10.2f} ms")
+    for name, fn in [
+        ("Faker() (eager, for reference)", eager_faker),
+        ("FakeSchemaGenerator()", construct),
+        ("construct + register 5 models", construct_and_register),
+        ("construct + register + 1 row", first_row),
+    ]:
+        print(f"{name:<32}{timeit(fn, number=REPEAT) / REPEAT * 1000:>10.2f} ms")
@@ -21,7 +21,7 @@ type OrderDate = Annotated[datetime.datetime, FakeType("date_time_this_year")]
 type TotalAmount = Annotated[
     float,
     FakeType(
-        "calculate",
+        "derived",
         model="OrderProduct",
         field="order_id",
         value=ValueOf("order_id"),
@@ -32,7 +32,7 @@ type TotalAmount = Annotated[
 ]
 type OrderStatus = Annotated[
     str,
-    FakeType("random_element", elements=("Pending", "Shipped", "Delivered", "Returned")),
+    FakeType("categorical", elements={"Pending": 0.1, "Shipped": 0.15, "Delivered": 0.7, "Returned": 0.05}),
 ]
 
 type ProductRowID = Annotated[int, FakeType("sequential_number", namespace="product")]
@@ -63,11 +63,16 @@ type PaymentDate = Annotated[datetime.datetime, FakeType("date_time_this_year")]
 type PaymentAmount = Annotated[
     float,
     FakeType(
-        "reference",
+        "derived",
         model="Order",
-        field="total_amount",
-        conditions=[SchemaCondition("order_id", operator.eq, ValueOf("order_id"))],
+        field="order_id",
+        value=ValueOf("order_id"),
+        fields=["total_amount"],
+        row_op=typed_sum,
+        col_op=typed_sum,
     ),
 ]
-type PaymentMethod = Annotated[str, FakeType("random_element", elements=("Credit Card", "Debit Card", "PayPal"))]
-type PaymentStatus = Annotated[str, FakeType("random_element", elements=("Pending", "Paid", "Failed"))]
+type PaymentMethod = Annotated[
+    str, FakeType("categorical", elements={"Credit Card": 0.5, "Debit Card": 0.35, "PayPal": 0.15})
+]
+type PaymentStatus = Annotated[str, FakeType("categorical", elements={"Pending": 0.05, "Paid": 0.9, "Failed": 0.05})]
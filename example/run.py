@@ -20,8 +20,7 @@ def fake_load():
     sg.register(OrderProduct)
     sg.register(Payment)
 
-    for _ in range(0, 100):
-        sg.generate()
+    sg.generate(100)
 
     print(sg.data())
 
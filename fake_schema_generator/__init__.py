@@ -2,3 +2,5 @@ from .fake_types import *
 from .functions import *
 from .operators import *
 from .providers import *
+from .sinks import *
+from .storage import *
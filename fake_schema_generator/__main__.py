@@ -0,0 +1,6 @@
+import sys
+
+from fake_schema_generator.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+import argparse
+import json
+import sys
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+from typing import Optional
+
+from fake_schema_generator.fake_types.AutoTuner import AutoTuner
+from fake_schema_generator.fake_types.FakeSchemaGenerator import FakeSchemaGenerator
+from fake_schema_generator.fake_types.GenerationController import GenerationController
+from fake_schema_generator.fake_types.GenerationProgress import GenerationProgress
+from fake_schema_generator.fake_types.SchemaValidationError import SchemaValidationError
+from fake_schema_generator.fake_types.ShardCoordinator import ShardCoordinator
+from fake_schema_generator.fake_types.ShardManifest import ShardManifest
+from fake_schema_generator.fake_types.ShardResult import ShardResult
+from fake_schema_generator.functions import load_models
+from fake_schema_generator.sinks import CSVSink
+from fake_schema_generator.sinks import NDJSONSink
+from fake_schema_generator.sinks import PostgresCopySink
+from fake_schema_generator.sinks import Sink
+from fake_schema_generator.sinks import SQLiteSink
+from fake_schema_generator.storage import SpillStorage
+
+SINKS: dict[str, Callable[[str], Sink]] = {
+    "csv": CSVSink,
+    "ndjson": NDJSONSink,
+    "pgcopy": PostgresCopySink,
+    "pgcopy-text": partial(PostgresCopySink, binary=False),
+    "sqlite": SQLiteSink,
+}
+
+
+def explain(args: argparse.Namespace) -> int:
+    """
+    Print the generation plan of every model in a module, see `FakeSchemaGenerator.explain`.
+    """
+    fake = FakeSchemaGenerator()
+    for model in load_models(args.module):
+        fake.register(model)
+
+    try:
+        print(fake.explain(args.rows, args.batch_size))
+    except SchemaValidationError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def row_counts(values: list[str]) -> int | dict[str, int]:
+    """
+    Parse the `--rows` arguments: a number of rows for every model, and `Model=rows` for a model.
+
+    Raises:
+        ValueError: If an argument isn't a number or `Model=number`.
+    """
+    default: Optional[int] = None
+    per_model: dict[str, int] = {}
+    for value in values:
+        model, _, count = value.rpartition("=")
+        if model:
+            per_model[model] = int(count)
+        else:
+            default = int(count)
+
+    if len(per_model) == 0:
+        return 100 if default is None else default
+    if default is not None:
+        per_model["*"] = default
+    return per_model
+
+
+def batch_size(value: str) -> int | str:
+    """
+    Parse the `--batch-size` argument of `generate`: a number of rows, or `auto` to let an `AutoTuner` pick them.
+    """
+    if value == "auto":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid batch size: {value!r}") from None
+
+
+def generate(args: argparse.Namespace) -> int:
+    """
+    Generate rows for every model in a module and stream them to a sink, printing the throughput to stderr.
+    """
+    manifest = ShardManifest.load(args.manifest) if args.manifest is not None else None
+    if manifest is not None and args.workers > 1:
+        print("A shard is generated in one thread, generate more shards at once instead", file=sys.stderr)
+        return 1
+
+    storage = SpillStorage(args.memory_budget * 1024**2) if args.memory_budget is not None else None
+    fake = FakeSchemaGenerator(storage, thread_safe=args.workers > 1)
+    if args.seed is not None:
+        fake.seed_instance(args.seed)
+    for model in load_models(args.module):
+        fake.register(model)
+
+    try:
+        rows = manifest.rows if manifest is not None else row_counts(args.rows)
+        fake._build_model_dependencies()
+    except (ValueError, SchemaValidationError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    rows = default_rows(rows, fake)
+
+    # Models with derived columns are only written once the columns are computed, after generation.
+    deferred = {field_plan.model for field_plan in fake._derived}
+    written = {model: 0 for model in fake._model_dependencies}
+    sink = SINKS[args.format](args.output)
+    last_report = perf_counter()
+    last_progress: Optional[GenerationProgress] = None
+
+    def write(progress: GenerationProgress) -> None:
+        nonlocal last_report, last_progress
+        last_progress = progress
+        for model, count in written.items():
+            table = fake.data(fake._models[model])
+            if len(table) > count and (progress.finished or model not in deferred):
+                sink.write(fake._models[model], table[count:])
+                written[model] = len(table)
+
+        if not args.quiet and not progress.finished and perf_counter() - last_report >= args.interval:
+            last_report = perf_counter()
+            eta = "" if progress.eta is None else f", {progress.eta:,.0f}s left"
+            print(
+                f"{progress.elapsed:,.1f}s: {sum(progress.rows.values()):,} rows, "
+                f"{progress.rows_per_second:,.0f} rows/s{eta}",
+                file=sys.stderr,
+            )
+
+    tuner = AutoTuner() if args.batch_size == "auto" else None
+    batch_rows = 100 if tuner is not None else args.batch_size
+    try:
+        if manifest is None:
+            controller = GenerationController(
+                rows, callback=write, interval=0, batch_size=batch_rows, workers=args.workers, tuner=tuner
+            )
+            progress = controller.run(fake)
+        else:
+            result = fake.generate_shard(manifest, batch_rows, callback=write, tuner=tuner)
+            result_path = Path(args.result) if args.result is not None else result_file(Path(args.manifest))
+            result_path.write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+            # The last progress is reported once the shard is done.
+            progress = last_progress
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        sink.close()
+        fake._storage.close()
+
+    total = sum(written.values())
+    print(
+        f"Generated {total:,} rows in {progress.elapsed:,.2f}s, {total / max(progress.elapsed, 1e-9):,.0f} rows/s, "
+        f"to {args.output}",
+        file=sys.stderr,
+    )
+    for model, count in written.items():
+        tuned = f", batches of {progress.batch_sizes[model]:,}" if model in progress.batch_sizes else ""
+        print(f"  {model}: {count:,} rows{tuned}", file=sys.stderr)
+    if tuner is not None:
+        print(f"  Workers: {tuner.workers}", file=sys.stderr)
+    if manifest is not None:
+        print(f"  Shard {manifest.shard} of {manifest.shards}, result in {result_path}", file=sys.stderr)
+
+    return 0
+
+
+def default_rows(rows: int | dict[str, int], fake: FakeSchemaGenerator) -> int | dict[str, int]:
+    """
+    Give every model that `--rows` doesn't name the default number of rows, if there is one.
+    """
+    if isinstance(rows, dict) and "*" in rows:
+        rows = dict(rows)
+        default = rows.pop("*")
+        rows = {model: rows.get(model, default) for model in fake._model_dependencies}
+    return rows
+
+
+def result_file(manifest: Path) -> Path:
+    """
+    Get the file the result of a shard is written to by default, next to its manifest.
+    """
+    return manifest.with_name(f"{manifest.stem}.result.json")
+
+
+def shard(args: argparse.Namespace) -> int:
+    """
+    Split the rows of a module's models into shards and write a manifest per shard, see `ShardCoordinator`.
+    """
+    fake = FakeSchemaGenerator()
+    for model in load_models(args.module):
+        fake.register(model)
+
+    try:
+        rows = row_counts(args.rows)
+        fake._build_model_dependencies()
+        coordinator = ShardCoordinator(fake, default_rows(rows, fake), args.shards, seed=args.seed)
+        paths = coordinator.write(args.output)
+    except (ValueError, SchemaValidationError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"Wrote {len(paths)} manifests to {args.output}", file=sys.stderr)
+    for reference, namespace in sorted(coordinator.manifests()[0].key_references.items()):
+        print(f"  {reference} picks from all keys of {namespace}", file=sys.stderr)
+    return 0
+
+
+def merge(args: argparse.Namespace) -> int:
+    """
+    Check the results of the shards in a directory of manifests against the manifests, see `ShardCoordinator.merge`.
+    """
+    directory = Path(args.directory)
+    manifests = sorted(p for p in directory.glob("shard-*.json") if not p.name.endswith(".result.json"))
+    if len(manifests) == 0:
+        print(f"No manifests in {directory}", file=sys.stderr)
+        return 1
+
+    try:
+        totals = ShardCoordinator.merge(
+            [ShardManifest.load(p) for p in manifests],
+            [ShardResult.load(result_file(p)) for p in manifests if result_file(p).exists()],
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"{len(manifests)} shards, {sum(totals.values()):,} rows", file=sys.stderr)
+    for model, count in totals.items():
+        print(f"  {model}: {count:,} rows", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the command line interface.
+
+    Args:
+        argv (Optional[list[str]], optional): The arguments, without the program name. Defaults to `sys.argv`.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(prog="fake-schema-generator", description="Generate fake data for a schema.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    explain_parser = commands.add_parser(
+        "explain", help="Show how a schema will be generated and estimate what each field will cost."
+    )
+    explain_parser.add_argument("module", help="The module of models, as a dotted name or the path of a Python file.")
+    explain_parser.add_argument("--rows", type=int, default=1000, help="The number of rows per model. Default: 1000.")
+    explain_parser.add_argument(
+        "--batch-size", type=int, default=1, help="The number of rows per model in each block. Default: 1."
+    )
+    explain_parser.set_defaults(run=explain)
+
+    generate_parser = commands.add_parser(
+        "generate",
+        help=f"Generate rows for a schema and write them as they're generated, as {', '.join(sorted(SINKS))}.",
+    )
+    generate_parser.add_argument("module", help="The module of models, as a dotted name or the path of a Python file.")
+    generate_parser.add_argument(
+        "--rows",
+        action="append",
+        default=[],
+        metavar="[MODEL=]ROWS",
+        help="The number of rows of every model, or of one model with MODEL=ROWS. Can be repeated. Models that aren't "
+        "named are generated until the named models are done, unless a number for every model is given. Default: 100.",
+    )
+    generate_parser.add_argument("--seed", type=int, help="The seed, for the same rows every run.")
+    generate_parser.add_argument(
+        "--workers", type=int, default=1, help="The number of threads to generate rows in. Default: 1."
+    )
+    generate_parser.add_argument(
+        "--batch-size",
+        type=batch_size,
+        default=1000,
+        help="The number of rows per model in each block, and per thread between writes, or auto to pick them, and the "
+        "number of threads up to --workers, from measurements while generating, see AutoTuner. Default: 1000.",
+    )
+    generate_parser.add_argument("--format", choices=sorted(SINKS), required=True, help="The output format.")
+    generate_parser.add_argument(
+        "--output",
+        required=True,
+        help="The directory to write a file per model to, or the database file for sqlite.",
+    )
+    generate_parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="Move the oldest rows of a table to disk once it takes up more than MB megabytes, see SpillStorage.",
+    )
+    generate_parser.add_argument(
+        "--interval", type=float, default=5.0, help="The number of seconds between progress reports. Default: 5."
+    )
+    generate_parser.add_argument("--quiet", action="store_true", help="Only report once generation is done.")
+    generate_parser.add_argument(
+        "--manifest",
+        help="Generate the shard of a manifest written by the shard command instead, with its rows and seed.",
+    )
+    generate_parser.add_argument(
+        "--result",
+        help="The file to write the result of the shard to, for the merge command. Default: next to the manifest.",
+    )
+    generate_parser.set_defaults(run=generate)
+
+    shard_parser = commands.add_parser(
+        "shard", help="Split the rows of a schema into shards to generate independently, and write their manifests."
+    )
+    shard_parser.add_argument("module", help="The module of models, as a dotted name or the path of a Python file.")
+    shard_parser.add_argument(
+        "--rows",
+        action="append",
+        default=[],
+        metavar="[MODEL=]ROWS",
+        help="The number of rows of every model across all shards, or of one model with MODEL=ROWS. Can be repeated. "
+        "Models that aren't named get as many rows as the model with the most. Default: 100.",
+    )
+    shard_parser.add_argument("--shards", type=int, required=True, help="The number of shards.")
+    shard_parser.add_argument(
+        "--seed", type=int, default=0, help="The seed the seeds of the shards are drawn from. Default: 0."
+    )
+    shard_parser.add_argument("--output", required=True, help="The directory to write a manifest per shard to.")
+    shard_parser.set_defaults(run=shard)
+
+    merge_parser = commands.add_parser(
+        "merge", help="Check that the shards of a directory of manifests were generated with their rows and keys."
+    )
+    merge_parser.add_argument("directory", help="The directory of the manifests and the results of their shards.")
+    merge_parser.set_defaults(run=merge)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
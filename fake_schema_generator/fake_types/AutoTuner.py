@@ -0,0 +1,258 @@
+import sys
+from dataclasses import fields as dataclass_fields
+from time import perf_counter
+from typing import Optional
+
+from fake_schema_generator.fake_types.TuningDecision import TuningDecision
+from fake_schema_generator.functions import current_memory_usage
+
+
+class AutoTuner:
+    """
+    Picks the batch size of each model and the number of workers of a `GenerationController` run from measurements,
+    instead of a batch size and number of workers set by hand.
+
+    Every model is first generated in a calibration batch of `calibration_rows` rows, which measures how long a row of
+    the model takes and how much memory it takes up. The batch size of the model is then the number of rows that take
+    `batch_seconds` to generate: large enough that the work of a batch that doesn't depend on its size is spread over
+    many rows, and small enough that the controller checks its budgets and reports progress often. Batches are capped
+    so that the rows being generated at once take up at most `max_batch_memory` bytes, and at most a tenth of the memory
+    left under the controller's `memory_budget`. The time per row is measured again with every batch, and the batch
+    sizes are revised every `retune_interval` seconds, as the time per row changes with the size of the tables
+    referenced.
+
+    With more than one worker allowed, the number of workers starts at 1 and is doubled at each revision for as long as
+    the rows generated per second go up by at least `min_gain`. If doubling doesn't help, fewer workers are tried
+    instead. Once settled, the number of workers is only tried again when the throughput drifts by more than a quarter.
+
+    Every change is recorded as a `TuningDecision` in `decisions` and in the progress of the run.
+
+    Args:
+        batch_seconds (float, optional): The number of seconds a batch of a model should take. Defaults to 0.05.
+        calibration_rows (int, optional): The number of rows in the first batch of each model. Defaults to 50.
+        min_batch_size (int, optional): The smallest batch size. Defaults to 10.
+        max_batch_size (int, optional): The largest batch size. Defaults to 100000.
+        max_batch_memory (int, optional): The number of bytes the rows being generated at once can take up. Defaults to
+            64 MiB.
+        retune_interval (float, optional): The number of seconds between revisions. Defaults to 2.
+        min_gain (float, optional): The fraction by which the throughput must go up to keep more or fewer workers.
+            Defaults to 0.1.
+
+    Attributes:
+        batch_sizes (dict[str, int]): The batch size of each model measured so far, per worker.
+        workers (int): The number of workers.
+        decisions (list[TuningDecision]): The decisions made so far.
+    """
+
+    def __init__(
+        self,
+        batch_seconds: float = 0.05,
+        calibration_rows: int = 50,
+        min_batch_size: int = 10,
+        max_batch_size: int = 100_000,
+        max_batch_memory: int = 64 * 1024**2,
+        retune_interval: float = 2.0,
+        min_gain: float = 0.1,
+    ):
+        if batch_seconds <= 0:
+            raise ValueError("batch_seconds must be positive")
+        if calibration_rows < 1 or min_batch_size < 1:
+            raise ValueError("calibration_rows and min_batch_size must be at least 1")
+        if max_batch_size < min_batch_size:
+            raise ValueError("max_batch_size must be at least min_batch_size")
+
+        self.batch_seconds = batch_seconds
+        self.calibration_rows = calibration_rows
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.max_batch_memory = max_batch_memory
+        self.retune_interval = retune_interval
+        self.min_gain = min_gain
+        self.start()
+
+    def start(self, schema_generator=None, max_workers: int = 1, memory_budget: Optional[int] = None) -> None:
+        """
+        Forget the measurements of a previous run and start a new one. Called by `GenerationController.run`.
+
+        Args:
+            schema_generator (Optional[FakeSchemaGenerator], optional): The generator of the run, whose tables the
+                sizes of the rows are measured in. Defaults to None, in which case the sizes aren't measured.
+            max_workers (int, optional): The largest number of workers to use. Defaults to 1.
+            memory_budget (Optional[int], optional): The number of bytes of process memory the run stops at. Defaults
+                to None.
+
+        Returns:
+            None
+        """
+        self.batch_sizes: dict[str, int] = {}
+        self.workers = 1
+        self.decisions: list[TuningDecision] = []
+        self._schema_generator = schema_generator
+        self._max_workers = max_workers
+        self._memory_budget = memory_budget
+        self._seconds_per_row: dict[str, float] = {}
+        self._row_sizes: dict[str, int] = {}
+        self._start = self._last_revision = perf_counter()
+        self._rows_at_last_revision = 0
+        # The number of workers and throughput before the number of workers was last changed, until the change is
+        # judged at the next revision.
+        self._probe: Optional[tuple[int, float]] = None
+        self._direction = 1
+        # Whether a change has paid off since the number of workers was last settled.
+        self._gained = False
+        self._settled_rate: Optional[float] = None
+
+        return None
+
+    def batch_size(self, model: str) -> int:
+        """
+        Get the number of rows of a model each worker should generate in its next batch.
+
+        Args:
+            model (str): The name of the model.
+
+        Returns:
+            int: The batch size, `calibration_rows` until the model has been measured.
+        """
+        return self.batch_sizes.get(model, self.calibration_rows)
+
+    def _record(self, reason: str, model: Optional[str], batch_size: int, rows_per_second: float) -> None:
+        decision = TuningDecision(
+            perf_counter() - self._start, reason, model, batch_size, self.workers, rows_per_second
+        )
+        self.decisions.append(decision)
+
+        return None
+
+    def _row_size(self, model: str) -> int:
+        """
+        Estimate the number of bytes a row of a model takes up in memory from its last generated rows, the way
+        `SpillTable` does.
+        """
+        if self._schema_generator is None:
+            return 0
+        table = self._schema_generator.data(model)
+        sample = table[max(len(table) - 20, 0) :]
+        if not sample:
+            return 0
+        size = 0
+        for row in sample:
+            size += sys.getsizeof(row) + sys.getsizeof(getattr(row, "__dict__", None))
+            size += sum(sys.getsizeof(getattr(row, f.name)) for f in dataclass_fields(row))
+        return size // len(sample)
+
+    def _fit(self, model: str) -> tuple[int, str]:
+        """
+        Compute the batch size of a model from its time per row and memory per row.
+
+        Returns:
+            tuple[int, str]: The batch size, and `"memory"` if it was capped by memory or `"throughput"` if not.
+        """
+        seconds = self._seconds_per_row[model]
+        size = int(self.batch_seconds / seconds) if seconds > 0 else self.max_batch_size
+        size = min(max(size, self.min_batch_size), self.max_batch_size)
+
+        row_bytes = self._row_sizes.get(model, 0) * self.workers
+        if row_bytes > 0:
+            limit = self.max_batch_memory
+            memory = current_memory_usage() if self._memory_budget is not None else None
+            if memory is not None:
+                limit = min(limit, max(self._memory_budget - memory, 0) // 10)
+            if size * row_bytes > limit:
+                return max(limit // row_bytes, self.min_batch_size), "memory"
+        return size, "throughput"
+
+    def observe(self, model: str, rows: int, seconds: float) -> None:
+        """
+        Record how long a batch of a model took. The first batch of a model sets its batch size.
+
+        Args:
+            model (str): The name of the model.
+            rows (int): The number of rows each worker generated.
+            seconds (float): The number of seconds the batch took.
+
+        Returns:
+            None
+        """
+        if rows <= 0:
+            return None
+
+        seconds_per_row = seconds / rows
+        if model in self._seconds_per_row:
+            # Weighted towards the latest batches, which reference the largest tables.
+            self._seconds_per_row[model] += 0.3 * (seconds_per_row - self._seconds_per_row[model])
+            return None
+
+        self._seconds_per_row[model] = seconds_per_row
+        self._row_sizes[model] = self._row_size(model)
+        size, _ = self._fit(model)
+        self.batch_sizes[model] = size
+        self._record("calibration", model, size, 1 / seconds_per_row if seconds_per_row > 0 else 0.0)
+
+        return None
+
+    def revise(self, rows: int) -> None:
+        """
+        Revise the batch sizes and the number of workers if `retune_interval` has passed since the last revision.
+
+        Args:
+            rows (int): The number of rows generated so far across all models.
+
+        Returns:
+            None
+        """
+        now = perf_counter()
+        if now - self._last_revision < self.retune_interval:
+            return None
+
+        rate = (rows - self._rows_at_last_revision) / (now - self._last_revision)
+        self._last_revision, self._rows_at_last_revision = now, rows
+        self._revise_workers(rate)
+        for model, old in self.batch_sizes.items():
+            size, reason = self._fit(model)
+            # Small changes aren't worth recording, and would make the batch size jitter.
+            if abs(size - old) > old / 4:
+                self.batch_sizes[model] = size
+                self._record(reason, model, size, 1 / max(self._seconds_per_row[model], 1e-12))
+
+        return None
+
+    def _set_workers(self, workers: int, rate: float) -> None:
+        self.workers = workers
+        self._record("workers", None, 0, rate)
+
+        return None
+
+    def _revise_workers(self, rate: float) -> None:
+        """
+        Judge the last change to the number of workers and try another one, see the class description.
+        """
+        if self._max_workers <= 1:
+            return None
+
+        if self._probe is not None:
+            previous, previous_rate = self._probe
+            self._probe = None
+            if rate < previous_rate * (1 + self.min_gain):
+                self._set_workers(previous, previous_rate)
+                if self._direction > 0 and previous > 1 and not self._gained:
+                    self._direction = -1
+                else:
+                    self._settled_rate = previous_rate
+                return None
+            self._gained = True
+        elif self._settled_rate is not None:
+            if abs(rate - self._settled_rate) <= self._settled_rate / 4:
+                return None
+            self._settled_rate, self._direction, self._gained = None, 1, False
+
+        workers = self.workers * 2 if self._direction > 0 else self.workers // 2
+        if self._direction > 0 and workers > self._max_workers and self.workers < self._max_workers:
+            workers = self._max_workers
+        if not 1 <= workers <= self._max_workers or workers == self.workers:
+            self._settled_rate = rate
+            return None
+        self._probe = (self.workers, rate)
+        self._set_workers(workers, rate)
+
+        return None
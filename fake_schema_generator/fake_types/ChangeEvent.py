@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Any
+from typing import Optional
+
+
+@dataclass
+class ChangeEvent:
+    """
+    A change to a generated row, emitted by `ChangeStream`.
+
+    Attributes:
+        sequence (int): The position of the event in the stream, from 1.
+        operation (str): `"update"` or `"delete"`.
+        model (str): The name of the model of the row.
+        key (dict[str, Any]): The key field of the row and its value, or `{"position": <position>}` for a model without
+            a key field.
+        before (dict[str, Any]): The changed fields before an update, or every field of a deleted row.
+        after (Optional[dict[str, Any]]): The changed fields after an update, `None` for a delete.
+    """
+
+    sequence: int
+    operation: str
+    model: str
+    key: dict[str, Any]
+    before: dict[str, Any]
+    after: Optional[dict[str, Any]]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the event as a dictionary, e.g. to write it as JSON. The values of the rows aren't copied.
+
+        Returns:
+            dict[str, Any]: The fields of the event.
+        """
+        return {
+            "sequence": self.sequence,
+            "operation": self.operation,
+            "model": self.model,
+            "key": self.key,
+            "before": self.before,
+            "after": self.after,
+        }
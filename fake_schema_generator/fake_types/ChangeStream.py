@@ -0,0 +1,644 @@
+import json
+from copy import copy
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+from dataclasses import fields as dataclass_fields
+from json.encoder import encode_basestring
+from pathlib import Path
+from random import Random
+from typing import IO
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from fake_schema_generator.fake_types.ChangeEvent import ChangeEvent
+from fake_schema_generator.fake_types.FakeSchemaGenerator import DERIVED
+from fake_schema_generator.fake_types.ValueOf import ValueOf
+from fake_schema_generator.operators import noop
+from fake_schema_generator.operators import typed_product
+from fake_schema_generator.operators import typed_sum
+from fake_schema_generator.sinks import Sink
+
+
+class _PositionSet:
+    """
+    A set of row positions that a random position can be picked from in O(1), through `positions`.
+    """
+
+    __slots__ = ("positions", "_at")
+
+    def __init__(self, positions: Iterable[int] = ()):
+        self.positions = list(positions)
+        self._at = {p: i for i, p in enumerate(self.positions)}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.positions)
+
+    def add(self, position: int) -> None:
+        if position not in self._at:
+            self._at[position] = len(self.positions)
+            self.positions.append(position)
+
+    def discard(self, position: int) -> None:
+        i = self._at.pop(position, None)
+        if i is None:
+            return
+        # Move the last position into the gap, so nothing has to shift.
+        last = self.positions.pop()
+        if last != position:
+            self.positions[i] = last
+            self._at[last] = i
+
+
+@dataclass
+class _Rule:
+    """
+    A kind of change that `ChangeStream` picks at random, in proportion to its weight.
+    """
+
+    operation: str
+    model: str
+    weight: float
+    field: Optional[str] = None
+    transitions: Optional[dict[Any, tuple]] = None
+    # Generates a new value when there are no transitions.
+    function: Optional[Callable] = None
+    kwargs: dict[str, Any] = dataclass_field(default_factory=dict)
+    # The rows the rule can change, filled in when the stream starts.
+    eligible: Optional[_PositionSet] = None
+
+
+@dataclass(eq=False)
+class _Aggregate:
+    """
+    A `calculate` field or derived column `field` of `owner`, which aggregates `fields` of the rows of `target` whose
+    `group_field` equals the owner's `value_field`, or `value` if the value is a constant.
+
+    When the aggregate is a sum, `row_op` being `typed_product` or `typed_sum` and `col_op` `typed_sum`, `totals` holds
+    the value of each group it has been computed for, and a change adds its difference to the total instead of
+    aggregating the group again.
+    """
+
+    owner: str
+    field: str
+    target: str
+    group_field: str
+    value_field: Optional[str]
+    value: Any
+    fields: list[str]
+    row_op: Callable
+    col_op: Callable
+    totals: Optional[dict[Any, Any]] = None
+
+
+def _copy_row(row: dataclass) -> dataclass:
+    # Copying the `__dict__` is several times faster than `copy`, which goes through `__reduce_ex__`.
+    if not hasattr(row, "__dict__"):
+        return copy(row)
+    new = row.__class__.__new__(row.__class__)
+    new.__dict__.update(row.__dict__)
+    return new
+
+
+def _json_default(value: Any) -> Any:
+    value = Sink.plain_value(value)
+    return value if isinstance(value, str) else str(value)
+
+
+class ChangeStream:
+    """
+    Generates a stream of updates and deletes against the rows of a `FakeSchemaGenerator`, e.g. to benchmark a
+    change data capture pipeline. The kinds of changes are declared with `update` and `delete`, and `events` picks one
+    at random for every change, in proportion to their weights, and applies it to a random row it can change.
+
+    The stream keeps the data consistent as it changes it:
+
+    * Deleting a row deletes the rows that reference it first, recursively, unless another row has the referenced
+      value, so every reference still resolves. References with conditions are followed too, on the value of their
+      field.
+    * Fields that are referenced, compared by the conditions of a reference, or are references, `calculate` fields or
+      derived columns themselves can't be updated.
+    * When a change affects the rows a `calculate` field or derived column aggregates, the field is recomputed for the
+      rows it belongs to, from the rows of their group only, and each change to it is emitted as an update too, e.g.
+      changing the quantity of an order line updates the total of the order, and the amount of its payments. Sums
+      are kept as running totals, so they're updated without reading the rest of the group.
+
+    Cascaded changes are emitted right after the change that caused them, deletes of the referencing rows before the
+    delete of the referenced row. The stream keeps its own state of the data: a row is copied the first time it's
+    changed, and deleted rows are only marked as such, so the generator's tables stay as they were generated. `rows`
+    returns the current state.
+
+    Args:
+        schema_generator (FakeSchemaGenerator): The generator, with its rows generated.
+        seed (Any, optional): The seed of the random choices of the stream. Defaults to None, to seed from the system.
+        keys (Optional[dict[str, str]], optional): The key field of each model, which identifies a row in its events.
+            Defaults to None, for the first `sequential_number` field of each model.
+    """
+
+    def __init__(self, schema_generator, seed: Any = None, keys: Optional[dict[str, str]] = None):
+        self.schema_generator = schema_generator
+        self._random = Random(seed)
+        self._keys: dict[str, Optional[str]] = dict(keys or {})
+        self._rules: list[_Rule] = []
+        self._sequence = 0
+        self._prepared = False
+        self._fields: dict[str, list[str]] = {}
+        self._protected: dict[str, dict[str, str]] = {}
+        # The references to each model: (child model, child field, referenced field).
+        self._children: dict[str, list[tuple[str, str, str]]] = {}
+        # The aggregates over the rows of each model, the aggregates that read each field, and the aggregates whose
+        # group is the value of each field of the rows they belong to.
+        self._aggregates_of: dict[str, list[_Aggregate]] = {}
+        self._read_by: dict[tuple[str, str], list[_Aggregate]] = {}
+        self._keyed_by: dict[tuple[str, str], list[_Aggregate]] = {}
+        self._field_rules: dict[tuple[str, str], list[_Rule]] = {}
+        self._rows: dict[str, list[dataclass]] = {}
+        self._owned: dict[str, set[int]] = {}
+        self._deleted: dict[str, set[int]] = {}
+        self._live: dict[str, _PositionSet] = {}
+        self._indexes: dict[tuple[str, str], dict[Any, _PositionSet]] = {}
+
+    def _prepare(self) -> None:
+        """
+        Read the schema of the generator: the fields each model has, the fields that can't be updated, the references
+        deletes cascade along and the aggregates to keep up to date.
+        """
+        if self._prepared:
+            return None
+
+        schema_generator = self.schema_generator
+        with schema_generator._lock:
+            if len(schema_generator._model_dependencies) == 0:
+                schema_generator._build_model_dependencies()
+
+        for model_name, model in schema_generator._models.items():
+            self._fields[model_name] = [f.name for f in dataclass_fields(model)]
+            self._protected[model_name] = {}
+            self._children[model_name] = []
+            self._aggregates_of[model_name] = []
+
+        for model_name, fake_types in schema_generator._fake_types.items():
+            protected = self._protected[model_name]
+            for field_name, fake_type in fake_types.items():
+                if fake_type is None or "model" not in fake_type.kwargs:
+                    continue
+                kwargs = fake_type.kwargs
+                target = getattr(kwargs["model"], "__name__", kwargs["model"])
+                if fake_type.type == "reference":
+                    protected[field_name] = "it's a reference"
+                    if kwargs.get("field"):
+                        self._protected[target][kwargs["field"]] = f"it's referenced by {model_name}.{field_name}"
+                    conditions = kwargs.get("conditions") or []
+                    # Conditions compare a field of this model with a field of the referenced model.
+                    for condition in conditions:
+                        protected[condition.field] = f"the conditions of {model_name}.{field_name} read it"
+                        if isinstance(condition.value, ValueOf):
+                            self._protected[target][
+                                condition.value.field
+                            ] = f"the conditions of {model_name}.{field_name} read it"
+                    if kwargs.get("field"):
+                        self._children[target].append((model_name, field_name, kwargs["field"]))
+                elif fake_type.type in ("calculate", DERIVED):
+                    protected[field_name] = "it's computed from other rows"
+                    value = kwargs["value"]
+                    row_op, col_op = kwargs.get("row_op") or noop, kwargs.get("col_op") or noop
+                    aggregate = _Aggregate(
+                        owner=model_name,
+                        field=field_name,
+                        target=target,
+                        group_field=kwargs["field"],
+                        value_field=value.field if isinstance(value, ValueOf) else None,
+                        value=value,
+                        fields=list(kwargs["fields"]),
+                        row_op=row_op,
+                        col_op=col_op,
+                        totals={} if row_op in (typed_product, typed_sum) and col_op is typed_sum else None,
+                    )
+                    self._aggregates_of[target].append(aggregate)
+                    for read in dict.fromkeys([aggregate.group_field, *aggregate.fields]):
+                        self._read_by.setdefault((target, read), []).append(aggregate)
+                    if aggregate.value_field is not None:
+                        self._keyed_by.setdefault((model_name, aggregate.value_field), []).append(aggregate)
+
+            if model_name not in self._keys:
+                self._keys[model_name] = next(
+                    (f for f, t in fake_types.items() if t is not None and t.type == "sequential_number"), None
+                )
+
+        self._prepared = True
+
+        return None
+
+    def _model_name(self, model: str | type[dataclass]) -> str:
+        if isinstance(model, str):
+            model = self.schema_generator._model_str_to_model(model)
+        if model.__name__ not in self._fields:
+            raise ValueError(f"{model.__name__} isn't registered with the generator")
+        return model.__name__
+
+    def update(
+        self,
+        model: str | type[dataclass],
+        field: str,
+        transitions: Optional[dict[Any, Any]] = None,
+        weight: float = 1.0,
+    ) -> None:
+        """
+        Declare a kind of update: setting `field` of a random row of `model` to a new value.
+
+        Args:
+            model (str | type[dataclass]): The model to update rows of.
+            field (str): The field to update.
+            transitions (Optional[dict[Any, Any]], optional): The values the field can change to from each value, a
+                value or a list of values to pick from at random, e.g. `{"Pending": "Shipped", "Shipped": ["Delivered",
+                "Returned"]}`. Only rows whose field has one of the keys can be updated. Defaults to None, to generate a
+                new value for any row with the field's provider.
+            weight (float, optional): How often the update is picked, relative to the other changes. Defaults to 1.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the field can't be updated, or has a provider that reads other fields and no
+                `transitions`, or `weight` isn't positive.
+        """
+        self._prepare()
+        model_name = self._model_name(model)
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        if field not in self._fields[model_name]:
+            raise ValueError(f"{model_name} has no field {field}")
+        if field in self._protected[model_name]:
+            raise ValueError(f"{model_name}.{field} can't be updated, {self._protected[model_name][field]}")
+
+        rule = _Rule("update", model_name, weight, field)
+        if transitions is not None:
+            rule.transitions = {}
+            for value, targets in transitions.items():
+                if isinstance(targets, str) or not isinstance(targets, (list, tuple, set, frozenset)):
+                    targets = [targets]
+                if len(targets) > 0:
+                    rule.transitions[value] = tuple(targets)
+        else:
+            plan = next(
+                (p for p in self.schema_generator._plan if p.model == model_name and p.field == field),
+                None,
+            )
+            if plan is None or plan.referring:
+                raise ValueError(f"{model_name}.{field} needs transitions, its provider can't generate a value alone")
+            rule.function, rule.kwargs = plan.function, plan.kwargs
+
+        self._rules.append(rule)
+        self._field_rules.setdefault((model_name, field), []).append(rule)
+
+        return None
+
+    def delete(self, model: str | type[dataclass], weight: float = 1.0) -> None:
+        """
+        Declare a kind of delete: deleting a random row of `model`, and the rows that reference it.
+
+        Args:
+            model (str | type[dataclass]): The model to delete rows of.
+            weight (float, optional): How often the delete is picked, relative to the other changes. Defaults to 1.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If `weight` isn't positive.
+        """
+        self._prepare()
+        model_name = self._model_name(model)
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+
+        self._rules.append(_Rule("delete", model_name, weight))
+
+        return None
+
+    def _table(self, model_name: str) -> list[dataclass]:
+        """
+        The rows of a model, read from the generator the first time they're needed.
+        """
+        rows = self._rows.get(model_name)
+        if rows is None:
+            table = self.schema_generator._raw_data.get(model_name)
+            rows = self._rows[model_name] = list(table) if table is not None else []
+            self._owned[model_name] = set()
+            self._deleted[model_name] = set()
+        return rows
+
+    def _live_set(self, model_name: str) -> _PositionSet:
+        live = self._live.get(model_name)
+        if live is None:
+            rows = self._table(model_name)
+            deleted = self._deleted[model_name]
+            live = self._live[model_name] = _PositionSet(p for p in range(len(rows)) if p not in deleted)
+        return live
+
+    def _index(self, model_name: str, field_name: str) -> dict[Any, _PositionSet]:
+        """
+        The positions of the rows of a model that aren't deleted by the value of a field.
+        """
+        index = self._indexes.get((model_name, field_name))
+        if index is None:
+            rows, deleted = self._table(model_name), self._deleted[model_name]
+            index = self._indexes[(model_name, field_name)] = {}
+            for position, row in enumerate(rows):
+                if position not in deleted:
+                    positions = index.get(getattr(row, field_name))
+                    if positions is None:
+                        positions = index[getattr(row, field_name)] = _PositionSet()
+                    positions.add(position)
+        return index
+
+    def _start(self, rule: _Rule) -> None:
+        """
+        Find the rows a rule can change.
+        """
+        if rule.transitions is None:
+            rule.eligible = self._live_set(rule.model)
+            return None
+
+        rows, deleted, transitions = self._table(rule.model), self._deleted[rule.model], rule.transitions
+        rule.eligible = _PositionSet(
+            p for p, row in enumerate(rows) if p not in deleted and getattr(row, rule.field) in transitions
+        )
+
+        return None
+
+    def _event(
+        self, operation: str, model_name: str, position: int, row: dataclass, before: dict, after: Optional[dict]
+    ) -> ChangeEvent:
+        self._sequence += 1
+        key_field = self._keys[model_name]
+        key = {"position": position} if key_field is None else {key_field: getattr(row, key_field)}
+        return ChangeEvent(self._sequence, operation, model_name, key, before, after)
+
+    def _update(self, model_name: str, position: int, field_name: str, value: Any, events: list[ChangeEvent]) -> None:
+        rows = self._rows[model_name]
+        owned = self._owned[model_name]
+        if position not in owned:
+            rows[position] = _copy_row(rows[position])
+            owned.add(position)
+        row = rows[position]
+
+        old = getattr(row, field_name)
+        setattr(row, field_name, value)
+        key = (model_name, field_name)
+        index = self._indexes.get(key)
+        if index is not None:
+            index[old].discard(position)
+            positions = index.get(value)
+            if positions is None:
+                positions = index[value] = _PositionSet()
+            positions.add(position)
+        for rule in self._field_rules.get(key, ()):
+            if rule.transitions is not None and rule.eligible is not None:
+                if value in rule.transitions:
+                    rule.eligible.add(position)
+                else:
+                    rule.eligible.discard(position)
+
+        events.append(self._event("update", model_name, position, row, {field_name: old}, {field_name: value}))
+
+        for aggregate in self._read_by.get(key, ()):
+            group = getattr(row, aggregate.group_field)
+            totals = aggregate.totals
+            if totals:
+                values = [getattr(row, f) for f in aggregate.fields]
+                if field_name == aggregate.group_field:
+                    if old != group:
+                        self._add_to_total(aggregate, old, -aggregate.row_op(values))
+                        self._add_to_total(aggregate, group, aggregate.row_op(values))
+                elif group in totals:
+                    before = aggregate.row_op([old if f == field_name else v for f, v in zip(aggregate.fields, values)])
+                    totals[group] += aggregate.row_op(values) - before
+            self._recompute(aggregate, group, events)
+            if field_name == aggregate.group_field and old != group:
+                self._recompute(aggregate, old, events)
+        for aggregate in self._keyed_by.get(key, ()):
+            total = self._group_value(aggregate, value)
+            if getattr(row, aggregate.field) != total:
+                self._update(model_name, position, aggregate.field, total, events)
+
+        return None
+
+    @staticmethod
+    def _add_to_total(aggregate: _Aggregate, key: Any, difference: Any) -> None:
+        total = aggregate.totals.get(key)
+        if total is not None:
+            aggregate.totals[key] = total + difference
+
+    def _group_value(self, aggregate: _Aggregate, key: Any) -> Any:
+        """
+        Aggregate the rows of a group the way `calculate` and `derive` do, or get its total if it's kept. A group of no
+        rows or one row is aggregated again, so its total is exact again after the changes added to it.
+        """
+        group = self._index(aggregate.target, aggregate.group_field).get(key)
+        totals = aggregate.totals
+        if totals is not None and group and len(group) > 1 and key in totals:
+            return totals[key]
+
+        rows = self._rows[aggregate.target]
+        group_rows = [rows[p] for p in sorted(group)] if group else []
+        value = self.schema_generator._aggregate(group_rows, aggregate.fields, aggregate.row_op, aggregate.col_op)
+        if totals is not None:
+            totals[key] = value
+        return value
+
+    def _recompute(self, aggregate: _Aggregate, key: Any, events: list[ChangeEvent]) -> None:
+        """
+        Recompute an aggregate for the rows it belongs to whose group is `key`.
+        """
+        if aggregate.value_field is not None:
+            owners = self._index(aggregate.owner, aggregate.value_field).get(key)
+        else:
+            owners = self._live_set(aggregate.owner) if key == aggregate.value else None
+        if not owners:
+            return None
+
+        value = self._group_value(aggregate, key)
+        rows = self._table(aggregate.owner)
+        for position in list(owners):
+            if getattr(rows[position], aggregate.field) != value:
+                self._update(aggregate.owner, position, aggregate.field, value, events)
+
+        return None
+
+    def _delete(self, model_name: str, position: int, events: list[ChangeEvent]) -> None:
+        """
+        Delete a row and the rows that would be left referencing a value no row has, the referencing rows first, then
+        recompute the aggregates over the deleted rows.
+        """
+        doomed: list[tuple[str, int]] = []
+        seen: set[tuple[str, int]] = set()
+        stack = [(model_name, position)]
+        while stack:
+            model_name, position = stack.pop()
+            if (model_name, position) in seen:
+                continue
+            seen.add((model_name, position))
+            doomed.append((model_name, position))
+            row = self._rows[model_name][position]
+            for child, child_field, field_name in self._children[model_name]:
+                value = getattr(row, field_name)
+                holders = self._index(model_name, field_name)[value]
+                if any((model_name, p) not in seen for p in holders):
+                    continue
+                self._table(child)
+                stack += [(child, p) for p in self._index(child, child_field).get(value, ())]
+
+        groups: list[tuple[_Aggregate, Any]] = []
+        for model_name, position in reversed(doomed):
+            self._deleted[model_name].add(position)
+            row = self._rows[model_name][position]
+            live = self._live.get(model_name)
+            if live is not None:
+                live.discard(position)
+            for rule in self._rules:
+                if rule.model == model_name and rule.eligible is not None:
+                    rule.eligible.discard(position)
+            for (index_model, field_name), index in self._indexes.items():
+                if index_model == model_name:
+                    index[getattr(row, field_name)].discard(position)
+            events.append(
+                self._event(
+                    "delete", model_name, position, row, {f: getattr(row, f) for f in self._fields[model_name]}, None
+                )
+            )
+            for aggregate in self._aggregates_of[model_name]:
+                group = getattr(row, aggregate.group_field)
+                if aggregate.totals:
+                    self._add_to_total(aggregate, group, -aggregate.row_op([getattr(row, f) for f in aggregate.fields]))
+                groups.append((aggregate, group))
+
+        for aggregate, key in dict.fromkeys(groups):
+            self._recompute(aggregate, key, events)
+
+        return None
+
+    def events(self, changes: Optional[int] = None) -> Iterator[ChangeEvent]:
+        """
+        Generate changes and emit their events, including the events of the changes they cascade to.
+
+        Args:
+            changes (Optional[int], optional): The number of changes to generate. Defaults to None, to generate changes
+                until there are no rows left that a declared change can change.
+
+        Yields:
+            ChangeEvent: The events, in the order they happened.
+        """
+        self._prepare()
+        rules = self._rules
+        for rule in rules:
+            if rule.eligible is None:
+                self._start(rule)
+
+        weights = [rule.weight for rule in rules]
+        rng, random = self._random, self._random.random
+        done = 0
+        while rules and (changes is None or done < changes):
+            if not any(len(rule.eligible) for rule in rules):
+                break
+            # Picking the rules a block at a time costs one call to `choices` instead of one per change.
+            for rule in rng.choices(rules, weights, k=1024 if changes is None else min(changes - done, 1024)):
+                positions = rule.eligible.positions
+                if not positions:
+                    continue
+                position = positions[int(random() * len(positions))]
+                events: list[ChangeEvent] = []
+                if rule.transitions is not None:
+                    targets = rule.transitions[getattr(self._rows[rule.model][position], rule.field)]
+                    value = targets[int(random() * len(targets))]
+                    self._update(rule.model, position, rule.field, value, events)
+                elif rule.operation == "delete":
+                    self._delete(rule.model, position, events)
+                else:
+                    self._update(rule.model, position, rule.field, rule.function(**rule.kwargs), events)
+                done += 1
+                yield from events
+
+        return None
+
+    def write(self, file: str | Path | IO[str], changes: Optional[int] = None) -> int:
+        """
+        Write the events of `changes` changes to a newline-delimited JSON file, an object per event with the fields of
+        `ChangeEvent`. Dates and times are written in ISO 8601, and values JSON can't hold as strings, like
+        `NDJSONSink` does.
+
+        Args:
+            file (str | Path | IO[str]): The path of the file, or a file open for writing text.
+            changes (Optional[int], optional): The number of changes to generate, see `events`. Defaults to None.
+
+        Returns:
+            int: The number of events written.
+        """
+        if isinstance(file, (str, Path)):
+            with open(file, "w", encoding="utf-8") as f:
+                return self.write(f, changes)
+
+        encode = json.JSONEncoder(ensure_ascii=False, default=_json_default, check_circular=False).encode
+        # The lines are put together from their parts instead of encoding a dictionary per event: the parts that repeat
+        # from event to event are encoded once, and strings, integers and floats the way `json` encodes them, so only
+        # the other values go through the encoder.
+        heads: dict[tuple[str, str], str] = {}
+        names: dict[str, str] = {}
+
+        def encode_fields(fields: Optional[dict[str, Any]]) -> str:
+            if fields is None:
+                return "null"
+            parts = []
+            for name, value in fields.items():
+                encoded_name = names.get(name)
+                if encoded_name is None:
+                    encoded_name = names[name] = encode(name) + ": "
+                kind = type(value)
+                if kind is str:
+                    parts.append(encoded_name + encode_basestring(value))
+                elif kind is int or kind is float and value - value == 0:
+                    # `value - value` is only 0 for finite floats, `json` writes the others as NaN and Infinity.
+                    parts.append(encoded_name + kind.__repr__(value))
+                else:
+                    parts.append(encoded_name + encode(value))
+            return "{" + ", ".join(parts) + "}"
+
+        written = 0
+        lines: list[str] = []
+        for event in self.events(changes):
+            head = heads.get((event.operation, event.model))
+            if head is None:
+                head = heads[(event.operation, event.model)] = (
+                    f', "operation": {encode(event.operation)}, "model": {encode(event.model)}, "key": '
+                )
+            lines.append(
+                f'{{"sequence": {event.sequence}{head}{encode_fields(event.key)}, "before": '
+                f'{encode_fields(event.before)}, "after": {encode_fields(event.after)}}}\n'
+            )
+            if len(lines) == 10_000:
+                file.writelines(lines)
+                written += len(lines)
+                lines.clear()
+        file.writelines(lines)
+
+        return written + len(lines)
+
+    def rows(self, model: str | type[dataclass]) -> list[dataclass]:
+        """
+        Get the current rows of a model, with the changes made so far and without the deleted rows.
+
+        Args:
+            model (str | type[dataclass]): The model.
+
+        Returns:
+            list[dataclass]: The rows, in the order they were generated. Changed rows are the stream's copies.
+        """
+        self._prepare()
+        model_name = self._model_name(model)
+        rows, deleted = self._table(model_name), self._deleted[model_name]
+        return [row for position, row in enumerate(rows) if position not in deleted]
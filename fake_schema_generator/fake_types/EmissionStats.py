@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class EmissionStats:
+    """
+    The statistics of a run of a `RateEmitter`.
+
+    Attributes:
+        emitted (int): The number of rows emitted.
+        elapsed (float): The number of seconds since the first row could be emitted.
+        rows_per_second (float): The rate rows were emitted at.
+        target_rate (float): The rate rows are meant to be emitted at.
+        lag (float): How many seconds after it was due the last row was emitted.
+        max_lag (float): The largest `lag` of any row.
+        generation_wait (float): The number of seconds spent waiting for rows to be generated, because the buffer was
+            empty. Anything above zero means generation can't keep up with the target rate.
+        buffered (int): The number of generated blocks waiting to be emitted.
+    """
+
+    emitted: int = 0
+    elapsed: float = 0.0
+    rows_per_second: float = 0.0
+    target_rate: float = 0.0
+    lag: float = 0.0
+    max_lag: float = 0.0
+    generation_wait: float = 0.0
+    buffered: int = 0
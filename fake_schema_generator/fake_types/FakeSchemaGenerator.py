@@ -1,53 +1,187 @@
-import random
+import operator
 from collections import deque
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from contextlib import contextmanager
+from contextlib import nullcontext
+from copy import copy
 from dataclasses import dataclass
 from dataclasses import fields as dataclass_fields
 from dataclasses import is_dataclass
+from dataclasses import replace
+from functools import cache
+from functools import partial
 from inspect import Parameter
-from inspect import Signature
 from inspect import currentframe
 from inspect import signature
+from math import log2
+from random import Random
+from threading import RLock
+from threading import local
 from types import MappingProxyType
+from types import SimpleNamespace
 from typing import Any
 from typing import Callable
+from typing import Iterator
 from typing import Optional
 
 from faker import Faker
 
+from fake_schema_generator.fake_types.AutoTuner import AutoTuner
 from fake_schema_generator.fake_types.FakeType import FakeType
+from fake_schema_generator.fake_types.FieldExplanation import FieldExplanation
+from fake_schema_generator.fake_types.FieldPlan import FieldPlan
+from fake_schema_generator.fake_types.GenerationController import GenerationController
+from fake_schema_generator.fake_types.GenerationProgress import GenerationProgress
+from fake_schema_generator.fake_types.GeneratorSnapshot import GeneratorSnapshot
+from fake_schema_generator.fake_types.JoinPlan import JoinPlan
+from fake_schema_generator.fake_types.LazyGenerator import LazyGenerator
+from fake_schema_generator.fake_types.PlanExplanation import PlanExplanation
 from fake_schema_generator.fake_types.SchemaCondition import SchemaCondition
+from fake_schema_generator.fake_types.SchemaValidationError import SchemaValidationError
+from fake_schema_generator.fake_types.ShardManifest import ShardManifest
+from fake_schema_generator.fake_types.ShardResult import ShardResult
+from fake_schema_generator.fake_types.SortedIndex import SortedIndex
+from fake_schema_generator.fake_types.ThreadLocalFaker import ThreadLocalFaker
 from fake_schema_generator.fake_types.ValueOf import ValueOf
-from fake_schema_generator.functions import dataclass_to_interface
-from fake_schema_generator.functions import extract_annotations
+from fake_schema_generator.functions import analyse_model
+from fake_schema_generator.functions import arrow_table
+from fake_schema_generator.functions import group_aggregate
+from fake_schema_generator.functions import optional_import
 from fake_schema_generator.operators import noop
 from fake_schema_generator.providers import CalculateProvider
+from fake_schema_generator.providers import CategoricalProvider
 from fake_schema_generator.providers import ProductNameProvider
 from fake_schema_generator.providers import ReferenceProvider
+from fake_schema_generator.providers import SchemaReferenceBaseProvider
+from fake_schema_generator.providers import SequenceAllocator
 from fake_schema_generator.providers import SequentialNumberProvider
+from fake_schema_generator.providers import TemplateProvider
+from fake_schema_generator.storage import ChainedRows
+from fake_schema_generator.storage import CopyOnWriteTable
+from fake_schema_generator.storage import MemoryStorage
+from fake_schema_generator.storage import Storage
+from fake_schema_generator.storage import TableStorage
+
+# The `FakeType` of derived columns, which are computed by `FakeSchemaGenerator.derive` after the rows are generated.
+DERIVED = "derived"
+
+
+@cache
+def _dataclass_field_names(cls: type[dataclass]) -> frozenset[str]:
+    return frozenset(f.name for f in dataclass_fields(cls))
+
+
+@cache
+def _signature_parameters(func: Callable) -> MappingProxyType[str, Parameter]:
+    return signature(func).parameters
 
 
 class FakeSchemaGenerator:
-    def __init__(self):
+    def __init__(self, storage: Optional[Storage] = None, thread_safe: bool = False):
+        """
+        Args:
+            storage (Optional[Storage], optional): Where to store the generated rows, e.g. `SQLiteStorage` for tables
+                that don't fit in memory. Defaults to a `MemoryStorage`.
+            thread_safe (bool, optional): Whether the generator can be used from several threads at once. Every thread
+                gets its own Faker and block of rows, sequential numbers are leased to threads in blocks, and each table
+                has its own lock, only held to store a block in it or look a block up in it. Defaults to False.
+        """
+        self._storage: Storage = storage if storage is not None else MemoryStorage()
         self._dependent_fake_providers: set[str] = set()
-        self._fake = Faker()
-        self._fake.add_provider(SequentialNumberProvider)
-        self._fake.add_provider(ProductNameProvider)
-        calc_provider = CalculateProvider(self._fake, self)
-        ref_provider = ReferenceProvider(self._fake, self)
-        self._add_referring_provider(calc_provider.reference_functions)
-        self._add_referring_provider(ref_provider.reference_functions)
-        self._fake.add_provider(calc_provider)
-        self._fake.add_provider(ref_provider)
+        self._allocator: Optional[SequenceAllocator] = SequenceAllocator() if thread_safe else None
+        # Guards the schema and plan that the threads of a thread-safe generator share.
+        self._new_lock: Callable[[], Any] = RLock if thread_safe else nullcontext
+        self._lock = self._new_lock()
+        # Guards the rows and indexes of each table, see `_all_tables_locked`.
+        self._table_locks: dict[str, Any] = {}
+        # Holds the block being generated, per thread if thread-safe, see `_instances`.
+        self._local = local() if thread_safe else SimpleNamespace()
+        self._fake = (
+            ThreadLocalFaker(self._create_faker, partial(self._copy_provider, schema_generator=self))
+            if thread_safe
+            else self._create_faker()
+        )
+        if thread_safe:
+            # Creating a Faker adds the functions of the referring providers to `_dependent_fake_providers`, which the
+            # schema is built from before any thread might have used the stand-in.
+            self._fake.current()
 
         self._annotations: dict[dataclass, dict[str, Any]] = {}
-        self._raw_data: dict[str, list[dataclass]] = {}
+        self._fake_types: dict[str, dict[str, Optional[FakeType]]] = {}
+        self._raw_data: dict[str, TableStorage] = {}
+        self._indexes: dict[str, dict[tuple, Any]] = {}
         self._models: dict[str, dataclass] = {}
-        self._interfaces: dict[str, dataclass] = {}
-        self._instances: dict[str, list[dataclass]] = {}
+        self._row_types: dict[str, type[dataclass]] = {}
+        self._local.instances = {}
         self._field_dag: list[tuple[str, str]] = []
         self._field_dependencies: dict[tuple[str, str], set[tuple[str, str]]] = {}
         self._model_dependencies: dict[str, set[str]] = {}
+        self._plan: list[FieldPlan] = []
+        self._derived: list[FieldPlan] = []
+        self._schema_errors: list[str] = []
+
+    def _create_faker(self) -> Faker:
+        """
+        Create a Faker with the built-in providers of the schema generator.
+
+        Returns:
+            Faker: The Faker.
+        """
+        # Built-in providers are loaded on first use by the `LazyGenerator`. "faker.providers" is skipped by Faker, so
+        # passing it on its own stops Faker from falling back to loading every provider up front.
+        fake = Faker(providers=["faker.providers"], generator=LazyGenerator())
+        fake.add_provider(SequentialNumberProvider(fake, self._allocator))
+        fake.add_provider(ProductNameProvider)
+        fake.add_provider(TemplateProvider)
+        fake.add_provider(CategoricalProvider)
+        calc_provider = CalculateProvider(fake, self)
+        ref_provider = ReferenceProvider(fake, self)
+        self._add_referring_provider(calc_provider.reference_functions)
+        self._add_referring_provider(ref_provider.reference_functions)
+        fake.add_provider(calc_provider)
+        fake.add_provider(ref_provider)
+
+        return fake
+
+    @staticmethod
+    def _copy_provider(provider: Any, fake_generator: Faker, schema_generator: "FakeSchemaGenerator") -> Any:
+        """
+        Create a copy of a custom provider for another Faker, referring to `schema_generator` if it's a
+        `SchemaReferenceBaseProvider`. Provider classes are added as they are.
+
+        Args:
+            provider (Any): The provider, or a provider class.
+            fake_generator (Faker): The Faker the copy is for.
+            schema_generator (FakeSchemaGenerator): The schema generator the copy refers to.
+
+        Returns:
+            Any: The copy.
+        """
+        if isinstance(provider, type):
+            return provider
+        if isinstance(provider, SchemaReferenceBaseProvider):
+            return type(provider)(fake_generator, schema_generator)
+        return type(provider)(fake_generator)
+
+    @property
+    def _sequences(self) -> SequentialNumberProvider:
+        """
+        The sequential number provider of the Faker, that of the calling thread if the generator is thread-safe.
+        """
+        return self._fake.sequential_number.__self__
+
+    @property
+    def _instances(self) -> dict[str, list[dataclass]]:
+        """
+        The rows of the block being generated for each model, see `generate_from_dag`. A thread-safe generator has a
+        block per thread.
+        """
+        try:
+            return self._local.instances
+        except AttributeError:
+            self._local.instances = {}
+            return self._local.instances
 
     @staticmethod
     def _has_field(cls: type[dataclass], field: str) -> bool:
@@ -61,7 +195,7 @@ class FakeSchemaGenerator:
         Returns:
             bool: True if the field is in the class, False otherwise.
         """
-        return field in [f.name for f in dataclass_fields(cls)]
+        return field in _dataclass_field_names(cls)
 
     @staticmethod
     def _has_keyword_argument(func: Callable, kwarg: str) -> bool:
@@ -75,11 +209,11 @@ class FakeSchemaGenerator:
         Returns:
             bool: True if the function has the keyword argument, False otherwise.
         """
-        sig: Signature = signature(func)
-        params: MappingProxyType[str, Parameter] = sig.parameters
-        has_argument = (kwarg in params and params[kwarg].default is not Parameter.empty) or any(
-            p.kind == Parameter.VAR_KEYWORD for p in params.values()
-        )
+        # Bound methods are created on every attribute access, so cache on the function they wrap.
+        params: MappingProxyType[str, Parameter] = _signature_parameters(getattr(func, "__func__", func))
+        has_argument = (
+            kwarg in params and params[kwarg].kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+        ) or any(p.kind == Parameter.VAR_KEYWORD for p in params.values())
         return has_argument
 
     def _add_referring_provider(self, functions: set[str]) -> None:
@@ -98,7 +232,8 @@ class FakeSchemaGenerator:
 
     def _build_field_dag(self):
         """
-        Build the field DAG from the field dependencies.
+        Build the field DAG from the field dependencies, and from the fields of the source model that referring
+        providers read through `value` and `conditions`, since rows are filled in one field at a time.
 
         Sets:
             self._field_dag: The field DAG.
@@ -106,7 +241,10 @@ class FakeSchemaGenerator:
         Returns:
             None
         """
-        schema = self._field_dependencies
+        schema = {
+            node: dependencies | self._source_field_dependencies(node)
+            for node, dependencies in self._field_dependencies.items()
+        }
 
         # First, remove independent tables from the schema.
         independent_tables = {table for table in self._model_dependencies if len(self._model_dependencies[table]) == 0}
@@ -151,6 +289,27 @@ class FakeSchemaGenerator:
 
         return None
 
+    def _source_field_dependencies(self, node: tuple[str, str]) -> set[tuple[str, str]]:
+        """
+        Find the fields of its own model that a field's referring provider reads through `value` and `conditions`.
+
+        Args:
+            node (tuple[str, str]): The model and field.
+
+        Returns:
+            set[tuple[str, str]]: The fields read, limited to fields that are in the field dependencies.
+        """
+        model_name, field_name = node
+        fake_type = self._fake_types[model_name][field_name]
+        if fake_type is None or fake_type.type not in self._dependent_fake_providers:
+            return set()
+
+        read: list[str] = [c.field for c in fake_type.kwargs.get("conditions") or []]
+        if isinstance(fake_type.kwargs.get("value"), ValueOf):
+            read.append(fake_type.kwargs["value"].field)
+
+        return {(model_name, f) for f in read if f != field_name and (model_name, f) in self._field_dependencies}
+
     def _build_field_dependencies(self) -> None:
         """
         Build the field dependencies from the type annotations on each registered model.
@@ -166,13 +325,7 @@ class FakeSchemaGenerator:
             model_name: str = model.__name__
             for field in dataclass_fields(model):
                 if len(self._annotations[model_name][field.name]["metadata"]) > 0:
-                    fake_type = next(
-                        filter(
-                            lambda x: isinstance(x, FakeType),
-                            self._annotations[model_name][field.name]["metadata"],
-                        ),
-                        None,
-                    )
+                    fake_type = self._fake_types[model_name][field.name]
                     current_field: tuple[str, str] = (model_name, field.name)
                     if fake_type and fake_type.type in self._dependent_fake_providers:
                         if current_field not in self._field_dependencies:
@@ -182,9 +335,14 @@ class FakeSchemaGenerator:
                             *fake_type.kwargs.get("fields", []),
                         ]
                         for f in fields:
-                            if len(f) > 0:
+                            if f and "model" in fake_type.kwargs:
                                 if fake_type.kwargs["model"] not in self._models:
-                                    models_to_register.add(self._model_str_to_model(fake_type.kwargs["model"]))
+                                    try:
+                                        models_to_register.add(self._model_str_to_model(fake_type.kwargs["model"]))
+                                    except ValueError as e:
+                                        # Reported with every other problem in the schema by `_validate_schema`.
+                                        self._schema_errors.append(f"{model_name}.{field.name}: {e}")
+                                        continue
                                 depends_on: tuple[str, str] = (
                                     fake_type.kwargs["model"],
                                     f,
@@ -192,6 +350,13 @@ class FakeSchemaGenerator:
                                 self._field_dependencies[current_field].add(depends_on)
                     else:
                         self._field_dependencies[current_field] = set()
+                        # Derived columns are computed after generation, so they only need their model registered.
+                        model_str = fake_type.kwargs.get("model") if fake_type and fake_type.type == DERIVED else None
+                        if isinstance(model_str, str) and model_str not in self._models:
+                            try:
+                                models_to_register.add(self._model_str_to_model(model_str))
+                            except ValueError as e:
+                                self._schema_errors.append(f"{model_name}.{field.name}: {e}")
 
         if len(models_to_register) > 0:
             for model in models_to_register:
@@ -211,7 +376,11 @@ class FakeSchemaGenerator:
 
         Returns:
             None
+
+        Raises:
+            SchemaValidationError: If the schema is invalid.
         """
+        self._schema_errors = []
         self._build_field_dependencies()
 
         # Iterate through the field DAG and build the model DAG.
@@ -224,10 +393,337 @@ class FakeSchemaGenerator:
                 for inner_model, inner_field in v:
                     self._model_dependencies[model].add(inner_model)
 
+        try:
+            self._validate_schema()
+        except SchemaValidationError:
+            # Left empty, so the next call validates the schema again instead of generating from a broken plan.
+            self._model_dependencies = {}
+            self._field_dependencies = {}
+            raise
         self._build_field_dag()
+        self._build_plan()
+
+        return None
+
+    def _model_order(self) -> list[str]:
+        """
+        Order the models so that every model comes after the models it references, apart from cycles.
+        """
+        order: list[str] = []
+        seen: set[str] = set()
+
+        def visit(model: str) -> None:
+            if model in seen:
+                return
+            seen.add(model)
+            for dependency in sorted(self._model_dependencies[model] - {model}):
+                visit(dependency)
+            order.append(model)
+
+        for model in self._model_dependencies:
+            visit(model)
+        return order
+
+    def _build_plan(self) -> None:
+        """
+        Compile how each field in the field DAG is generated, so that generating a row only has to call the functions
+        in the plan. Model names in the arguments of referring providers are resolved to
+        their models, and the built-in referring providers are bound directly to the unchecked `_reference` and
+        `_calculate`, since their arguments have already been validated.
+
+        Sets:
+            self._plan: The plan, in field DAG order, without derived columns.
+            self._derived: The plan of the derived columns, in the order to compute them in.
+            self._indexes: An index on every model that a field references with conditions a `SortedIndex` can
+                answer, and on the joined field of every model that a field calculates from.
+            self._raw_data: The fields that are referenced without conditions are kept apart from the rows by the
+                tables that can, see `TableStorage.keep_column`.
+
+        Returns:
+            None
+        """
+        internal_functions: dict[str, tuple[Callable, Callable]] = {
+            "calculate": (self._calculate, self._calculate_batch),
+            "reference": (self._reference, self._reference_batch),
+        }
+        plan: list[FieldPlan] = []
+        derived: list[FieldPlan] = []
+        for model_name, field_name in self._field_dag:
+            fake_type = self._fake_types[model_name][field_name]
+            if fake_type is None:
+                continue
+            if fake_type.type == DERIVED:
+                kwargs = fake_type.kwargs.copy()
+                kwargs["model"] = self._models[getattr(kwargs["model"], "__name__", kwargs["model"])]
+                derived.append(FieldPlan(model_name, field_name, self._derive_column, kwargs, True))
+                continue
+
+            kwargs: dict[str, Any] = fake_type.kwargs.copy()
+            referring = fake_type.type in self._dependent_fake_providers
+            function = getattr(self._fake, fake_type.type)
+            provider = getattr(function, "__self__", None)
+            # A thread-safe generator calls the provider of the thread generating the block, not that of the thread
+            # building the plan.
+            thread_safe = isinstance(self._fake, ThreadLocalFaker)
+            batch_function = None
+            if referring and fake_type.type in internal_functions:
+                function, batch_function = internal_functions[fake_type.type]
+                kwargs["model"] = self._models[kwargs["model"]]
+            elif referring and isinstance(provider, SchemaReferenceBaseProvider):
+                batch_function = partial(self._provider_batch if thread_safe else provider.batch, fake_type.type)
+            elif fake_type.type == "sequential_number" and isinstance(provider, SequentialNumberProvider):
+                batch_function = self._sequential_number_batch
+            elif fake_type.type == "template" and isinstance(provider, TemplateProvider):
+                batch_function = self._template_batch
+            elif fake_type.type == "categorical" and isinstance(provider, CategoricalProvider):
+                batch_function = self._categorical_batch
+            if thread_safe and not (referring and fake_type.type in internal_functions):
+                function = self._fake.formatter(fake_type.type)
+            plan.append(FieldPlan(model_name, field_name, function, kwargs, referring, batch_function))
+            if referring and kwargs.get("model") is not None and kwargs.get("conditions"):
+                model = kwargs["model"] if isinstance(kwargs["model"], str) else kwargs["model"].__name__
+                self._add_index(model, JoinPlan(kwargs["conditions"]).index_fields)
+            elif fake_type.type == "reference" and kwargs.get("field"):
+                # Random references read one field of a random row.
+                self._raw_data[kwargs["model"].__name__].keep_column(kwargs["field"])
+            elif fake_type.type == "calculate" and kwargs.get("field"):
+                # Calculations read the rows whose joined field equals a value.
+                self._add_index(kwargs["model"].__name__, ((kwargs["field"],), None))
+
+        self._plan = plan
+        self._derived = self._order_derived_columns(derived)
 
         return None
 
+    def _provider_batch(self, function: str, source_models: list[dataclass], **kwargs) -> list[Any]:
+        """
+        Call `SchemaReferenceBaseProvider.batch` on the provider of a reference function in the calling thread's Faker.
+        """
+        return getattr(self._fake, function).__self__.batch(function, source_models, **kwargs)
+
+    def _sequential_number_batch(self, source_models: list[dataclass], namespace: str = "default") -> list[int]:
+        """
+        Reserve a sequential number for each of a block of rows at once, see `SequentialNumberProvider.reserve`.
+        """
+        return list(self._sequences.reserve(namespace, len(source_models)))
+
+    def _template_batch(self, source_models: list[dataclass], pattern: str | list[str]) -> list[str]:
+        """
+        Generate a string from a template for each of a block of rows at once, see `TemplateProvider.batch`.
+        """
+        return self._fake.template.__self__.batch(pattern, source_models)
+
+    def _categorical_batch(self, source_models: list[dataclass], elements: Any, weights: Any = None) -> list[Any]:
+        """
+        Pick a value from a weighted set for each of a block of rows at once, see `CategoricalProvider.batch`.
+        """
+        return self._fake.categorical.__self__.batch(elements, source_models, weights)
+
+    def _order_derived_columns(self, derived: list[FieldPlan]) -> list[FieldPlan]:
+        """
+        Order derived columns so that the ones that read other derived columns are computed after them.
+
+        Args:
+            derived (list[FieldPlan]): The plans of the derived columns.
+
+        Returns:
+            list[FieldPlan]: The plans, in the order to compute them in.
+
+        Raises:
+            SchemaValidationError: If derived columns read each other in a cycle.
+        """
+        plans = {f"{p.model}.{p.field}": p for p in derived}
+        reads = {column: self._derived_columns_read(p.model, p.kwargs) for column, p in plans.items()}
+        ordered: dict[str, FieldPlan] = {}
+        visiting: set[str] = set()
+
+        def visit(column: str) -> None:
+            if column in ordered:
+                return
+            if column in visiting:
+                raise SchemaValidationError([f"{column}: derived columns read each other in a cycle"])
+            visiting.add(column)
+            for dependency in reads[column]:
+                visit(dependency)
+            ordered[column] = plans[column]
+
+        for column in plans:
+            visit(column)
+
+        return list(ordered.values())
+
+    def _add_index(self, model_name: str, index_fields: Optional[tuple[tuple[str, ...], Optional[str]]]) -> None:
+        """
+        Index the rows of a model on `JoinPlan.index_fields` with `TableStorage.build_index`, unless they're already
+        indexed or can't be.
+
+        Args:
+            model_name (str): The model to index.
+            index_fields (Optional[tuple[tuple[str, ...], Optional[str]]]): The equality fields and range field.
+
+        Returns:
+            None
+        """
+        if index_fields is None or model_name not in self._indexes or index_fields in self._indexes[model_name]:
+            return None
+
+        with self._table_locks[model_name]:
+            try:
+                self._indexes[model_name][index_fields] = self._raw_data[model_name].build_index(*index_fields)
+            except TypeError:
+                return None
+
+        return None
+
+    @contextmanager
+    def _all_tables_locked(self) -> Iterator[None]:
+        """
+        Hold the lock of the schema and the lock of every table, taken in the order of the names of the models, to read
+        or change all the tables at once. Generating a block only ever holds the lock of one table at a time.
+
+        Yields:
+            None
+        """
+        with self._lock, ExitStack() as stack:
+            for model_name in sorted(self._table_locks):
+                stack.enter_context(self._table_locks[model_name])
+            yield
+
+    def _store_rows(self, model_name: str, rows: list[dataclass]) -> None:
+        """
+        Append generated rows to a model's data and to its indexes, holding the lock of that table only. An index whose
+        values stop being comparable is dropped, and the references it answered go back to joining the rows for every
+        block.
+
+        Args:
+            model_name (str): The model the rows belong to.
+            rows (list[dataclass]): The rows to store.
+
+        Returns:
+            None
+        """
+        with self._table_locks[model_name]:
+            self._raw_data[model_name].extend(rows)
+            for index_fields, index in list(self._indexes[model_name].items()):
+                try:
+                    index.extend(rows)
+                except TypeError:
+                    del self._indexes[model_name][index_fields]
+
+        return None
+
+    def _validate_referring_field(self, location: str, source: type[dataclass], kwargs: dict[str, Any]) -> list[str]:
+        """
+        Check the arguments of a referring provider against the models they refer to.
+
+        Args:
+            location (str): The field being validated, as `"Model.field"`, used to prefix errors.
+            source (type[dataclass]): The model the field belongs to.
+            kwargs (dict[str, Any]): The keyword arguments of the field's `FakeType`.
+
+        Returns:
+            list[str]: A description of every problem found, empty if there are none.
+        """
+        errors: list[str] = []
+        model = self._models.get(kwargs.get("model"))
+        if model is None:
+            # Models that couldn't be found were already recorded while building the field dependencies.
+            if "model" not in kwargs:
+                errors.append(f"{location}: no model given")
+            return errors
+
+        if not kwargs.get("field") and not kwargs.get("fields"):
+            errors.append(f"{location}: no field given")
+        if kwargs.get("field") and not self._has_field(model, kwargs["field"]):
+            errors.append(f"{location}: field {kwargs['field']} not found in model {model.__name__}")
+        if "fields" in kwargs and len(kwargs["fields"]) == 0:
+            errors.append(f"{location}: at least one field is required")
+        for f in kwargs.get("fields", []):
+            if not self._has_field(model, f):
+                errors.append(f"{location}: field {f} from fields not found in model {model.__name__}")
+
+        value = kwargs.get("value")
+        if isinstance(value, ValueOf) and not self._has_field(source, value.field):
+            errors.append(f"{location}: value field {value.field} not found in model {source.__name__}")
+
+        for condition in kwargs.get("conditions") or []:
+            if not self._has_field(source, condition.field):
+                errors.append(f"{location}: condition field {condition.field} not found in model {source.__name__}")
+            if isinstance(condition.value, ValueOf) and not self._has_field(model, condition.value.field):
+                errors.append(
+                    f"{location}: condition value field {condition.value.field} not found in model {model.__name__}"
+                )
+
+        return errors
+
+    def _validate_schema(self) -> None:
+        """
+        Validate every field in the field dependencies before the field DAG is built: the provider of each `FakeType`
+        must exist and accept its arguments, and the models and fields named by referring providers must exist. Every
+        problem is collected and reported at once.
+
+        Returns:
+            None
+
+        Raises:
+            SchemaValidationError: If any problems were found.
+        """
+        errors: list[str] = list(self._schema_errors)
+        for model_name, field_name in self._field_dependencies:
+            fake_type = self._fake_types[model_name][field_name]
+            if fake_type is None:
+                continue
+
+            location = f"{model_name}.{field_name}"
+            if fake_type.type != DERIVED and not hasattr(self._fake, fake_type.type):
+                errors.append(f"{location}: provider {fake_type.type} not found")
+                continue
+
+            function = self._derive_column if fake_type.type == DERIVED else getattr(self._fake, fake_type.type)
+            for kwarg in fake_type.kwargs:
+                if not self._has_keyword_argument(function, kwarg):
+                    errors.append(f"{location}: provider {fake_type.type} has no keyword argument {kwarg}")
+
+            if fake_type.type in self._dependent_fake_providers or fake_type.type == DERIVED:
+                errors += self._validate_referring_field(location, self._models[model_name], fake_type.kwargs)
+            if fake_type.type in self._dependent_fake_providers:
+                errors += [
+                    f"{location}: reads derived column {column}, which is only computed after generation"
+                    for column in self._derived_columns_read(model_name, fake_type.kwargs)
+                ]
+
+        if len(errors) > 0:
+            raise SchemaValidationError(list(dict.fromkeys(errors)))
+
+        return None
+
+    def _is_derived(self, model_name: str, field_name: str) -> bool:
+        fake_type = self._fake_types.get(model_name, {}).get(field_name)
+        return fake_type is not None and fake_type.type == DERIVED
+
+    def _derived_columns_read(self, model_name: str, kwargs: dict[str, Any]) -> list[str]:
+        """
+        Find the derived columns that a referring provider or a derived column reads.
+
+        Args:
+            model_name (str): The model the field belongs to.
+            kwargs (dict[str, Any]): The keyword arguments of the field's `FakeType`.
+
+        Returns:
+            list[str]: The derived columns read, as `"Model.field"`.
+        """
+        model = kwargs.get("model")
+        target = model if isinstance(model, str) else getattr(model, "__name__", None)
+        read = [(target, kwargs.get("field")), *((target, f) for f in kwargs.get("fields", []))]
+        for condition in kwargs.get("conditions") or []:
+            read.append((model_name, condition.field))
+            if isinstance(condition.value, ValueOf):
+                read.append((target, condition.value.field))
+        if isinstance(kwargs.get("value"), ValueOf):
+            read.append((model_name, kwargs["value"].field))
+
+        return list(dict.fromkeys(f"{m}.{f}" for m, f in read if f and self._is_derived(m, f)))
+
     def _model_str_to_model(self, model_str: str) -> type[dataclass]:
         """
         Converts a model string to a model type.
@@ -258,10 +754,9 @@ class FakeSchemaGenerator:
                     model: type[dataclass] = frame.f_globals[model_str]
                     if is_dataclass(model):
                         return model
-                else:
-                    new_frame = frame.f_back
-                    del frame
-                    frame = new_frame
+                new_frame = frame.f_back
+                del frame
+                frame = new_frame
         finally:
             del frame
 
@@ -310,38 +805,301 @@ class FakeSchemaGenerator:
             if not self._has_field(model, f):
                 raise ValueError(f"Field {f} from fields not found in model {model.__name__}")
 
+        return self._calculate(source_model, model, field, value, fields, row_op, col_op)
+
+    def _calculate(
+        self,
+        source_model: dataclass,
+        model: type[dataclass],
+        field: str,
+        value: Any,
+        fields: list[str],
+        row_op: Optional[Callable] = noop,
+        col_op: Optional[Callable] = noop,
+    ) -> Any:
+        """
+        `calculate` without any checks on its arguments, for callers that have already validated them.
+        """
         value = getattr(source_model, value.field) if isinstance(value, ValueOf) else value
 
         rows: list[model] = [
-            instance for instance in self._instances[model.__name__] if getattr(instance, field) == value
+            instance for instance in self._instances.get(model.__name__, []) if getattr(instance, field) == value
         ]
-        rows += [r for r in self._raw_data[model.__name__] if r == value]
+        with self._table_locks[model.__name__]:
+            rows += self._stored_rows(model.__name__, field, value)
+
+        return self._aggregate(rows, fields, row_op, col_op)
+
+    def _stored_rows(self, model_name: str, field: str, value: Any) -> list[dataclass]:
+        """
+        Get the stored rows of a model whose `field` equals `value`, in order. They're read from the index on `field`
+        if it has every row, so a table that isn't held in memory isn't read in full, and scanned for otherwise.
+
+        Args:
+            model_name (str): The model of the rows.
+            field (str): The field compared to `value`.
+            value (Any): The value.
+
+        Returns:
+            list[dataclass]: The rows.
+        """
+        raw_data = self._raw_data[model_name]
+        index = self._indexes[model_name].get(((field,), None))
+        if index is not None and len(index) == len(raw_data):
+            try:
+                return index.rows((value,))
+            except TypeError:
+                # The value can't be looked up in the index.
+                pass
+        return [r for r in raw_data.read() if getattr(r, field) == value]
+
+    @staticmethod
+    def _aggregate(rows: list[dataclass], fields: list[str], row_op: Callable, col_op: Callable) -> Any:
+        """
+        Apply `row_op` to `fields` of each row, then `col_op` to the results, as `calculate` does.
 
+        Args:
+            rows (list[dataclass]): The rows to aggregate.
+            fields (list[str]): The fields to use in the calculation.
+            row_op (Callable): The operation to perform on each row.
+            col_op (Callable): The operation to perform on the column of row results.
+
+        Returns:
+            Any: `0` if there are no rows, the result of `row_op` if there is one row, otherwise the result of `col_op`.
+        """
         if len(rows) == 0:
             return 0
-        else:
-            col_values = []
-            for instance in rows:
-                row_values = [getattr(instance, f) for f in fields]
-                row_value = row_op(row_values)
-                col_values.append(row_value)
-            if len(col_values) == 1:
-                return col_values[0]
-            else:
-                return col_op(col_values)
 
-    def data(
-        self, model: Optional[str | type[dataclass]] = None
-    ) -> list[dataclass] | dict[str, list[dataclass]] | None:
+        col_values = [row_op([getattr(instance, f) for f in fields]) for instance in rows]
+        if len(col_values) == 1:
+            return col_values[0]
+        return col_op(col_values)
+
+    def calculate_batch(
+        self,
+        source_models: list[dataclass],
+        model: type[dataclass] | str,
+        field: str,
+        value: Any,
+        fields: list[str],
+        row_op: Optional[Callable] = noop,
+        col_op: Optional[Callable] = noop,
+    ) -> list[Any]:
+        """
+        `calculate` for a block of rows at once. The stored rows of `model` are looked up once per value in the index
+        on `field`, or grouped by `field` in a single pass without one, so each row in the block only has to look up its
+        group.
+
+        Args:
+            source_models (list[dataclass]): The models whose field is being filled in by the calculation.
+            model (str | type[dataclass]): The model from which to calculate the values.
+            field (str): The field used to join the `source_models` to the `model`.
+            value (Any): The value used to join the `source_models` to the `model`.
+            fields (list[str]): The fields to use in the calculation.
+            row_op (Optional[Callable], optional): The operation to perform on the row. Defaults to `noop`.
+            col_op (Optional[Callable], optional): The operation to perform on the column. Defaults to `noop`.
+
+        Returns:
+            list[Any]: The calculated value for each of the `source_models`, in order.
+
+        Raises:
+            ValueError: If the `model` is not found in the models.
+            ValueError: If the `field` is not found in the `model`.
+            ValueError: If any of the `fields` are not found in the `model`.
+        """
+        if len(fields) == 0:
+            raise ValueError("At least one field is required")
+
+        if isinstance(model, str):
+            model = self._model_str_to_model(model)
+
+        if field and not self._has_field(model, field):
+            raise ValueError(f"Field {field} not found in model {model.__name__}")
+
+        for f in fields:
+            if not self._has_field(model, f):
+                raise ValueError(f"Field {f} from fields not found in model {model.__name__}")
+
+        return self._calculate_batch(source_models, model, field, value, fields, row_op, col_op)
+
+    def _calculate_batch(
+        self,
+        source_models: list[dataclass],
+        model: type[dataclass],
+        field: str,
+        value: Any,
+        fields: list[str],
+        row_op: Optional[Callable] = noop,
+        col_op: Optional[Callable] = noop,
+    ) -> list[Any]:
+        """
+        `calculate_batch` without any checks on its arguments, for callers that have already validated them.
+        """
+        values = [getattr(m, value.field) if isinstance(value, ValueOf) else value for m in source_models]
+
+        # Rows being generated come first, as they do in `calculate`.
+        groups: dict[Any, list[dataclass]] = {}
+        try:
+            for instance in self._instances.get(model.__name__, []):
+                groups.setdefault(getattr(instance, field), []).append(instance)
+            with self._table_locks[model.__name__]:
+                raw_data = self._raw_data[model.__name__]
+                index = self._indexes[model.__name__].get(((field,), None))
+                if index is not None and len(index) == len(raw_data):
+                    for v in dict.fromkeys(values):
+                        groups.setdefault(v, []).extend(index.rows((v,)))
+                else:
+                    for row in raw_data.read():
+                        groups.setdefault(getattr(row, field), []).append(row)
+        except TypeError:
+            # Unhashable join values can't be grouped.
+            return [self._calculate(m, model, field, value, fields, row_op, col_op) for m in source_models]
+
+        return [self._aggregate(groups.get(v, []), fields, row_op, col_op) for v in values]
+
+    def _derive_column(
+        self,
+        source_models: list[dataclass],
+        model: type[dataclass],
+        field: str,
+        value: Any,
+        fields: list[str],
+        row_op: Optional[Callable] = noop,
+        col_op: Optional[Callable] = noop,
+    ) -> list[Any]:
+        """
+        Compute a derived column for every row of a model at once, with the same arguments and results as `calculate`.
+        See `derive`.
+
+        Args:
+            source_models (list[dataclass]): The rows whose derived column is computed.
+            model (type[dataclass]): The model from which to calculate the values.
+            field (str): The field used to join the `source_models` to the `model`.
+            value (Any): The value used to join the `source_models` to the `model`.
+            fields (list[str]): The fields to use in the calculation.
+            row_op (Optional[Callable], optional): The operation to perform on the row. Defaults to `noop`.
+            col_op (Optional[Callable], optional): The operation to perform on the column. Defaults to `noop`.
+
+        Returns:
+            list[Any]: The value of the column for each of the `source_models`, in order.
+        """
+        keys = [getattr(m, value.field) if isinstance(value, ValueOf) else value for m in source_models]
+        return group_aggregate(keys, self._raw_data[model.__name__].read(), field, fields, row_op, col_op)
+
+    def derive(self) -> None:
         """
-        Get the data generated for a specific model or all models.
+        Compute the derived columns of every model from the rows generated so far. A derived column is declared with
+        `FakeType("derived", ...)` and the same arguments as `calculate`, but instead of being calculated row by row as
+        the rows are generated, it's left empty and computed for the whole table at once afterwards, grouping the rows
+        of the referenced model in a single pass. `generate` derives the columns once it's done, callers of
+        `generate_from_dag` have to call `derive` themselves.
+
+        Returns:
+            None
+        """
+        with self._all_tables_locked():
+            if len(self._model_dependencies) == 0:
+                self._build_model_dependencies()
+
+            for field_plan in self._derived:
+                rows = self._raw_data[field_plan.model]
+                rows.set_column(field_plan.field, field_plan.function(rows.read(), **field_plan.kwargs))
+
+        return None
+
+    def explain(self, rows: int = 1000, batch_size: int = 1) -> PlanExplanation:
+        """
+        Explain how `generate(rows, batch_size=batch_size)` would generate the schema, without generating anything: the
+        order the fields are generated in, the waves of fields that only depend on earlier waves, and for each field the
+        strategy used to generate it and an estimate of its cost per row. Fields whose cost grows with the size of the
+        table they read, such as a `calculate` whose rows can't be indexed, are listed in `PlanExplanation.warnings`.
+
+        Args:
+            rows (int, optional): The number of rows per model to estimate the costs for. Defaults to 1000.
+            batch_size (int, optional): The number of rows per model in each block. Defaults to 1.
+
+        Returns:
+            PlanExplanation: The explanation. Printing it shows a table of the fields.
+        """
+        with self._lock:
+            if len(self._model_dependencies) == 0:
+                self._build_model_dependencies()
+
+            waves: dict[tuple[str, str], int] = {}
+
+            def wave(node: tuple[str, str]) -> int:
+                if node not in waves:
+                    dependencies = self._field_dependencies[node] | self._source_field_dependencies(node)
+                    waves[node] = max((wave(d) + 1 for d in dependencies if d in self._field_dependencies), default=0)
+                return waves[node]
+
+            explanation = PlanExplanation(rows, batch_size)
+            for field_plan in self._plan:
+                node = (field_plan.model, field_plan.field)
+                explanation.fields.append(self._explain_field(field_plan, wave(node), rows, batch_size))
+            for field_plan in self._derived:
+                explanation.derived.append(self._explain_field(field_plan, None, rows, batch_size))
+
+        return explanation
+
+    def _explain_field(
+        self, field_plan: FieldPlan, wave: Optional[int], rows: int, batch_size: int
+    ) -> FieldExplanation:
+        """
+        Explain how a field of the plan is generated, see `explain`. The cost of reading a table is estimated from its
+        average size over the run, half way through generating `rows` more rows.
+        """
+        provider = self._fake_types[field_plan.model][field_plan.field].type
+        kwargs = field_plan.kwargs
+        explained = partial(FieldExplanation, field_plan.model, field_plan.field, provider, wave)
+        if not field_plan.referring:
+            strategy = "scalar" if field_plan.batch_function is None else "batch"
+            return explained(strategy, "O(1)", 1.0)
+
+        target = kwargs["model"].__name__ if isinstance(kwargs.get("model"), type) else kwargs.get("model")
+        if provider == DERIVED:
+            source_rows = max(len(self._raw_data[field_plan.model]) + rows, 1)
+            cost = 1 + (len(self._raw_data[target]) + rows) / source_rows
+            return explained("derived", "O(1)", cost, f"groups {target} by {kwargs['field']} once")
+        if provider not in ("calculate", "reference"):
+            strategy = "scalar" if field_plan.batch_function is None else "batch"
+            return explained(strategy, "unknown", None, "" if target is None else f"reads {target}")
+
+        n = len(self._raw_data[target]) + rows / 2
+        if provider == "calculate" and ((kwargs["field"],), None) in self._indexes[target]:
+            return explained("index lookup", "O(log n)", log2(n + 1) + 1, f"{target} rows by {kwargs['field']}")
+        if provider == "calculate":
+            return explained("scan", "O(n / batch_size)", n / batch_size + 1, f"groups {target} by {kwargs['field']}")
+
+        conditions = kwargs.get("conditions")
+        if not conditions:
+            return explained("batch", "O(1)", 1.0, f"random {target}.{kwargs['field']}")
+
+        reads = f"{target}.{kwargs['field']} where " + " and ".join(
+            f"{c.field} {getattr(c.comparison, '__name__', c.comparison)} "
+            + (f"{target}.{c.value.field}" if isinstance(c.value, ValueOf) else repr(c.value))
+            for c in conditions
+        )
+        plan = JoinPlan(conditions)
+        if plan.index_fields is not None and plan.index_fields in self._indexes[target]:
+            # A random match also scans the block for matches that aren't indexed yet.
+            cost = log2(n + 1) + 1 + (batch_size if kwargs.get("random_match") else 0)
+            return explained("index lookup", "O(log n)", cost, reads)
+        if plan.strategy == "nested_loop" and len(plan.equalities) == 0:
+            return explained("scan", "O(n)", n, reads)
+        return explained("scan", "O(n / batch_size)", n / batch_size + 1, reads)
+
+    def data(self, model: Optional[str | type[dataclass]] = None) -> TableStorage | dict[str, TableStorage] | None:
+        """
+        Get the data generated for a specific model or all models. With the default `MemoryStorage`, the tables are
+        lists of rows.
 
         Args:
             model (Optional[str | type[dataclass]]): The model for which you want to get data. Defaults to None.
 
         Returns:
-            list[dataclass]: When `model` is specified.
-            dict[str, list[dataclass]]: When `model` is None and there is data.
+            TableStorage: When `model` is specified.
+            dict[str, TableStorage]: When `model` is None and there is data.
             None: When `model` is None and there is no data or the model is not found.
         """
         if model is not None:
@@ -359,44 +1117,542 @@ class FakeSchemaGenerator:
 
         return self._raw_data
 
-    def generate(self) -> None:
+    def _columns(self, model: str | type[dataclass]) -> tuple[type[dataclass], dict[str, list[Any]]]:
+        """
+        Get a model and the values of each of its fields in its generated rows, read from the table a column at a time.
+        """
+        if isinstance(model, str):
+            model = self._model_str_to_model(model)
+        names = [f.name for f in dataclass_fields(model)]
+        table = self._raw_data.get(model.__name__)
+        return model, table.columns(names) if table is not None else {name: [] for name in names}
+
+    def to_arrow(self, model: str | type[dataclass]) -> Any:
+        """
+        Get the rows generated for a model as a `pyarrow.Table`, with a column per field. Each column is read from the
+        table in one pass and converted to an Arrow array in one call, without building a dictionary per row, and its
+        type is taken from the field's type hint where it can be, see `arrow_table`.
+
+        Args:
+            model (str | type[dataclass]): The model.
+
+        Returns:
+            pyarrow.Table: The rows.
+
+        Raises:
+            ImportError: If pyarrow isn't installed.
         """
-        A convenience wrapper around `generate_from_dag`. Generated data is accessible via the `data` method.
+        return arrow_table(*self._columns(model))
+
+    def to_pandas(self, model: str | type[dataclass]) -> Any:
         """
-        self.generate_from_dag()
+        Get the rows generated for a model as a `pandas.DataFrame`, with a column per field. When pyarrow is installed
+        the frame is converted from `to_arrow`, which gives the columns the types of their type hints, and otherwise
+        it's built from the columns as lists.
+
+        Args:
+            model (str | type[dataclass]): The model.
 
-    def generate_from_dag(self) -> None:
+        Returns:
+            pandas.DataFrame: The rows.
+
+        Raises:
+            ImportError: If pandas isn't installed.
         """
-        Generates data for the registered schema. Generated data is accessible via the `data` method.
+        pandas = optional_import("pandas")
+        if pandas is None:
+            raise ImportError("pandas is required to convert tables to pandas, install it with `pip install pandas`")
+        if optional_import("pyarrow") is not None:
+            return self.to_arrow(model).to_pandas()
+        _, columns = self._columns(model)
+        return pandas.DataFrame(columns, columns=list(columns))
+
+    def to_polars(self, model: str | type[dataclass]) -> Any:
         """
+        Get the rows generated for a model as a `polars.DataFrame`, with a column per field. When pyarrow is installed
+        the frame shares the buffers of `to_arrow`'s table without copying them, and otherwise it's built from the
+        columns as lists.
+
+        Args:
+            model (str | type[dataclass]): The model.
+
+        Returns:
+            polars.DataFrame: The rows.
+
+        Raises:
+            ImportError: If polars isn't installed.
+        """
+        polars = optional_import("polars")
+        if polars is None:
+            raise ImportError("polars is required to convert tables to polars, install it with `pip install polars`")
+        if optional_import("pyarrow") is not None:
+            return polars.from_arrow(self.to_arrow(model))
+        _, columns = self._columns(model)
+        return polars.DataFrame(columns, strict=False)
+
+    def subset(
+        self,
+        model: str | type[dataclass],
+        sample: float | Callable[[dataclass], bool],
+        seed: Any = None,
+        children: bool = True,
+    ) -> dict[str, list[dataclass]]:
+        """
+        Take a referentially consistent subset of the generated rows, e.g. a small fixture of a large dataset. The
+        subset starts with a sample of the rows of `model` and pulls in:
+
+        * The rows that the rows in the subset reference, so that every reference resolves, recursively.
+        * The rows that the `calculate` fields and derived columns of the rows in the subset aggregate, so that the
+          aggregates still add up.
+        * With `children`, the rows that reference the sampled rows, recursively, e.g. the orders of sampled customers
+          and the lines of those orders.
+
+        References are followed on the field they return: a row referencing `Customer.id` pulls in the customers with
+        that id. The fields of custom referring providers aren't followed. Each table is read at most twice, once to
+        index the fields the subset follows and once for the rows it pulls in.
+
+        Args:
+            model (str | type[dataclass]): The model to sample.
+            sample (float | Callable[[dataclass], bool]): The fraction of the rows of `model` to sample at random, or a
+                function that returns whether to sample a row.
+            seed (Any, optional): The seed of the random sample. Defaults to None, to seed from the system.
+            children (bool, optional): Whether to pull in the rows that reference the sampled rows. Defaults to True.
+
+        Returns:
+            dict[str, list[dataclass]]: The rows of every model in the subset, in the order they were generated. The
+            rows are the generator's own rows, as returned by `data`, not copies.
+
+        Raises:
+            ValueError: If `sample` is a fraction outside of 0 to 1.
+        """
+        if not callable(sample) and not 0 <= sample <= 1:
+            raise ValueError("sample must be a fraction from 0 to 1 or a function")
+        if isinstance(model, str):
+            model = self._model_str_to_model(model)
+
+        with self._all_tables_locked():
+            if len(self._model_dependencies) == 0:
+                self._build_model_dependencies()
+
+            # The fields followed out of the rows of each model: (field, target model, target field) per reference,
+            # (target model, target field, value) per aggregate, and (child model, child field, field) per reference
+            # to the model.
+            references: dict[str, list[tuple[str, str, str]]] = {m: [] for m in self._models}
+            aggregates: dict[str, list[tuple[str, str, Any]]] = {m: [] for m in self._models}
+            referenced_by: dict[str, list[tuple[str, str, str]]] = {m: [] for m in self._models}
+            for model_name, fake_types in self._fake_types.items():
+                for field_name, fake_type in fake_types.items():
+                    if fake_type is None or "model" not in fake_type.kwargs:
+                        continue
+                    target = getattr(fake_type.kwargs["model"], "__name__", fake_type.kwargs["model"])
+                    if fake_type.type == "reference" and fake_type.kwargs.get("field"):
+                        references[model_name].append((field_name, target, fake_type.kwargs["field"]))
+                        referenced_by[target].append((model_name, field_name, fake_type.kwargs["field"]))
+                    elif fake_type.type in ("calculate", DERIVED):
+                        aggregates[model_name].append((target, fake_type.kwargs["field"], fake_type.kwargs["value"]))
+
+            key_fields: dict[str, set[str]] = {m: set() for m in self._models}
+            for model_name in self._models:
+                for _, target, target_field in references[model_name]:
+                    key_fields[target].add(target_field)
+                for target, target_field, _ in aggregates[model_name]:
+                    key_fields[target].add(target_field)
+                for child, child_field, _ in referenced_by[model_name]:
+                    key_fields[child].add(child_field)
+
+            # The positions of the rows of each model by the values of its key fields, built the first time the
+            # subset reaches the model.
+            lookups: dict[str, dict[str, dict[Any, list[int]]]] = {}
+
+            def lookup(model_name: str, field_name: str, value: Any) -> list[int]:
+                if model_name not in lookups:
+                    lookups[model_name] = {f: {} for f in key_fields[model_name]}
+                    for position, row in enumerate(self._raw_data[model_name].read()):
+                        for f, positions in lookups[model_name].items():
+                            positions.setdefault(getattr(row, f), []).append(position)
+                return lookups[model_name][field_name].get(value, [])
+
+            rows: dict[str, dict[int, dataclass]] = {m: {} for m in self._models}
+            # Whether the children of each row in the subset have been pulled in.
+            descended: dict[str, set[int]] = {m: set() for m in self._models}
+            queue: deque[tuple[str, int, bool]] = deque()
+
+            def add(model_name: str, positions: list[int], descend: bool) -> None:
+                for position in positions:
+                    if position not in rows[model_name] or (descend and position not in descended[model_name]):
+                        rows[model_name].setdefault(position, None)
+                        if descend:
+                            descended[model_name].add(position)
+                        queue.append((model_name, position, descend))
+
+            table = self._raw_data[model.__name__]
+            if callable(sample):
+                add(model.__name__, [p for p, row in enumerate(table) if sample(row)], children)
+            else:
+                rng = Random(seed)
+                add(model.__name__, rng.sample(range(len(table)), round(len(table) * sample)), children)
+
+            while queue:
+                model_name, position, descend = queue.popleft()
+                row = rows[model_name][position]
+                if row is None:
+                    row = rows[model_name][position] = self._raw_data[model_name][position]
+                for field_name, target, target_field in references[model_name]:
+                    add(target, lookup(target, target_field, getattr(row, field_name)), False)
+                for target, target_field, value in aggregates[model_name]:
+                    value = getattr(row, value.field) if isinstance(value, ValueOf) else value
+                    add(target, lookup(target, target_field, value), False)
+                if descend:
+                    for child, child_field, field_name in referenced_by[model_name]:
+                        add(child, lookup(child, child_field, getattr(row, field_name)), True)
+
+        return {m: [model_rows[p] for p in sorted(model_rows)] for m, model_rows in rows.items()}
+
+    def seed_instance(self, seed: Any = None) -> None:
+        """
+        Seed the Faker of the generator, so that generating the same schema again generates the same rows, see
+        `Faker.seed_instance`. A thread-safe generator seeds its threads' Fakers from the seed, see
+        `ThreadLocalFaker.seed_instance`.
+
+        Args:
+            seed (Any, optional): The seed. Defaults to None, to seed from the system.
+
+        Returns:
+            None
+        """
+        self._fake.seed_instance(seed)
+
+        return None
+
+    def high_water_marks(self) -> dict[str, int]:
+        """
+        Get the highest sequential number handed out in each namespace, see `SequentialNumberProvider.high_water_marks`.
+        Saving the marks and passing them to `continue_from` in a later run continues the sequences where this run left
+        off, e.g. to append rows to a database without reusing primary keys.
+
+        Returns:
+            dict[str, int]: The highest number of each namespace.
+        """
+        return self._sequences.high_water_marks()
+
+    def continue_from(self, marks: dict[str, int]) -> None:
+        """
+        Continue the sequences past `high_water_marks`, see `SequentialNumberProvider.continue_from`.
+
+        Args:
+            marks (dict[str, int]): The highest number handed out in each namespace.
+
+        Returns:
+            None
+        """
+        self._sequences.continue_from(marks)
+
+        return None
+
+    def _merge_worker(self, worker: "FakeSchemaGenerator", start: dict[str, int]) -> None:
+        """
+        Append the rows a worker generated to this generator's data and move each sequence past the worker's.
+
+        Args:
+            worker (FakeSchemaGenerator): A worker returned by `_spawn_worker`, after it has generated its rows.
+            start (dict[str, int]): The number of rows of each model that the worker started with.
+
+        Returns:
+            None
+        """
+        for model_name, rows in worker._raw_data.items():
+            self._store_rows(model_name, rows[start[model_name] :])
+
+        self._sequences.continue_from(worker._sequences.high_water_marks())
+
+        return None
+
+    def _custom_providers(self) -> list[Any]:
+        """
+        Get the providers added to the Faker other than the built-in ones, in the order they were added.
+        """
+        default_providers = (
+            SequentialNumberProvider,
+            ProductNameProvider,
+            TemplateProvider,
+            CategoricalProvider,
+            CalculateProvider,
+            ReferenceProvider,
+        )
+        # Providers are inserted at the front of the list, so reverse it to get them in their original order.
+        return [
+            provider
+            for provider in reversed(self._fake.get_providers())
+            if type(provider) not in default_providers and not type(provider).__module__.startswith("faker.")
+        ]
+
+    def _add_provider_copy(self, provider: Any) -> None:
+        """
+        Add a copy of another generator's custom provider to the Faker, see `_copy_provider`.
+        """
+        provider = self._copy_provider(provider, self._fake, self)
+        if isinstance(provider, SchemaReferenceBaseProvider):
+            self._add_referring_provider(provider.reference_functions)
+        self._fake.add_provider(provider)
+
+        return None
+
+    def snapshot(self) -> GeneratorSnapshot:
+        """
+        Freeze the state of the generator: the rows and indexes of every model, the sequences and the state of the
+        random number generator. Any number of generators can be forked from the snapshot with
+        `GeneratorSnapshot.fork`, e.g. one per test from a dataset generated once per test session. Forking only copies
+        what a fork changes, and a fork generates the rows that this generator would have generated next.
+
+        Taking the snapshot copies every row into memory, once, so that the snapshot doesn't change with this generator.
+
+        Returns:
+            GeneratorSnapshot: The snapshot.
+        """
+        with self._all_tables_locked():
+            tables = {model: tuple(copy(row) for row in rows.read()) for model, rows in self._raw_data.items()}
+            indexes: dict[str, dict[tuple, SortedIndex]] = {model: {} for model in tables}
+            for model, model_indexes in self._indexes.items():
+                for index_fields in model_indexes:
+                    index = SortedIndex(*index_fields)
+                    try:
+                        index.extend(tables[model])
+                    except TypeError:
+                        continue
+                    indexes[model][index_fields] = index
+
+            return GeneratorSnapshot(
+                type(self),
+                dict(self._models),
+                tables,
+                indexes,
+                self.high_water_marks(),
+                self._fake.random.getstate(),
+                self._custom_providers(),
+                len(self._model_dependencies) > 0,
+            )
+
+    def fork(self) -> "FakeSchemaGenerator":
+        """
+        Create a generator with the current state of this one, see `snapshot`. Forking a `GeneratorSnapshot` instead
+        doesn't copy the rows again for every fork.
+
+        Returns:
+            FakeSchemaGenerator: The fork.
+        """
+        return self.snapshot().fork()
+
+    @classmethod
+    def _from_snapshot(cls, snapshot: GeneratorSnapshot) -> "FakeSchemaGenerator":
+        """
+        Create a generator with the state of a snapshot, see `GeneratorSnapshot.fork`.
+        """
+        fake = cls()
+        # Seeding gives the fork a `random.Random` of its own, which unseeded Fakers share.
+        fake._fake.seed_instance(0)
+        fake._fake.random.setstate(snapshot.random_state)
+        for provider in snapshot.providers:
+            fake._add_provider_copy(provider)
+        for model_name, model in snapshot.models.items():
+            fake.register(model)
+            fake._raw_data[model_name] = CopyOnWriteTable(snapshot.tables[model_name])
+            fake._indexes[model_name] = {fields: index.fork() for fields, index in snapshot.indexes[model_name].items()}
+        fake.continue_from(snapshot.marks)
+        if snapshot.built:
+            fake._build_model_dependencies()
+
+        return fake
+
+    def _spawn_worker(self, index: int, workers: int) -> "FakeSchemaGenerator":
+        """
+        Create a generator that can generate rows for this schema in another thread. The worker has its own Faker,
+        seeded from this generator's, its own copies of any custom providers, and sequences interleaved with those of
+        the other workers so that they never hand out the same number. Existing rows are shared, not copied, and the
+        worker keeps them in a `MemoryStorage` whatever this generator's storage is.
+
+        Args:
+            index (int): The position of the worker, from `0` to `workers - 1`.
+            workers (int): The number of workers.
+
+        Returns:
+            FakeSchemaGenerator: The worker.
+        """
+        worker = FakeSchemaGenerator()
+        worker._fake.seed_instance(self._fake.random.getrandbits(64))
+        for provider in self._custom_providers():
+            worker._add_provider_copy(provider)
+
+        for model in self._models.values():
+            worker.register(model)
+            worker._raw_data[model.__name__].extend(self._raw_data[model.__name__].read())
+
+        worker._sequences.numbers = self._sequences.numbers.copy()
+        worker._sequences.set_stride(index, workers)
+
+        return worker
+
+    def generate(self, count: int = 1, workers: int = 1, batch_size: int = 1) -> None:
+        """
+        Generate `count` rows for every model in the schema. Generated data is accessible via the `data` method.
+
+        With more than one worker, the rows are split between workers that each generate their share in their own
+        thread. Workers don't share any mutable state, so this scales across cores on free-threaded builds of CPython,
+        and rows are handed back without being copied or pickled. Each worker's new rows only reference rows generated
+        before the call or by the same worker, and sequential numbers are interleaved between workers, so numbers can
+        be skipped if the rows don't divide evenly between them.
+
+        A thread-safe generator doesn't need workers: the threads generate rows with the generator itself, so their rows
+        can reference each other's, and lease sequential numbers in blocks, so numbers aren't in the order of the rows.
+
+        Rows are generated in blocks of `batch_size` rows per model, see `generate_from_dag`. Rows in a block can
+        reference each other as well as the rows generated before it. Derived columns are computed once all the rows
+        are generated, see `derive`.
+
+        Args:
+            count (int): The number of rows to generate for every model. Defaults to 1.
+            workers (int): The number of threads to generate the rows in. Defaults to 1.
+            batch_size (int): The number of rows per model to generate in each block. Defaults to 1.
+
+        Returns:
+            None
+        """
+        if workers <= 1 or count <= 1:
+            self._generate_blocks(count, batch_size)
+            self.derive()
+            return None
+
         if len(self._model_dependencies) == 0:
             self._build_model_dependencies()
 
-        for field in self._field_dag:
-            iter_model, iter_field = field
+        workers = min(workers, count)
+        shares = [count // workers + (1 if i < count % workers else 0) for i in range(workers)]
+        if isinstance(self._fake, ThreadLocalFaker):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for result in [executor.submit(self._generate_blocks, share, batch_size) for share in shares]:
+                    result.result()
+            self.derive()
+            return None
 
-            if iter_model not in self._instances:
-                self._instances[iter_model] = []
-                current_instance = self._interfaces[iter_model]()
-                self._instances[iter_model].append(current_instance)
-            current_instance = self._instances[iter_model][-1]
-            fake_type = next(
-                filter(
-                    lambda x: isinstance(x, FakeType),
-                    self._annotations[iter_model][iter_field]["metadata"],
-                ),
-                None,
+        start = {model_name: len(rows) for model_name, rows in self._raw_data.items()}
+        spawned = [self._spawn_worker(i, workers) for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in [executor.submit(w._generate_blocks, share, batch_size) for w, share in zip(spawned, shares)]:
+                result.result()
+
+        for worker in spawned:
+            self._merge_worker(worker, start)
+        self.derive()
+
+        return None
+
+    def generate_shard(
+        self,
+        manifest: ShardManifest,
+        batch_size: int = 100,
+        callback: Optional[Callable[[GenerationProgress], None]] = None,
+        tuner: Optional[AutoTuner] = None,
+    ) -> ShardResult:
+        """
+        Generate the rows of a shard of the schema, see `ShardCoordinator`, without any rows of the other shards. The
+        generator is seeded with the shard's seed and its sequences hand out the shard's key ranges, and the references
+        listed in the manifest pick keys from the key space of the whole schema. Generate each shard with a new
+        generator, with the same models registered as the generator the manifests were made from.
+
+        Args:
+            manifest (ShardManifest): The manifest of the shard.
+            batch_size (int, optional): The number of rows per model to generate in each block. Defaults to 100.
+            callback (Optional[Callable[[GenerationProgress], None]], optional): Called with the progress of the shard
+                after every block, see `GenerationController`. Defaults to None.
+            tuner (Optional[AutoTuner], optional): Picks the batch sizes instead of `batch_size`, see `AutoTuner`.
+                Defaults to None.
+
+        Returns:
+            ShardResult: The number of rows generated of each model, and the keys handed out in each namespace, to pass
+            on to `ShardCoordinator.merge`.
+        """
+        with self._lock:
+            if len(self._model_dependencies) == 0:
+                self._build_model_dependencies()
+
+        self.seed_instance(manifest.seed)
+        self.continue_from({namespace: start - 1 for namespace, (start, _) in manifest.key_ranges.items()})
+        self._plan = [
+            (
+                replace(p, batch_function=partial(self._key_space_batch, range(*manifest.key_space[namespace])))
+                if (namespace := manifest.key_references.get(f"{p.model}.{p.field}")) is not None
+                else p
             )
+            for p in self._plan
+        ]
+        GenerationController(manifest.rows, callback=callback, interval=0, batch_size=batch_size, tuner=tuner).run(self)
+
+        # The keys handed out in each namespace of the shard, by every field that uses the namespace.
+        keys: dict[str, set[int]] = {namespace: set() for namespace in manifest.key_ranges}
+        for model_name, fake_types in self._fake_types.items():
+            table = self._raw_data[model_name]
+            for field_name, fake_type in fake_types.items():
+                if fake_type is not None and fake_type.type == "sequential_number":
+                    namespace = fake_type.kwargs.get("namespace", "default")
+                    if namespace in keys:
+                        keys[namespace].update(table.value(p, field_name) for p in range(len(table)))
+
+        return ShardResult(
+            manifest.shard,
+            rows={model: len(self._raw_data[model]) for model in manifest.rows},
+            keys={namespace: (min(found), max(found), len(found)) for namespace, found in keys.items() if found},
+        )
+
+    def _key_space_batch(self, keys: range, source_models: list[dataclass], **kwargs) -> list[int]:
+        """
+        Pick a random key for each of a block of rows from the key space of a namespace, for the references of a shard
+        that are resolved by key arithmetic, see `generate_shard`.
+        """
+        choice = self._fake.random.choice
+        return [choice(keys) for _ in source_models]
+
+    def _generate_blocks(self, count: int, batch_size: int) -> None:
+        for start in range(0, count, batch_size):
+            self.generate_from_dag(rows=min(batch_size, count - start))
+
+        return None
+
+    def generate_from_dag(self, models: Optional[set[str]] = None, rows: int = 1) -> None:
+        """
+        Generates a block of rows for every model in the registered schema. The block is filled in one field at a time
+        in DAG order, so referring providers with a batch function resolve the whole block in a single call. Derived
+        columns are left empty, see `derive`. Generated data is accessible via the `data` method.
 
-            if fake_type and hasattr(self._fake, fake_type.type):
-                fn_kwargs: dict[str, Any] = fake_type.kwargs.copy()
-                if fake_type.type in self._dependent_fake_providers:
-                    fn_kwargs["source_model"] = current_instance
-                fn = getattr(self._fake, fake_type.type)
-                setattr(current_instance, iter_field, fn(**fn_kwargs))
+        Args:
+            models (Optional[set[str]]): The names of the models to generate rows for, all models if `None`. Models
+                that aren't generated can still be referenced through the rows they already have. Defaults to `None`.
+            rows (int): The number of rows in the block for each model. Defaults to 1.
+        """
+        with self._lock:
+            if len(self._model_dependencies) == 0:
+                self._build_model_dependencies()
+
+        for iter_model in self._model_dependencies:
+            if models is None or iter_model in models:
+                row_type = self._row_types[iter_model]
+                self._instances[iter_model] = [row_type() for _ in range(rows)]
+            else:
+                self._instances[iter_model] = []
+
+        for field_plan in self._plan:
+            instances = self._instances[field_plan.model]
+            if not instances:
+                continue
+            if field_plan.batch_function is not None:
+                values = field_plan.batch_function(source_models=instances, **field_plan.kwargs)
+            elif field_plan.referring:
+                values = [field_plan.function(source_model=instance, **field_plan.kwargs) for instance in instances]
+            else:
+                values = [field_plan.function(**field_plan.kwargs) for _ in instances]
+            for instance, value in zip(instances, values):
+                setattr(instance, field_plan.field, value)
 
         for k, v in self._instances.items():
-            self._raw_data[k] += [self._models[k](**asdict(i)) for i in v]
+            self._store_rows(k, self._row_types[k].to_models(v))
 
     def reference(
         self,
@@ -404,6 +1660,7 @@ class FakeSchemaGenerator:
         model: str | type[dataclass],
         field: Optional[Any] = None,
         conditions: Optional[list[SchemaCondition]] = None,
+        random_match: bool = False,
     ) -> Any:
         """
         Reference a value from another model.
@@ -413,6 +1670,8 @@ class FakeSchemaGenerator:
             model (str | type[dataclass]): The model from which to reference the value.
             field (Optional[Any], optional): The field to return. Defaults to None.
             conditions (Optional[list[SchemaCondition]], optional): The conditions to use in the reference. Defaults to None.
+            random_match (bool, optional): Whether to reference a random row among the rows that meet the `conditions`
+                instead of the first one. Defaults to False.
 
         Returns:
             Any: The referenced value.
@@ -427,42 +1686,128 @@ class FakeSchemaGenerator:
         if isinstance(model, str):
             model = self._model_str_to_model(model)
 
+        if model.__name__ not in self._models:
+            self.register(model)
+
+        if field and not self._has_field(model, field):
+            raise ValueError(f"Field {field} not found in model {model.__name__}")
+
+        return self._reference(source_model, model, field, conditions, random_match)
+
+    def _reference(
+        self,
+        source_model: dataclass,
+        model: type[dataclass],
+        field: Optional[Any] = None,
+        conditions: Optional[list[SchemaCondition]] = None,
+        random_match: bool = False,
+    ) -> Any:
+        """
+        `reference` without any checks on its arguments, for callers that have already validated them.
+
+        Raises:
+            ValueError: If the `conditions` are not met.
+            ValueError: If no data is found for the `model` and `field`.
+        """
         model_name: str = model.__name__
-        if model_name not in self._models:
+        with self._table_locks[model_name]:
+            raw_data, instances = self._raw_data[model_name], self._instances.get(model_name, [])
+            if len(raw_data) == 0 and len(instances) == 0:
+                raise ValueError(f"No data found for model {model_name}.{field}")
+
+            if conditions is None:
+                return self._choose_value(raw_data, instances, field)
+
+        return self._reference_batch([source_model], model, field, conditions, random_match)[0]
+
+    def _choose_value(self, raw_data: TableStorage, instances: list[dataclass], field: str) -> Any:
+        """
+        Get a field of a random row from the stored rows followed by the rows of the current block without
+        concatenating them. Draws the same random number as `random.choice` on the concatenated list.
+        """
+        i = self._fake.random.randrange(len(raw_data) + len(instances))
+        return raw_data.value(i, field) if i < len(raw_data) else getattr(instances[i - len(raw_data)], field)
+
+    def reference_batch(
+        self,
+        source_models: list[dataclass],
+        model: str | type[dataclass],
+        field: Optional[Any] = None,
+        conditions: Optional[list[SchemaCondition]] = None,
+        random_match: bool = False,
+    ) -> list[Any]:
+        """
+        `reference` for a block of rows at once. The conditions are resolved for every row in the block with a join
+        (see `JoinPlan`) instead of a scan per row, and the stored rows of `model` are looked up in an index of its
+        table when the schema references them with the same kind of conditions.
+
+        Args:
+            source_models (list[dataclass]): The models whose field is being filled in by the reference.
+            model (str | type[dataclass]): The model from which to reference the values.
+            field (Optional[Any], optional): The field to return. Defaults to None.
+            conditions (Optional[list[SchemaCondition]], optional): The conditions to use in the reference. Defaults to None.
+            random_match (bool, optional): Whether to reference a random row among the rows that meet the `conditions`
+                instead of the first one. Defaults to False.
+
+        Returns:
+            list[Any]: The referenced value for each of the `source_models`, in order.
+
+        Raises:
+            ValueError: If the `model` is not found in the models.
+            ValueError: If the `field` is not found in the `model`.
+            ValueError: If the `conditions` are not met for one of the `source_models`.
+            ValueError: If no data is found for the `model` and `field`.
+        """
+        if isinstance(model, str):
+            model = self._model_str_to_model(model)
+
+        if model.__name__ not in self._models:
             self.register(model)
 
         if field and not self._has_field(model, field):
-            raise ValueError(f"Field {field} not found in model {model_name}")
-
-        if len(self._raw_data[model_name]) == 0 and len(self._instances[model_name]) == 0:
-            raise ValueError(f"No data found for model {model_name}.{field}")
-
-        obj: type[dataclass] | None = None
-        if len(self._raw_data[model_name]) > 0 or len(self._instances[model_name]) > 0:
-            combined_data = self._raw_data[model_name] + self._instances[model_name]
-            if field is not None and conditions is not None:
-                for instance in combined_data:
-                    if all(
-                        [
-                            cond.comparison(
-                                getattr(source_model, cond.field, None),
-                                (
-                                    getattr(instance, cond.value.field)
-                                    if isinstance(cond.value, ValueOf)
-                                    else cond.value
-                                ),
-                            )
-                            for cond in conditions
-                        ]
-                    ):
-                        obj = instance
-                        break
-            elif field is not None:
-                obj = random.choice(combined_data)
-        else:
-            obj = random.choice(self._instances[model_name])
+            raise ValueError(f"Field {field} not found in model {model.__name__}")
+
+        return self._reference_batch(source_models, model, field, conditions, random_match)
+
+    def _reference_batch(
+        self,
+        source_models: list[dataclass],
+        model: type[dataclass],
+        field: Optional[Any] = None,
+        conditions: Optional[list[SchemaCondition]] = None,
+        random_match: bool = False,
+    ) -> list[Any]:
+        """
+        `reference_batch` without any checks on its arguments, for callers that have already validated them.
 
-        return getattr(obj, field)
+        Raises:
+            ValueError: If the `conditions` are not met for one of the `source_models`.
+            ValueError: If no data is found for the `model` and `field`.
+        """
+        model_name: str = model.__name__
+        with self._table_locks[model_name]:
+            raw_data, instances = self._raw_data[model_name], self._instances.get(model_name, [])
+            if len(raw_data) == 0 and len(instances) == 0:
+                raise ValueError(f"No data found for model {model_name}.{field}")
+
+            if conditions is None:
+                return [self._choose_value(raw_data, instances, field) for _ in source_models]
+
+            plan = JoinPlan(conditions)
+            rng = self._fake.random if random_match else None
+            index = self._indexes[model_name].get(plan.index_fields)
+            matches: Optional[list[Optional[dataclass]]] = None
+            if index is not None and len(index) == len(raw_data):
+                try:
+                    matches = plan.resolve(source_models, instances, index, rng)
+                except TypeError:
+                    # The values of the block can't be compared with the indexed values.
+                    matches = None
+            if matches is None:
+                matches = plan.resolve(source_models, ChainedRows(raw_data.read(), instances), rng=rng)
+            if any(match is None for match in matches):
+                raise ValueError(f"No row of model {model_name} meets the conditions for {model_name}.{field}")
+            return [getattr(match, field) for match in matches]
 
     def register(self, model: dataclass) -> None:
         """
@@ -474,8 +1819,16 @@ class FakeSchemaGenerator:
         Returns:
             None
         """
-        if model.__name__ not in self._models:
-            self._annotations[model.__name__] = extract_annotations(model)
-            self._models[model.__name__] = model
-            self._interfaces[model.__name__] = dataclass_to_interface(model)
-            self._raw_data[model.__name__] = []
+        with self._lock:
+            if model.__name__ not in self._models:
+                annotations, row_type = analyse_model(model)
+                self._annotations[model.__name__] = annotations
+                self._fake_types[model.__name__] = {
+                    name: next(filter(lambda x: isinstance(x, FakeType), annotation["metadata"]), None)
+                    for name, annotation in annotations.items()
+                }
+                self._models[model.__name__] = model
+                self._row_types[model.__name__] = row_type
+                self._raw_data[model.__name__] = self._storage.table(model)
+                self._indexes[model.__name__] = {}
+                self._table_locks[model.__name__] = self._new_lock()
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class FieldExplanation:
+    """
+    How a field will be generated and roughly what it will cost, see `FakeSchemaGenerator.explain`.
+
+    Attributes:
+        model (str): The name of the model the field belongs to.
+        field (str): The name of the field.
+        provider (str): The Faker function the field is generated with, `"derived"` for derived columns.
+        wave (Optional[int]): The wave of the field: fields only depend on fields of earlier waves. `None` for derived
+            columns, which are computed after generation.
+        strategy (str): How the values are generated:
+
+            * `"scalar"`: The function is called once per row.
+            * `"batch"`: A batch function fills in a block of rows with one call.
+            * `"index lookup"`: Each row of a block looks up the rows it references in a `SortedIndex`.
+            * `"scan"`: Every block reads every row of the referenced model.
+            * `"derived"`: The column is computed for the whole table at once after generation.
+        complexity (str): How the cost of a row grows with the number of rows `n` of the referenced model, e.g.
+            `"O(1)"`, `"O(log n)"` or `"O(n)"`. `"unknown"` for custom providers.
+        cost (Optional[float]): The estimated number of rows read or values generated per row, averaged over the run.
+            `None` if unknown.
+        detail (str): What the field reads, e.g. the referenced model and conditions.
+    """
+
+    model: str
+    field: str
+    provider: str
+    wave: Optional[int]
+    strategy: str
+    complexity: str
+    cost: Optional[float]
+    detail: str = ""
+
+    @property
+    def quadratic(self) -> bool:
+        """
+        Whether the cost of a row grows linearly with the referenced table, so the run as a whole is quadratic.
+        """
+        return self.complexity.startswith("O(n")
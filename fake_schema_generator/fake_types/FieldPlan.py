@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+
+@dataclass
+class FieldPlan:
+    """
+    How a field is generated, compiled once by `FakeSchemaGenerator` when the schema is built.
+
+    Attributes:
+        model (str): The name of the model the field belongs to.
+        field (str): The name of the field.
+        function (Callable): The function that generates a value for the field.
+        kwargs (dict[str, Any]): The keyword arguments to call `function` with.
+        referring (bool): Whether `function` also takes the row being generated as `source_model`.
+        batch_function (Optional[Callable]): A function that takes a block of rows being generated as `source_models`
+            and the same keyword arguments as `function`, and returns a value for each row. `None` if `function` has
+            to be called once per row.
+    """
+
+    model: str
+    field: str
+    function: Callable
+    kwargs: dict[str, Any]
+    referring: bool
+    batch_function: Optional[Callable] = None
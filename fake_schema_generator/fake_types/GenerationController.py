@@ -0,0 +1,237 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from threading import Event
+from time import perf_counter
+from typing import Callable
+from typing import Optional
+
+from fake_schema_generator.fake_types.AutoTuner import AutoTuner
+from fake_schema_generator.fake_types.GenerationProgress import GenerationProgress
+from fake_schema_generator.fake_types.ThreadLocalFaker import ThreadLocalFaker
+from fake_schema_generator.functions import current_memory_usage
+
+
+class GenerationController:
+    """
+    Runs a `FakeSchemaGenerator` in batches until a target number of rows, a time budget or a memory budget is reached,
+    or until it's cancelled. Budgets and cancellation are checked between batches, so a batch is never left half
+    generated, and progress is reported to a callback at most once per `interval`.
+
+    Attributes:
+        rows (Optional[int | dict[str, int]]): The number of rows to generate for every model, or for each model by
+            name. Models missing from the dictionary are generated until every model in it is done.
+        time_budget (Optional[float]): The number of seconds after which to stop.
+        memory_budget (Optional[int]): The number of bytes of process memory after which to stop.
+        callback (Optional[Callable[[GenerationProgress], None]]): Called with the progress of the run.
+        interval (float): The minimum number of seconds between calls to `callback`.
+        batch_size (int): The number of rows to generate for each model between checks, see
+            `FakeSchemaGenerator.generate_from_dag`.
+        workers (int): The number of threads to generate the rows of a thread-safe `FakeSchemaGenerator` in. Each
+            thread generates a batch between checks.
+        tuner (Optional[AutoTuner]): Picks the batch size of each model and the number of threads, up to `workers`,
+            instead of `batch_size` and `workers`. Each model is then generated in batches of its own between checks,
+            in the order of their references, and the tuner's decisions are recorded in `GenerationProgress.tuning`.
+    """
+
+    def __init__(
+        self,
+        rows: Optional[int | dict[str, int]] = None,
+        time_budget: Optional[float] = None,
+        memory_budget: Optional[int] = None,
+        callback: Optional[Callable[[GenerationProgress], None]] = None,
+        interval: float = 1.0,
+        batch_size: int = 100,
+        workers: int = 1,
+        tuner: Optional[AutoTuner] = None,
+    ):
+        if rows is None and time_budget is None and memory_budget is None:
+            raise ValueError("At least one of rows, time_budget or memory_budget is required")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.rows = rows
+        self.time_budget = time_budget
+        self.memory_budget = memory_budget
+        self.callback = callback
+        self.interval = interval
+        self.batch_size = batch_size
+        self.workers = workers
+        self.tuner = tuner
+        self._cancelled = Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Whether `cancel` has been called.
+        """
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """
+        Stop the run after the batch being generated. Safe to call from the callback or from another thread.
+        """
+        self._cancelled.set()
+
+    def _targets(self, models: list[str]) -> dict[str, Optional[int]]:
+        """
+        Resolve `rows` to a target for every model in the schema.
+
+        Args:
+            models (list[str]): The names of the models in the schema.
+
+        Returns:
+            dict[str, Optional[int]]: The number of rows to generate for each model, `None` if unbounded.
+        """
+        if self.rows is None:
+            return {model: None for model in models}
+        if isinstance(self.rows, int):
+            return {model: self.rows for model in models}
+
+        unknown = set(self.rows) - set(models)
+        if len(unknown) > 0:
+            raise ValueError(f"Models {', '.join(sorted(unknown))} not found in the schema")
+        default = max(self.rows.values(), default=0)
+        return {model: self.rows.get(model, default) for model in models}
+
+    def _stop_reason(self, progress: GenerationProgress) -> Optional[str]:
+        """
+        Check whether the run should stop.
+
+        Args:
+            progress (GenerationProgress): The progress of the run so far.
+
+        Returns:
+            Optional[str]: Why the run should stop, or `None` if it should keep going.
+        """
+        if self.cancelled:
+            return "cancelled"
+        if all(target is not None and progress.rows[m] >= target for m, target in progress.targets.items()):
+            return "completed"
+        if self.time_budget is not None and progress.elapsed >= self.time_budget:
+            return "time_budget"
+        if self.memory_budget is not None and progress.memory is not None and progress.memory >= self.memory_budget:
+            return "memory_budget"
+        return None
+
+    def _update(self, progress: GenerationProgress, start: float) -> None:
+        """
+        Refresh the timings, rates, estimate and memory of `progress`.
+
+        Args:
+            progress (GenerationProgress): The progress to refresh.
+            start (float): The `perf_counter` value when the run started.
+
+        Returns:
+            None
+        """
+        progress.elapsed = perf_counter() - start
+        progress.memory = current_memory_usage() if self.memory_budget is not None else None
+        total = sum(progress.rows.values())
+        progress.rows_per_second = total / progress.elapsed if progress.elapsed > 0 else 0.0
+
+        estimates: list[float] = []
+        if self.time_budget is not None:
+            estimates.append(max(self.time_budget - progress.elapsed, 0.0))
+        if all(target is not None for target in progress.targets.values()) and total > 0:
+            remaining = sum(max(t - progress.rows[m], 0) for m, t in progress.targets.items())
+            estimates.append(remaining / progress.rows_per_second)
+        progress.eta = min(estimates) if estimates else None
+
+        return None
+
+    @staticmethod
+    def _generate(
+        schema_generator, executor: ThreadPoolExecutor, models: set[str], rows: int, batch_size: int, workers: int
+    ) -> None:
+        """
+        Generate `rows` rows of each of `models` in the calling thread with one worker, or in batches of `batch_size`
+        rows spread over the threads of `executor` with more.
+        """
+        if workers == 1:
+            schema_generator.generate_from_dag(models, rows)
+            return None
+
+        batches = [min(batch_size, rows - s) for s in range(0, rows, batch_size)]
+        for result in [executor.submit(schema_generator.generate_from_dag, models, b) for b in batches]:
+            result.result()
+
+        return None
+
+    def _generate_tuned(
+        self, schema_generator, executor: ThreadPoolExecutor, models: list[str], progress: GenerationProgress
+    ) -> None:
+        """
+        Generate a batch of each of `models` per worker with the batch sizes of the tuner, measure how long each took,
+        and let the tuner revise its decisions.
+        """
+        tuner = self.tuner
+        for model in models:
+            batch_size = tuner.batch_size(model)
+            rows = batch_size * tuner.workers
+            if progress.targets[model] is not None:
+                rows = min(rows, progress.targets[model] - progress.rows[model])
+            started = perf_counter()
+            self._generate(schema_generator, executor, {model}, rows, batch_size, tuner.workers)
+            tuner.observe(model, min(rows, batch_size), perf_counter() - started)
+            progress.rows[model] += rows
+
+        tuner.revise(sum(progress.rows.values()))
+        progress.tuning = list(tuner.decisions)
+        progress.batch_sizes = dict(tuner.batch_sizes)
+
+        return None
+
+    def run(self, schema_generator) -> GenerationProgress:
+        """
+        Generate rows with `schema_generator` until a target or budget is reached or the run is cancelled, then
+        compute the derived columns.
+
+        Args:
+            schema_generator (FakeSchemaGenerator): The generator to run, with its models registered.
+
+        Returns:
+            GenerationProgress: The final progress of the run.
+
+        Raises:
+            ValueError: If there's more than one worker and `schema_generator` isn't thread-safe.
+        """
+        if self.workers > 1 and not isinstance(schema_generator._fake, ThreadLocalFaker):
+            raise ValueError("More than one worker needs a thread-safe FakeSchemaGenerator")
+        if len(schema_generator._model_dependencies) == 0:
+            schema_generator._build_model_dependencies()
+
+        targets = self._targets(list(schema_generator._model_dependencies))
+        progress = GenerationProgress(rows={model: 0 for model in targets}, targets=targets)
+        start = perf_counter()
+        last_report = start
+
+        if self.tuner is not None:
+            self.tuner.start(schema_generator, self.workers, self.memory_budget)
+        order = schema_generator._model_order()
+        self._update(progress, start)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while (stop_reason := self._stop_reason(progress)) is None:
+                active = {m for m, t in targets.items() if t is None or progress.rows[m] < t}
+                if self.tuner is None:
+                    remaining = [targets[m] - progress.rows[m] for m in active if targets[m] is not None]
+                    rows = min([self.batch_size * self.workers, *remaining])
+                    self._generate(schema_generator, executor, active, rows, self.batch_size, self.workers)
+                    for model in active:
+                        progress.rows[model] += rows
+                else:
+                    self._generate_tuned(schema_generator, executor, [m for m in order if m in active], progress)
+
+                self._update(progress, start)
+                if self.callback is not None and perf_counter() - last_report >= self.interval:
+                    last_report = perf_counter()
+                    self.callback(deepcopy(progress))
+
+        schema_generator.derive()
+        progress.finished = True
+        progress.stop_reason = stop_reason
+        if self.callback is not None:
+            self.callback(deepcopy(progress))
+
+        return progress
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+from fake_schema_generator.fake_types.TuningDecision import TuningDecision
+
+
+@dataclass
+class GenerationProgress:
+    """
+    A snapshot of a run of a `GenerationController`, passed to its callback and returned when the run stops.
+
+    Attributes:
+        rows (dict[str, int]): The number of rows generated so far for each model.
+        targets (dict[str, Optional[int]]): The number of rows to generate for each model, `None` if unbounded.
+        elapsed (float): The number of seconds since the run started.
+        rows_per_second (float): The number of rows generated per second across all models.
+        eta (Optional[float]): The estimated number of seconds until the run stops, `None` if unknown.
+        memory (Optional[int]): The memory used by the process in bytes, `None` if it can't be measured.
+        finished (bool): Whether the run has stopped.
+        stop_reason (Optional[str]): Why the run stopped: `"completed"`, `"time_budget"`, `"memory_budget"` or
+            `"cancelled"`. `None` while the run is going.
+        batch_sizes (dict[str, int]): The batch size of each model per worker picked by the `AutoTuner` of the run,
+            empty without one.
+        tuning (list[TuningDecision]): The decisions made by the `AutoTuner` of the run so far, empty without one.
+    """
+
+    rows: dict[str, int] = field(default_factory=dict)
+    targets: dict[str, Optional[int]] = field(default_factory=dict)
+    elapsed: float = 0.0
+    rows_per_second: float = 0.0
+    eta: Optional[float] = None
+    memory: Optional[int] = None
+    finished: bool = False
+    stop_reason: Optional[str] = None
+    batch_sizes: dict[str, int] = field(default_factory=dict)
+    tuning: list[TuningDecision] = field(default_factory=list)
+
+    @property
+    def completion(self) -> dict[str, Optional[float]]:
+        """
+        The fraction of each model's target that has been generated, `None` for models without a target.
+        """
+        completion: dict[str, Optional[float]] = {}
+        for model, target in self.targets.items():
+            if target is None:
+                completion[model] = None
+            elif target == 0:
+                completion[model] = 1.0
+            else:
+                completion[model] = min(self.rows.get(model, 0) / target, 1.0)
+        return completion
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Any
+
+from fake_schema_generator.fake_types.SortedIndex import SortedIndex
+
+
+class GeneratorSnapshot:
+    """
+    The frozen state of a `FakeSchemaGenerator`, taken by `FakeSchemaGenerator.snapshot`, that any number of
+    generators can be forked from with `fork`. A fork starts with the snapshot's rows, indexes, sequences and random
+    state without copying them, and copies a row or a partition of an index only when it changes it, so forking is
+    cheap whatever the size of the tables, and forks never change the snapshot or each other.
+
+    Attributes:
+        models (dict[str, type[dataclass]]): The registered models.
+        tables (dict[str, tuple[dataclass, ...]]): The rows of each model.
+        indexes (dict[str, dict[tuple, SortedIndex]]): The indexes of each model's rows, by the `JoinPlan.index_fields`
+            they index.
+        marks (dict[str, int]): The high water marks of the sequences, see `FakeSchemaGenerator.high_water_marks`.
+        random_state (tuple): The state of the generator's `random.Random`.
+        providers (list[Any]): The custom providers added to the generator.
+        built (bool): Whether the generator's schema had been built, so that forks build it straight away.
+    """
+
+    def __init__(
+        self,
+        generator_type: type,
+        models: dict[str, type[dataclass]],
+        tables: dict[str, tuple[dataclass, ...]],
+        indexes: dict[str, dict[tuple, SortedIndex]],
+        marks: dict[str, int],
+        random_state: tuple,
+        providers: list[Any],
+        built: bool,
+    ):
+        self._generator_type = generator_type
+        self.models = models
+        self.tables = tables
+        self.indexes = indexes
+        self.marks = marks
+        self.random_state = random_state
+        self.providers = providers
+        self.built = built
+
+    def __repr__(self):
+        rows = ", ".join(f"{model}={len(rows)}" for model, rows in self.tables.items())
+        return f"GeneratorSnapshot({rows})"
+
+    def fork(self):
+        """
+        Create a generator with the state of the snapshot. It generates the same rows that the generator the snapshot
+        was taken of would have generated next, and its tables are `CopyOnWriteTable`s in memory.
+
+        Returns:
+            FakeSchemaGenerator: The fork.
+        """
+        return self._generator_type._from_snapshot(self)
@@ -0,0 +1,312 @@
+import operator
+from bisect import bisect_left
+from bisect import bisect_right
+from random import Random
+from typing import Any
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+
+from fake_schema_generator.fake_types.SchemaCondition import SchemaCondition
+from fake_schema_generator.fake_types.SortedIndex import SortedIndex
+from fake_schema_generator.fake_types.ValueOf import ValueOf
+
+RANGE_COMPARISONS = (operator.lt, operator.le, operator.gt, operator.ge)
+
+
+class JoinPlan:
+    """
+    Finds, for each of a list of source rows, the first referenced row that satisfies a list of `SchemaCondition`s, the
+    same row that `FakeSchemaGenerator.reference` finds by scanning, but for all the source rows at once.
+
+    Conditions that compare against a literal value only depend on the source row, so they're checked once per source
+    row. The conditions that compare against a `ValueOf` decide the strategy:
+
+    * `"hash"`: Every condition is an `operator.eq`. The referenced rows are indexed by their values once, and each
+      source row is resolved with one lookup.
+    * `"sort_merge"`: One condition is an `operator.lt`, `operator.le`, `operator.gt` or `operator.ge` and the rest are
+      `operator.eq`. The referenced rows are partitioned by the equality values and each partition is sorted by the
+      range value, then merged with the source rows sorted the same way. The rows matching a range form a prefix or a
+      suffix of the sorted partition, so the first of them is looked up in a running minimum of row positions.
+    * `"nested_loop"`: Anything else. The referenced rows are partitioned by the equality values and each source row
+      scans its partition. Without equalities, the referenced rows are scanned once for all the source rows.
+
+    Values that can't be hashed or sorted fall back to scanning the referenced rows, in one pass for all the source
+    rows. The referenced rows are only ever iterated, never read by position, so they can be streamed from storage.
+
+    Every strategy can also be answered by a `SortedIndex` on the `index_fields` of the referenced model, maintained as
+    rows are generated, instead of indexing the referenced rows for every block (see `resolve`). The `"nested_loop"`
+    strategy then only checks the rows of the index with the equality values of a source row, so it needs at least one
+    equality.
+
+    Attributes:
+        strategy (str): `"hash"`, `"sort_merge"` or `"nested_loop"`.
+        filters (list[SchemaCondition]): The conditions that compare against a literal value.
+        equalities (list[SchemaCondition]): The `operator.eq` conditions that compare against a `ValueOf`.
+        range_condition (Optional[SchemaCondition]): The range condition merged by the `"sort_merge"` strategy.
+        residual (list[SchemaCondition]): The conditions checked row by row by the `"nested_loop"` strategy.
+    """
+
+    def __init__(self, conditions: list[SchemaCondition]):
+        self.conditions = conditions
+        self.filters = [c for c in conditions if not isinstance(c.value, ValueOf)]
+        joins = [c for c in conditions if isinstance(c.value, ValueOf)]
+        self.equalities = [c for c in joins if c.comparison is operator.eq]
+        others = [c for c in joins if c.comparison is not operator.eq]
+        self.range_condition: Optional[SchemaCondition] = None
+        self.residual: list[SchemaCondition] = []
+
+        if len(others) == 0:
+            self.strategy = "hash"
+        elif len(others) == 1 and others[0].comparison in RANGE_COMPARISONS:
+            self.strategy = "sort_merge"
+            self.range_condition = others[0]
+        else:
+            self.strategy = "nested_loop"
+            self.residual = others
+
+    def __repr__(self):
+        return f"JoinPlan(strategy={self.strategy}, conditions={self.conditions})"
+
+    @property
+    def index_fields(self) -> Optional[tuple[tuple[str, ...], Optional[str]]]:
+        """
+        The equality fields and range field of the referenced model that a `SortedIndex` answering this plan indexes,
+        or None if the plan has no equality for the `"nested_loop"` strategy to look up.
+        """
+        if self.strategy == "nested_loop":
+            return (tuple(c.value.field for c in self.equalities), None) if self.equalities else None
+        range_field = self.range_condition.value.field if self.range_condition is not None else None
+        return tuple(c.value.field for c in self.equalities), range_field
+
+    def _matches(self, source: Any, target: Any) -> bool:
+        return all(
+            c.comparison(
+                getattr(source, c.field, None),
+                getattr(target, c.value.field) if isinstance(c.value, ValueOf) else c.value,
+            )
+            for c in self.conditions
+        )
+
+    def _matches_residual(self, source: Any, target: Any) -> bool:
+        return all(c.comparison(getattr(source, c.field, None), getattr(target, c.value.field)) for c in self.residual)
+
+    def _passes_filters(self, source: Any) -> bool:
+        return all(c.comparison(getattr(source, c.field, None), c.value) for c in self.filters)
+
+    def _source_key(self, source: Any) -> tuple:
+        return tuple(getattr(source, c.field, None) for c in self.equalities)
+
+    def _target_key(self, target: Any) -> tuple:
+        return tuple(getattr(target, c.value.field) for c in self.equalities)
+
+    def execute(self, sources: Sequence[Any], targets: Sequence[Any]) -> list[Optional[Any]]:
+        """
+        Find the first row of `targets` that satisfies the conditions for each row of `sources`.
+
+        Args:
+            sources (Sequence[Any]): The rows whose field is being filled in.
+            targets (Sequence[Any]): The referenced rows, in the order they would be scanned.
+
+        Returns:
+            list[Optional[Any]]: The first matching row of `targets` for each row of `sources`, or `None` if no row
+            matches.
+        """
+        try:
+            if self.strategy == "hash":
+                return self._hash_join(sources, targets)
+            if self.strategy == "sort_merge":
+                return self._sort_merge_join(sources, targets)
+            return self._nested_loop_join(sources, targets)
+        except TypeError:
+            return self._scan(sources, targets)
+
+    def _scan(self, sources: Sequence[Any], targets: Iterable[Any]) -> list[Optional[Any]]:
+        # One pass over the targets, stopping once every source has a match.
+        matches: list[Optional[Any]] = [None] * len(sources)
+        pending = list(range(len(sources)))
+        for target in targets:
+            if len(pending) == 0:
+                break
+            unmatched = []
+            for i in pending:
+                if self._matches(sources[i], target):
+                    matches[i] = target
+                else:
+                    unmatched.append(i)
+            pending = unmatched
+        return matches
+
+    def _candidates(self, sources: Sequence[Any], targets: Iterable[Any]) -> list[list[Any]]:
+        # Every matching target of every source, in one pass over the targets.
+        candidates: list[list[Any]] = [[] for _ in sources]
+        for target in targets:
+            for source, found in zip(sources, candidates):
+                if self._matches(source, target):
+                    found.append(target)
+        return candidates
+
+    def resolve(
+        self,
+        sources: Sequence[Any],
+        targets: Sequence[Any],
+        index: Optional[SortedIndex] = None,
+        rng: Optional[Random] = None,
+    ) -> list[Optional[Any]]:
+        """
+        Find the first row that satisfies the conditions for each row of `sources`, or with `rng`, a random row among
+        all the rows that satisfy them.
+
+        Args:
+            sources (Sequence[Any]): The rows whose field is being filled in.
+            targets (Sequence[Any]): The referenced rows that aren't in `index`, which come after the rows in `index`
+                in scan order.
+            index (Optional[SortedIndex], optional): An index on the `index_fields` of the referenced rows that come
+                before `targets`. Defaults to None.
+            rng (Optional[Random], optional): The random number generator to pick a random matching row with. Defaults
+                to None, to pick the first matching row.
+
+        Returns:
+            list[Optional[Any]]: The matching row for each row of `sources`, or `None` if no row matches.
+
+        Raises:
+            TypeError: If the values of `sources` can't be compared with the values in `index`.
+        """
+        if index is None and rng is None:
+            return self.execute(sources, targets)
+        if self.strategy == "nested_loop":
+            return self._resolve_nested_loop(sources, targets, index, rng)
+        if index is None:
+            index = SortedIndex(*self.index_fields)
+            index.extend(targets)
+            targets = []
+
+        if rng is None:
+            fallbacks = self.execute(sources, targets)
+        comparison = self.range_condition.comparison if self.range_condition is not None else None
+        matches = []
+        for i, source in enumerate(sources):
+            if not self._passes_filters(source):
+                matches.append(None)
+                continue
+
+            key = self._source_key(source)
+            value = getattr(source, self.range_condition.field, None) if comparison is not None else None
+            if rng is None:
+                match = index.first(key, comparison, value)
+                matches.append(fallbacks[i] if match is None else match)
+                continue
+
+            count = index.count(key, comparison, value)
+            candidates = [target for target in targets if self._matches(source, target)]
+            if count + len(candidates) == 0:
+                matches.append(None)
+                continue
+            n = rng.randrange(count + len(candidates))
+            matches.append(index.nth(key, comparison, value, n) if n < count else candidates[n - count])
+
+        return matches
+
+    def _resolve_nested_loop(
+        self, sources: Sequence[Any], targets: Sequence[Any], index: Optional[SortedIndex], rng: Optional[Random]
+    ) -> list[Optional[Any]]:
+        if index is None:
+            return [found[rng.randrange(len(found))] if found else None for found in self._candidates(sources, targets)]
+
+        # The rows of the index with the equality values of a source row, looked up once per key.
+        partitions: dict[tuple, list[Any]] = {}
+        matches: list[Optional[Any]] = []
+        for source in sources:
+            if not self._passes_filters(source):
+                matches.append(None)
+                continue
+
+            key = self._source_key(source)
+            if key not in partitions:
+                partitions[key] = index.rows(key)
+            found = [target for target in partitions[key] if self._matches_residual(source, target)]
+            if rng is None and found:
+                matches.append(found[0])
+                continue
+
+            found += [target for target in targets if self._matches(source, target)]
+            matches.append((found[0] if rng is None else found[rng.randrange(len(found))]) if found else None)
+
+        return matches
+
+    def _hash_join(self, sources: Sequence[Any], targets: Sequence[Any]) -> list[Optional[Any]]:
+        index: dict[tuple, Any] = {}
+        for target in targets:
+            index.setdefault(self._target_key(target), target)
+
+        return [index.get(self._source_key(s)) if self._passes_filters(s) else None for s in sources]
+
+    def _partition(self, targets: Iterable[Any]) -> dict[tuple, list[tuple[int, Any]]]:
+        # The position of each target is kept with it, so the targets are read once and never by position.
+        partitions: dict[tuple, list[tuple[int, Any]]] = {}
+        for position, target in enumerate(targets):
+            partitions.setdefault(self._target_key(target), []).append((position, target))
+        return partitions
+
+    def _nested_loop_join(self, sources: Sequence[Any], targets: Sequence[Any]) -> list[Optional[Any]]:
+        if len(self.equalities) == 0:
+            return self._scan(sources, targets)
+        partitions = self._partition(targets)
+        matches: list[Optional[Any]] = []
+        for source in sources:
+            match = None
+            if self._passes_filters(source):
+                for _, target in partitions.get(self._source_key(source), []):
+                    if self._matches_residual(source, target):
+                        match = target
+                        break
+            matches.append(match)
+        return matches
+
+    def _sort_merge_join(self, sources: Sequence[Any], targets: Sequence[Any]) -> list[Optional[Any]]:
+        condition = self.range_condition
+        comparison = condition.comparison
+        # `source >= target` and `source > target` match a prefix of the targets sorted by value, `source <= target`
+        # and `source < target` match a suffix. Equal values are included by `ge` and `le`.
+        prefix = comparison in (operator.ge, operator.gt)
+        inclusive = comparison in (operator.ge, operator.le)
+
+        grouped_sources: dict[tuple, list[int]] = {}
+        matches: list[Optional[Any]] = [None] * len(sources)
+        for i, source in enumerate(sources):
+            if self._passes_filters(source):
+                grouped_sources.setdefault(self._source_key(source), []).append(i)
+
+        partitions = self._partition(targets)
+        for key, source_indices in grouped_sources.items():
+            partition = partitions.get(key)
+            if not partition:
+                continue
+
+            partition = sorted(partition, key=lambda pair: getattr(pair[1], condition.value.field))
+            values = [getattr(target, condition.value.field) for _, target in partition]
+            rows = dict(partition)
+            # The smallest position, i.e. the first row in scan order, among the matching prefix or suffix.
+            first = [position for position, _ in partition]
+            order = range(1, len(first)) if prefix else range(len(first) - 2, -1, -1)
+            for j in order:
+                neighbour = j - 1 if prefix else j + 1
+                first[j] = min(first[j], first[neighbour])
+
+            source_indices.sort(key=lambda i: getattr(sources[i], condition.field, None))
+            # Merge: walk the sorted sources, advancing the boundary of the matching targets as the values grow.
+            boundary = 0
+            for i in source_indices:
+                value = getattr(sources[i], condition.field, None)
+                if inclusive == prefix:
+                    # Count the targets with a value <= `value`.
+                    boundary = bisect_right(values, value, lo=boundary)
+                else:
+                    # Count the targets with a value < `value`.
+                    boundary = bisect_left(values, value, lo=boundary)
+                if prefix and boundary > 0:
+                    matches[i] = rows[first[boundary - 1]]
+                elif not prefix and boundary < len(values):
+                    matches[i] = rows[first[boundary]]
+
+        return matches
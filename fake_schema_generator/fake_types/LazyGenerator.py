@@ -0,0 +1,97 @@
+from threading import Lock
+from typing import Any
+
+from faker import Factory
+from faker import Generator
+from faker.config import DEFAULT_LOCALE
+from faker.config import PROVIDERS
+
+_provider_index: dict[str, dict[str, str]] = {}
+_provider_index_lock = Lock()
+
+
+def _index_providers(locale: str) -> dict[str, str]:
+    """
+    Map every formatter name to the built-in Faker provider that supplies it for a locale. The index is built once per
+    locale per process. Later providers overwrite earlier ones, mirroring the order in which `Faker()` adds them.
+
+    Args:
+        locale (str): The locale to index the providers for.
+
+    Returns:
+        dict[str, str]: A dictionary mapping formatter names to provider module paths.
+    """
+    with _provider_index_lock:
+        if locale not in _provider_index:
+            index: dict[str, str] = {}
+            for provider_path in PROVIDERS:
+                if provider_path == "faker.providers":
+                    continue
+                provider_cls, _, _ = Factory._find_provider_class(provider_path, locale)
+                for name in dir(provider_cls):
+                    if not name.startswith("_") and callable(getattr(provider_cls, name)):
+                        index[name] = provider_path
+            _provider_index[locale] = index
+        return _provider_index[locale]
+
+
+class LazyGenerator(Generator):
+    """
+    A Faker `Generator` that loads a built-in provider the first time one of its formatters is requested instead of
+    loading every provider up front the way `Faker()` does. Formatters resolve to the same provider they would in an
+    eagerly loaded `Faker()`, and providers added explicitly with `add_provider` are never overridden by lazy loads.
+
+    Attributes:
+        loaded_providers (set[str]): The module paths of the built-in providers that have been loaded so far.
+    """
+
+    def __init__(self, locale: str = DEFAULT_LOCALE, use_weighting: bool = True):
+        super().__init__(locale=locale, use_weighting=use_weighting)
+        self._lazy_locale = locale
+        self._lazy_use_weighting = use_weighting
+        self.loaded_providers: set[str] = set()
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Only called when `name` isn't already a formatter, in which case the provider supplying it is loaded.
+
+        Raises:
+            AttributeError: If no built-in provider supplies `name`.
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        provider_path = _index_providers(self._lazy_locale).get(name)
+        if provider_path is None or provider_path in self.loaded_providers:
+            raise AttributeError(f"Unknown formatter {name!r} with locale {self._lazy_locale!r}")
+
+        self.load_provider(provider_path)
+        return getattr(self, name)
+
+    def load_provider(self, provider_path: str) -> None:
+        """
+        Load a built-in provider, registering only the formatters that `Faker()` would have resolved to it.
+
+        Args:
+            provider_path (str): The module path of the provider, e.g. `"faker.providers.person"`.
+
+        Returns:
+            None
+        """
+        if provider_path in self.loaded_providers:
+            return None
+
+        provider_cls, lang_found, _ = Factory._find_provider_class(provider_path, self._lazy_locale)
+        provider = provider_cls(self)
+        provider.__use_weighting__ = self._lazy_use_weighting
+        provider.__provider__ = provider_path
+        provider.__lang__ = lang_found
+        self.providers.insert(0, provider)
+        self.loaded_providers.add(provider_path)
+
+        index = _index_providers(self._lazy_locale)
+        for method_name in dir(provider):
+            if index.get(method_name) == provider_path and method_name not in self.__dict__:
+                self.set_formatter(method_name, getattr(provider, method_name))
+
+        return None
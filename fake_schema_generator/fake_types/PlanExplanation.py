@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+from fake_schema_generator.fake_types.FieldExplanation import FieldExplanation
+
+HINTS = {
+    "calculate": 'compute it after generation with FakeType("derived", ...), or generate in larger blocks',
+    "reference": "reference it with equality conditions and at most one range condition, which an index can answer",
+}
+
+
+@dataclass
+class PlanExplanation:
+    """
+    The compiled generation plan of a schema with cost estimates, returned by `FakeSchemaGenerator.explain`. Printing it
+    shows a table of the fields in generation order.
+
+    Attributes:
+        rows (int): The number of rows per model the costs are estimated for.
+        batch_size (int): The number of rows per model in each block the costs are estimated for.
+        fields (list[FieldExplanation]): The fields generated row by row, in the order they're generated in.
+        derived (list[FieldExplanation]): The derived columns, in the order they're computed in.
+    """
+
+    rows: int
+    batch_size: int
+    fields: list[FieldExplanation] = field(default_factory=list)
+    derived: list[FieldExplanation] = field(default_factory=list)
+
+    @property
+    def waves(self) -> list[list[FieldExplanation]]:
+        """
+        The fields grouped by wave. A field only depends on fields of earlier waves.
+        """
+        waves: list[list[FieldExplanation]] = []
+        for f in self.fields:
+            while len(waves) <= f.wave:
+                waves.append([])
+            waves[f.wave].append(f)
+        return waves
+
+    @property
+    def cost_per_row(self) -> dict[str, Optional[float]]:
+        """
+        The estimated cost of a row of each model, the sum of the costs of its fields. `None` if a field's cost is
+        unknown.
+        """
+        costs: dict[str, Optional[float]] = {}
+        for f in self.fields + self.derived:
+            cost = costs.setdefault(f.model, 0.0)
+            costs[f.model] = None if cost is None or f.cost is None else cost + f.cost
+        return costs
+
+    @property
+    def warnings(self) -> list[str]:
+        """
+        A description of every field whose cost grows with the size of the table it reads, making the run quadratic.
+        """
+        return [
+            f"{f.model}.{f.field}: {f.strategy} costs {f.complexity} per row, O(n²) over the run; "
+            f"{HINTS.get(f.provider, 'give its provider a batch function')}"
+            for f in self.fields
+            if f.quadratic
+        ]
+
+    def __str__(self) -> str:
+        rows = [("#", "wave", "field", "provider", "strategy", "per row", "cost", "reads")]
+        for position, f in enumerate(self.fields + self.derived, 1):
+            rows.append(
+                (
+                    str(position),
+                    "after" if f.wave is None else str(f.wave),
+                    f"{f.model}.{f.field}",
+                    f.provider,
+                    f.strategy,
+                    f.complexity,
+                    "?" if f.cost is None else f"{f.cost:,.1f}",
+                    f.detail,
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        right_aligned = {0, 1, 6}
+        lines = [
+            f"Plan for {self.rows:,} rows of each model in blocks of {self.batch_size:,}, "
+            f"{len(self.waves)} waves of fields",
+            "",
+        ]
+        for row in rows:
+            cells = [c.rjust(w) if i in right_aligned else c.ljust(w) for i, (c, w) in enumerate(zip(row, widths))]
+            lines.append("  ".join(cells).rstrip())
+
+        lines += ["", "Estimated cost per row:"]
+        for model, cost in self.cost_per_row.items():
+            lines.append(f"  {model}: {'?' if cost is None else f'{cost:,.1f}'}")
+        if self.warnings:
+            lines += ["", "Warnings:"]
+            lines += [f"  {warning}" for warning in self.warnings]
+
+        return "\n".join(lines)
@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from dataclasses import replace
+from queue import Empty
+from queue import Full
+from queue import Queue
+from threading import Event
+from threading import Thread
+from time import perf_counter
+from time import sleep
+from typing import Iterator
+from typing import Optional
+
+from fake_schema_generator.fake_types.EmissionStats import EmissionStats
+
+
+class RateEmitter:
+    """
+    Emits a steady stream of rows generated by a `FakeSchemaGenerator` at a target rate, e.g. to drive a load test.
+    Rows are generated by `generate_from_dag` in a background thread, a block at a time, into a buffer of `buffer`
+    blocks, so pacing doesn't wait on generation. The rows of a block are emitted model by model, referenced models
+    first, so a row is only emitted after the rows it references, e.g. an order before its payments.
+
+    Emission is paced by a token bucket: a token is added `rate` times a second, up to `burst` tokens, and every row
+    emitted takes one. After a pause, e.g. because the consumer was slow, up to `burst` rows go through at once to catch
+    up. A `burst` of 1 spaces rows evenly, but a row that's late because a sleep overshot or the generating thread held
+    the GIL is never made up for, so the default `burst` is the number of rows due in 10 ms.
+
+    Derived columns are computed after generation, so they're left empty in emitted rows. The generator mustn't be used
+    elsewhere while rows are being emitted.
+
+    Every emitted row is also stored in the generator's tables, so that later rows can reference it, and memory grows
+    with every row emitted: at 5,000 rows a second, 300,000 rows a minute. For long runs, give the generator a
+    `SpillStorage`, which moves the oldest rows to disk.
+
+    Args:
+        schema_generator (FakeSchemaGenerator): The generator, with its models registered.
+        rate (float): The number of rows to emit per second.
+        burst (Optional[int], optional): The number of rows that can be emitted at once. Defaults to None, for the
+            number of rows due in 10 ms.
+        models (Optional[set[str]], optional): The names of the models to generate and emit rows for, all models if
+            `None`. Rows of the other models can still be referenced. Defaults to None.
+        batch_size (int, optional): The number of rows per model in each block. Defaults to 100.
+        buffer (int, optional): The number of blocks generated ahead of emission. Defaults to 16.
+    """
+
+    def __init__(
+        self,
+        schema_generator,
+        rate: float,
+        burst: Optional[int] = None,
+        models: Optional[set[str]] = None,
+        batch_size: int = 100,
+        buffer: int = 16,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is None:
+            burst = max(int(rate / 100), 1)
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if buffer < 1:
+            raise ValueError("buffer must be at least 1")
+
+        self.schema_generator = schema_generator
+        self.rate = rate
+        self.burst = burst
+        self.models = models
+        self.batch_size = batch_size
+        self.buffer = buffer
+        self._stats = EmissionStats(target_rate=rate)
+        self._start: Optional[float] = None
+        self._queue: Queue = Queue(maxsize=buffer)
+        self._stopped = Event()
+
+    @property
+    def stats(self) -> EmissionStats:
+        """
+        The statistics of the current or last run.
+        """
+        stats = replace(self._stats, buffered=self._queue.qsize())
+        if self._start is not None:
+            stats.elapsed = perf_counter() - self._start
+            stats.rows_per_second = stats.emitted / stats.elapsed if stats.elapsed > 0 else 0.0
+        return stats
+
+    def stop(self) -> None:
+        """
+        Stop emitting. Safe to call from another thread.
+        """
+        self._stopped.set()
+
+    def _produce(self, order: list[str]) -> None:
+        """
+        Generate blocks of rows into the buffer until stopped. An exception is passed on through the buffer.
+        """
+        raw_data = self.schema_generator._raw_data
+        sizes = {model: len(raw_data[model]) if model in raw_data else 0 for model in order}
+        try:
+            while not self._stopped.is_set():
+                self.schema_generator.generate_from_dag(self.models, self.batch_size)
+                block: list[tuple[str, dataclass]] = []
+                for model in order:
+                    table = raw_data[model]
+                    block += [(model, row) for row in table[sizes[model] :]]
+                    sizes[model] = len(table)
+                self._put(block)
+        except Exception as e:
+            self._put(e)
+
+        return None
+
+    def _put(self, item) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return None
+            except Full:
+                continue
+
+        return None
+
+    def emit(self, rows: Optional[int] = None, duration: Optional[float] = None) -> Iterator[tuple[str, dataclass]]:
+        """
+        Generate and emit rows until `rows` rows have been emitted, `duration` seconds have passed or `stop` is called.
+        The buffer is filled before the first row is emitted.
+
+        Args:
+            rows (Optional[int], optional): The number of rows to emit. Defaults to None, for no limit.
+            duration (Optional[float], optional): The number of seconds to emit rows for. Defaults to None, for no
+                limit.
+
+        Yields:
+            tuple[str, dataclass]: The name of the model and the row.
+
+        Raises:
+            Exception: Whatever generating the rows raised.
+        """
+        with self.schema_generator._lock:
+            if len(self.schema_generator._model_dependencies) == 0:
+                self.schema_generator._build_model_dependencies()
+
+        self._stopped.clear()
+        self._queue = Queue(maxsize=self.buffer)
+        self._stats = EmissionStats(target_rate=self.rate)
+        self._start = None
+        order = [m for m in self.schema_generator._model_order() if self.models is None or m in self.models]
+        producer = Thread(target=self._produce, args=(order,), daemon=True)
+        producer.start()
+        try:
+            while not self._queue.full() and producer.is_alive():
+                sleep(0.001)
+
+            start = last = self._start = perf_counter()
+            tokens = float(self.burst)
+            stats = self._stats
+            block: list[tuple[str, dataclass]] = []
+            position = 0
+            while not self._stopped.is_set() and (rows is None or stats.emitted < rows):
+                if position == len(block):
+                    if duration is not None and perf_counter() - start >= duration:
+                        break
+                    # Waits a little at a time, so `stop` and `duration` end the wait.
+                    waiting = perf_counter()
+                    try:
+                        item = self._queue.get(timeout=0.05)
+                    except Empty:
+                        continue
+                    finally:
+                        stats.generation_wait += perf_counter() - waiting
+                    if isinstance(item, Exception):
+                        raise item
+                    block, position = item, 0
+                    continue
+
+                now = perf_counter()
+                if duration is not None and now - start >= duration:
+                    break
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                last = now
+                if tokens < 1:
+                    sleep((1 - tokens) / self.rate)
+                    continue
+
+                tokens -= 1
+                # The bucket starts full, so the first `burst` rows are due straight away.
+                due = max(stats.emitted - self.burst + 1, 0) / self.rate
+                stats.lag = max(now - start - due, 0.0)
+                stats.max_lag = max(stats.max_lag, stats.lag)
+                stats.emitted += 1
+                position += 1
+                yield block[position - 1]
+        finally:
+            self._stopped.set()
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except Empty:
+                    break
+            producer.join()
+
+        return None
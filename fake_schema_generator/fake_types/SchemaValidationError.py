@@ -0,0 +1,11 @@
+class SchemaValidationError(ValueError):
+    """
+    Raised when a schema fails validation, with every problem found in the schema rather than just the first.
+
+    Attributes:
+        errors (list[str]): A description of each problem found in the schema.
+    """
+
+    def __init__(self, errors: list[str]):
+        super().__init__("Invalid schema:\n" + "\n".join(f"  {error}" for error in errors))
+        self.errors = errors
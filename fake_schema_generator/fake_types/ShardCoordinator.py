@@ -0,0 +1,210 @@
+import json
+from pathlib import Path
+from random import Random
+from typing import Iterable
+
+from fake_schema_generator.fake_types.FakeSchemaGenerator import DERIVED
+from fake_schema_generator.fake_types.ShardManifest import ShardManifest
+from fake_schema_generator.fake_types.ShardResult import ShardResult
+from fake_schema_generator.fake_types.ValueOf import ValueOf
+
+
+class ShardCoordinator:
+    """
+    Splits the rows of a schema into shards that workers, on other machines or in other processes, generate without
+    talking to each other, then checks what they generated. Each shard is described by a `ShardManifest`:
+
+    * Its seed, drawn from `seed`, so a shard is generated the same way wherever and however often it runs.
+    * Its share of the rows of each model, the rows divided as evenly as they go.
+    * The range of each sequential number namespace it hands out, so primary keys are unique across shards. The ranges
+      of the shards follow on from each other and together cover the namespace from 1, the key space.
+    * The references resolved by key arithmetic: a reference without conditions to a sequential number that only one
+      field uses picks a number from the namespace's whole key space instead of a row of its own shard, so rows
+      reference the rows of every shard. References are only resolved this way if nothing reads the referencing rows
+      back by that field, i.e. no aggregate groups them or looks rows up by it and no conditions compare it, since
+      those are computed from the rows of the shard alone. All other references are resolved against the rows of the
+      shard, and so are still consistent once the shards are put together.
+
+    Workers run `FakeSchemaGenerator.generate_shard` with their manifest and report a `ShardResult`, and `merge` checks
+    the results: every shard is there once, has the rows of its manifest, and has handed out every key of its ranges.
+
+    Args:
+        schema_generator (FakeSchemaGenerator): A generator with the schema's models registered.
+        rows (int | dict[str, int]): The number of rows of every model across all shards, or of each model by name.
+            Models missing from the dictionary get as many rows as the model with the most.
+        shards (int): The number of shards.
+        seed (int, optional): The seed the seeds of the shards are drawn from. Defaults to 0.
+
+    Raises:
+        ValueError: If there are fewer than 1 shards, a model in `rows` isn't in the schema, or a model has fewer rows
+            than there are shards.
+    """
+
+    def __init__(self, schema_generator, rows: int | dict[str, int], shards: int, seed: int = 0):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        with schema_generator._lock:
+            if len(schema_generator._model_dependencies) == 0:
+                schema_generator._build_model_dependencies()
+
+        models = list(schema_generator._model_dependencies)
+        if isinstance(rows, int):
+            totals = {model: rows for model in models}
+        else:
+            unknown = set(rows) - set(models)
+            if len(unknown) > 0:
+                raise ValueError(f"Models {', '.join(sorted(unknown))} not found in the schema")
+            default = max(rows.values(), default=0)
+            totals = {model: rows.get(model, default) for model in models}
+        too_few = sorted(model for model, total in totals.items() if total < shards)
+        if too_few:
+            raise ValueError(f"Every shard needs a row of every model, but {', '.join(too_few)} have fewer rows")
+
+        self.schema_generator = schema_generator
+        self.rows = totals
+        self.shards = shards
+        self.seed = seed
+
+    def _namespaces(self) -> dict[str, list[tuple[str, str]]]:
+        """
+        Find the fields that hand out the numbers of each sequential number namespace.
+        """
+        namespaces: dict[str, list[tuple[str, str]]] = {}
+        for model_name, fake_types in self.schema_generator._fake_types.items():
+            for field_name, fake_type in fake_types.items():
+                if fake_type is not None and fake_type.type == "sequential_number":
+                    namespace = fake_type.kwargs.get("namespace", "default")
+                    namespaces.setdefault(namespace, []).append((model_name, field_name))
+        return namespaces
+
+    def _key_references(self, namespaces: dict[str, list[tuple[str, str]]]) -> dict[str, str]:
+        """
+        Find the references that can be resolved by key arithmetic, see the class description.
+        """
+        keys = {fields[0]: namespace for namespace, fields in namespaces.items() if len(fields) == 1}
+        # The fields that rows are looked up by, which must refer to the rows of the shard: the fields aggregates
+        # group rows by and the values they group by, and both sides of the conditions of references.
+        read_back: set[tuple[str, str]] = set()
+        for model_name, fake_types in self.schema_generator._fake_types.items():
+            for fake_type in fake_types.values():
+                if fake_type is None or "model" not in fake_type.kwargs:
+                    continue
+                kwargs = fake_type.kwargs
+                target = getattr(kwargs["model"], "__name__", kwargs["model"])
+                if fake_type.type in ("calculate", DERIVED):
+                    read_back.add((target, kwargs["field"]))
+                    if isinstance(kwargs.get("value"), ValueOf):
+                        read_back.add((model_name, kwargs["value"].field))
+                for condition in kwargs.get("conditions") or []:
+                    read_back.add((model_name, condition.field))
+                    if isinstance(condition.value, ValueOf):
+                        read_back.add((target, condition.value.field))
+
+        references: dict[str, str] = {}
+        for model_name, fake_types in self.schema_generator._fake_types.items():
+            for field_name, fake_type in fake_types.items():
+                if fake_type is None or fake_type.type != "reference" or fake_type.kwargs.get("conditions"):
+                    continue
+                target = getattr(fake_type.kwargs["model"], "__name__", fake_type.kwargs["model"])
+                key = (target, fake_type.kwargs.get("field"))
+                if key in keys and (model_name, field_name) not in read_back:
+                    references[f"{model_name}.{field_name}"] = keys[key]
+        return references
+
+    def manifests(self) -> list[ShardManifest]:
+        """
+        Split the rows into shards.
+
+        Returns:
+            list[ShardManifest]: The manifest of each shard, in order.
+        """
+        namespaces = self._namespaces()
+        key_references = self._key_references(namespaces)
+        rng = Random(self.seed)
+        manifests = [
+            ShardManifest(shard, self.shards, rng.getrandbits(63), key_references=dict(key_references))
+            for shard in range(self.shards)
+        ]
+        for model, total in self.rows.items():
+            for manifest in manifests:
+                manifest.rows[model] = total // self.shards + (1 if manifest.shard < total % self.shards else 0)
+
+        for namespace, fields in namespaces.items():
+            start = 1
+            for manifest in manifests:
+                stop = start + sum(manifest.rows[model] for model, _ in fields)
+                manifest.key_ranges[namespace] = (start, stop)
+                start = stop
+            for manifest in manifests:
+                manifest.key_space[namespace] = (1, start)
+
+        return manifests
+
+    def write(self, directory: str | Path) -> list[Path]:
+        """
+        Write the manifest of each shard to `<directory>/shard-<shard>.json`, to hand out to the workers.
+
+        Args:
+            directory (str | Path): The directory, created if it doesn't exist.
+
+        Returns:
+            list[Path]: The files, in the order of the shards.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for manifest in self.manifests():
+            path = directory / f"shard-{manifest.shard:04d}.json"
+            path.write_text(json.dumps(manifest.to_dict(), indent=2), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def merge(manifests: Iterable[ShardManifest], results: Iterable[ShardResult]) -> dict[str, int]:
+        """
+        Check the results of the workers against the manifests: every shard has exactly one result, with the rows of
+        each model of its manifest and every number of each of its key ranges, so that together the shards cover the
+        key space of every namespace and every reference resolved by key arithmetic finds its row.
+
+        Args:
+            manifests (Iterable[ShardManifest]): The manifests of the shards.
+            results (Iterable[ShardResult]): The results of the shards, in any order.
+
+        Returns:
+            dict[str, int]: The number of rows of each model across all shards.
+
+        Raises:
+            ValueError: If a result doesn't match its manifest, listing every mismatch.
+        """
+        manifests = {manifest.shard: manifest for manifest in manifests}
+        problems: list[str] = []
+        by_shard: dict[int, ShardResult] = {}
+        for result in results:
+            if result.shard not in manifests:
+                problems.append(f"shard {result.shard}: not in the manifests")
+            elif result.shard in by_shard:
+                problems.append(f"shard {result.shard}: more than one result")
+            else:
+                by_shard[result.shard] = result
+
+        totals: dict[str, int] = {}
+        for shard, manifest in sorted(manifests.items()):
+            result = by_shard.get(shard)
+            if result is None:
+                problems.append(f"shard {shard}: no result")
+                continue
+            for model, expected in manifest.rows.items():
+                count = result.rows.get(model, 0)
+                totals[model] = totals.get(model, 0) + count
+                if count != expected:
+                    problems.append(f"shard {shard}: {count} rows of {model} instead of {expected}")
+            for namespace, (start, stop) in manifest.key_ranges.items():
+                expected = (start, stop - 1, stop - start) if stop > start else None
+                found = result.keys.get(namespace)
+                if found is not None and tuple(found) != expected or found is None and expected is not None:
+                    problems.append(f"shard {shard}: keys {found} of {namespace} don't cover {start} to {stop - 1}")
+
+        if problems:
+            raise ValueError("Shards don't match their manifests:\n" + "\n".join(problems))
+        return totals
@@ -0,0 +1,83 @@
+import json
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class ShardManifest:
+    """
+    Everything a worker needs to generate one shard of a schema without talking to the other workers, made by
+    `ShardCoordinator.manifests` and generated with `FakeSchemaGenerator.generate_shard`.
+
+    Attributes:
+        shard (int): The index of the shard, from 0.
+        shards (int): The number of shards.
+        seed (int): The seed of the shard's generator.
+        rows (dict[str, int]): The number of rows of each model in the shard.
+        key_ranges (dict[str, tuple[int, int]]): The sequential numbers of each namespace handed out in the shard, from
+            the first up to but not including the second.
+        key_space (dict[str, tuple[int, int]]): The sequential numbers of each namespace across all shards.
+        key_references (dict[str, str]): The references, as `"Model.field"`, that pick a number from the `key_space`
+            of a namespace instead of a row of the shard, by the namespace.
+    """
+
+    shard: int
+    shards: int
+    seed: int
+    rows: dict[str, int] = field(default_factory=dict)
+    key_ranges: dict[str, tuple[int, int]] = field(default_factory=dict)
+    key_space: dict[str, tuple[int, int]] = field(default_factory=dict)
+    key_references: dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the manifest as a dictionary that can be written as JSON.
+
+        Returns:
+            dict[str, Any]: The fields of the manifest.
+        """
+        return {
+            "shard": self.shard,
+            "shards": self.shards,
+            "seed": self.seed,
+            "rows": self.rows,
+            "key_ranges": {namespace: list(keys) for namespace, keys in self.key_ranges.items()},
+            "key_space": {namespace: list(keys) for namespace, keys in self.key_space.items()},
+            "key_references": self.key_references,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ShardManifest":
+        """
+        Read a manifest from a dictionary returned by `to_dict`.
+
+        Args:
+            data (dict[str, Any]): The fields of the manifest.
+
+        Returns:
+            ShardManifest: The manifest.
+        """
+        return cls(
+            shard=data["shard"],
+            shards=data["shards"],
+            seed=data["seed"],
+            rows=dict(data["rows"]),
+            key_ranges={namespace: tuple(keys) for namespace, keys in data["key_ranges"].items()},
+            key_space={namespace: tuple(keys) for namespace, keys in data["key_space"].items()},
+            key_references=dict(data["key_references"]),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ShardManifest":
+        """
+        Read a manifest from a JSON file, such as one written by `ShardCoordinator.write`.
+
+        Args:
+            path (str | Path): The file.
+
+        Returns:
+            ShardManifest: The manifest.
+        """
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
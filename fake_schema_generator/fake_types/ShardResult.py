@@ -0,0 +1,66 @@
+import json
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class ShardResult:
+    """
+    What a worker generated for a shard, returned by `FakeSchemaGenerator.generate_shard` and checked against the
+    manifests by `ShardCoordinator.merge`.
+
+    Attributes:
+        shard (int): The index of the shard.
+        rows (dict[str, int]): The number of rows generated of each model.
+        keys (dict[str, tuple[int, int, int]]): The lowest and highest sequential number of each namespace of the
+            manifest found in the rows, and the number of distinct numbers found.
+    """
+
+    shard: int
+    rows: dict[str, int] = field(default_factory=dict)
+    keys: dict[str, tuple[int, int, int]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the result as a dictionary that can be written as JSON.
+
+        Returns:
+            dict[str, Any]: The fields of the result.
+        """
+        return {
+            "shard": self.shard,
+            "rows": self.rows,
+            "keys": {namespace: list(keys) for namespace, keys in self.keys.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ShardResult":
+        """
+        Read a result from a dictionary returned by `to_dict`.
+
+        Args:
+            data (dict[str, Any]): The fields of the result.
+
+        Returns:
+            ShardResult: The result.
+        """
+        return cls(
+            shard=data["shard"],
+            rows=dict(data["rows"]),
+            keys={namespace: tuple(keys) for namespace, keys in data["keys"].items()},
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ShardResult":
+        """
+        Read a result from a JSON file written from `to_dict`.
+
+        Args:
+            path (str | Path): The file.
+
+        Returns:
+            ShardResult: The result.
+        """
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
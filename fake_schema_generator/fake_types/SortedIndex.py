@@ -0,0 +1,290 @@
+import operator
+from bisect import bisect_left
+from bisect import bisect_right
+from random import Random
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+
+class _Partition:
+    """
+    The rows of a `SortedIndex` that share the same values for its equality fields.
+
+    Attributes:
+        keys (list[Any]): The range values of the rows, sorted.
+        rows (list[Any]): The rows, in the order of `keys`, and in insertion order for equal keys.
+        minima (list[Any]): The range values of the rows whose value is smaller than that of every row added before
+            them, in insertion order, so decreasing.
+        minima_rows (list[Any]): The rows of `minima`.
+        maxima (list[Any]): As `minima`, for the rows whose value is larger than that of every row added before them.
+        maxima_rows (list[Any]): The rows of `maxima`.
+    """
+
+    __slots__ = ("keys", "rows", "minima", "minima_rows", "maxima", "maxima_rows")
+
+    def __init__(self):
+        self.keys: list[Any] = []
+        self.rows: list[Any] = []
+        self.minima: list[Any] = []
+        self.minima_rows: list[Any] = []
+        self.maxima: list[Any] = []
+        self.maxima_rows: list[Any] = []
+
+    def copy(self) -> "_Partition":
+        partition = _Partition()
+        for name in self.__slots__:
+            setattr(partition, name, getattr(self, name).copy())
+        return partition
+
+
+class SortedIndex:
+    """
+    An index of the rows of a model by the values of some fields, compared for equality, and optionally of one more
+    field, compared with `operator.lt`, `operator.le`, `operator.gt` or `operator.ge`. The index is maintained as rows
+    are added, with a bisect per row.
+
+    The rows are partitioned by their equality values and each partition is kept sorted by the range value, so that the
+    rows matching a range are found with a bisect. The first row added that matches a range is found with a bisect as
+    well: it's always one of the rows whose value was a new minimum (or maximum) when it was added, and those are
+    recorded in insertion order as rows are added.
+
+    A `comparison` and `value` passed to a query select the rows for which `comparison(value, row_value)` is true, the
+    same way `SchemaCondition("field", comparison, ValueOf("range_field"))` compares a source row to a referenced row.
+
+    An index can be copied cheaply with `fork`: the copies share their partitions, and a partition is only copied when
+    a row is added to it.
+
+    Args:
+        fields (tuple[str, ...]): The fields compared for equality.
+        range_field (Optional[str], optional): The field compared with a range comparison. Defaults to None.
+    """
+
+    def __init__(self, fields: tuple[str, ...], range_field: Optional[str] = None):
+        self.fields = fields
+        self.range_field = range_field
+        self._partitions: dict[tuple, _Partition] = {}
+        self._length = 0
+        # The partitions that aren't shared with a fork, or None if no partition is shared.
+        self._owned: Optional[set[tuple]] = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self):
+        return f"SortedIndex(fields={self.fields}, range_field={self.range_field}, rows={self._length})"
+
+    def add(self, row: Any, item: Any = None) -> None:
+        """
+        Add a row to the index.
+
+        Args:
+            row (Any): The row to add.
+            item (Any, optional): What to keep in the index and return from queries for the row, e.g. its position in
+                a table that doesn't keep its rows in memory. Defaults to None, to keep the row itself.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the range value of the row can't be compared with those of the other rows in its partition.
+        """
+        key = tuple(getattr(row, f) for f in self.fields)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition()
+            if self._owned is not None:
+                self._owned.add(key)
+        elif self._owned is not None and key not in self._owned:
+            partition = self._partitions[key] = partition.copy()
+            self._owned.add(key)
+        item = row if item is None else item
+
+        if self.range_field is None:
+            partition.rows.append(item)
+            self._length += 1
+            return None
+
+        value = getattr(row, self.range_field)
+        i = bisect_right(partition.keys, value)
+        partition.keys.insert(i, value)
+        partition.rows.insert(i, item)
+        if len(partition.minima) == 0 or value < partition.minima[-1]:
+            partition.minima.append(value)
+            partition.minima_rows.append(item)
+        if len(partition.maxima) == 0 or value > partition.maxima[-1]:
+            partition.maxima.append(value)
+            partition.maxima_rows.append(item)
+        self._length += 1
+
+        return None
+
+    def fork(self) -> "SortedIndex":
+        """
+        Copy the index without copying its rows. The copy and this index share their partitions until a row is added to
+        one of them, which then copies the partition of the row, so rows can be added to either without changing the
+        other.
+
+        Returns:
+            SortedIndex: The copy.
+        """
+        index = SortedIndex(self.fields, self.range_field)
+        index._partitions = self._partitions.copy()
+        index._length = self._length
+        index._owned = set()
+        self._owned = set()
+
+        return index
+
+    def extend(self, rows: list[Any]) -> None:
+        """
+        Add rows to the index, in order.
+
+        Args:
+            rows (list[Any]): The rows to add.
+
+        Returns:
+            None
+        """
+        for row in rows:
+            self.add(row)
+
+        return None
+
+    def _bounds(self, partition: _Partition, comparison: Optional[Callable], value: Any) -> tuple[int, int]:
+        if comparison is None:
+            return 0, len(partition.rows)
+        if comparison is operator.ge:
+            return 0, bisect_right(partition.keys, value)
+        if comparison is operator.gt:
+            return 0, bisect_left(partition.keys, value)
+        if comparison is operator.le:
+            return bisect_left(partition.keys, value), len(partition.keys)
+        if comparison is operator.lt:
+            return bisect_right(partition.keys, value), len(partition.keys)
+        raise ValueError(f"Comparison {comparison} can't be answered by a SortedIndex")
+
+    def first(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> Optional[Any]:
+        """
+        Find the first row added with the equality values `key` whose range value matches `comparison` and `value`.
+
+        Args:
+            key (tuple): The values of the equality fields.
+            comparison (Optional[Callable], optional): The range comparison, or None to match every row. Defaults to
+                None.
+            value (Any, optional): The value compared to the range values of the rows. Defaults to None.
+
+        Returns:
+            Optional[Any]: The first matching row, or None if no row matches.
+        """
+        partition = self._partitions.get(key)
+        if partition is None or len(partition.rows) == 0:
+            return None
+        if self.range_field is None:
+            return partition.rows[0]
+        if comparison is None:
+            # The first row added is always the first minimum.
+            return partition.minima_rows[0]
+
+        if comparison in (operator.ge, operator.gt):
+            # The minima decrease, find the first that is <= (or <) `value`.
+            records, rows, strict = partition.minima, partition.minima_rows, comparison is operator.gt
+            lo, hi = 0, len(records)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if records[mid] < value if strict else records[mid] <= value:
+                    hi = mid
+                else:
+                    lo = mid + 1
+        elif comparison in (operator.le, operator.lt):
+            # The maxima increase, find the first that is >= (or >) `value`.
+            records, rows = partition.maxima, partition.maxima_rows
+            lo = bisect_right(records, value) if comparison is operator.lt else bisect_left(records, value)
+        else:
+            raise ValueError(f"Comparison {comparison} can't be answered by a SortedIndex")
+
+        return rows[lo] if lo < len(rows) else None
+
+    def count(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> int:
+        """
+        Count the rows with the equality values `key` whose range value matches `comparison` and `value`.
+
+        Args:
+            key (tuple): The values of the equality fields.
+            comparison (Optional[Callable], optional): The range comparison, or None to match every row. Defaults to
+                None.
+            value (Any, optional): The value compared to the range values of the rows. Defaults to None.
+
+        Returns:
+            int: The number of matching rows.
+        """
+        partition = self._partitions.get(key)
+        if partition is None:
+            return 0
+        lo, hi = self._bounds(partition, comparison if self.range_field else None, value)
+        return max(hi - lo, 0)
+
+    def nth(self, key: tuple, comparison: Optional[Callable], value: Any, n: int) -> Any:
+        """
+        Get the `n`th of the rows counted by `count`, in the order of their range values.
+
+        Args:
+            key (tuple): The values of the equality fields.
+            comparison (Optional[Callable]): The range comparison, or None to match every row.
+            value (Any): The value compared to the range values of the rows.
+            n (int): The position of the row among the matching rows.
+
+        Returns:
+            Any: The row.
+
+        Raises:
+            IndexError: If fewer than `n + 1` rows match.
+        """
+        partition = self._partitions.get(key)
+        if partition is None:
+            raise IndexError(n)
+        lo, hi = self._bounds(partition, comparison if self.range_field else None, value)
+        if not 0 <= n < hi - lo:
+            raise IndexError(n)
+        return partition.rows[lo + n]
+
+    def rows(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> list[Any]:
+        """
+        Get every row counted by `count`, in the order of their range values, or in insertion order without a range
+        field.
+
+        Args:
+            key (tuple): The values of the equality fields.
+            comparison (Optional[Callable], optional): The range comparison, or None to match every row. Defaults to
+                None.
+            value (Any, optional): The value compared to the range values of the rows. Defaults to None.
+
+        Returns:
+            list[Any]: The matching rows.
+        """
+        partition = self._partitions.get(key)
+        if partition is None:
+            return []
+        lo, hi = self._bounds(partition, comparison if self.range_field else None, value)
+        return partition.rows[lo:hi]
+
+    def choice(
+        self, rng: Random, key: tuple, comparison: Optional[Callable] = None, value: Any = None
+    ) -> Optional[Any]:
+        """
+        Pick a random row with the equality values `key` whose range value matches `comparison` and `value`.
+
+        Args:
+            rng (Random): The random number generator to pick with.
+            key (tuple): The values of the equality fields.
+            comparison (Optional[Callable], optional): The range comparison, or None to match every row. Defaults to
+                None.
+            value (Any, optional): The value compared to the range values of the rows. Defaults to None.
+
+        Returns:
+            Optional[Any]: The row, or None if no row matches.
+        """
+        count = self.count(key, comparison, value)
+        if count == 0:
+            return None
+        return self.nth(key, comparison, value, rng.randrange(count))
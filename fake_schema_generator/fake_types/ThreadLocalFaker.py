@@ -0,0 +1,119 @@
+from random import Random
+from threading import Lock
+from threading import local
+from typing import Any
+from typing import Callable
+from weakref import WeakSet
+
+from faker import Faker
+
+
+class ThreadLocalFaker:
+    """
+    A stand-in for a `Faker` that gives every thread its own. The first time a thread uses it, `factory` creates the
+    thread's Faker, which is seeded with its own `random.Random`, so threads never share a random number generator or
+    the state of a provider and their calls don't need a lock. Attributes are looked up on the calling thread's Faker.
+
+    The seeds of the threads are drawn from a generator seeded by `seed_instance`. The thread that calls
+    `seed_instance` is reseeded from it straight away, the others are seeded in the order they first use the stand-in.
+
+    Providers added with `add_provider` are added to the Faker of the calling thread, and a copy made by
+    `copy_provider` to the Faker of every other thread, including threads that haven't used the stand-in yet.
+
+    Args:
+        factory (Callable[[], Faker]): Creates the Faker of a thread, with the providers every thread starts with.
+        copy_provider (Callable[[Any, Faker], Any]): Creates a thread's copy of a provider passed to `add_provider`.
+    """
+
+    def __init__(self, factory: Callable[[], Faker], copy_provider: Callable[[Any, Faker], Any]):
+        self._factory = factory
+        self._copy_provider = copy_provider
+        self._seeds = Random()
+        self._providers: list[Any] = []
+        self._fakes: WeakSet[Faker] = WeakSet()
+        self._lock = Lock()
+        self._local = local()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.current(), name)
+
+    def current(self) -> Faker:
+        """
+        Get the Faker of the calling thread, creating it if the thread hasn't used the stand-in before.
+
+        Returns:
+            Faker: The thread's Faker.
+        """
+        fake = getattr(self._local, "fake", None)
+        if fake is not None:
+            return fake
+
+        fake = self._factory()
+        with self._lock:
+            fake.seed_instance(self._seeds.getrandbits(64))
+            providers = list(self._providers)
+            self._fakes.add(fake)
+        for provider in providers:
+            fake.add_provider(self._copy_provider(provider, fake))
+        self._local.fake = fake
+
+        return fake
+
+    def formatter(self, name: str) -> Callable:
+        """
+        Get a function that calls a formatter on the Faker of whichever thread calls it, unlike `getattr`, which
+        returns the formatter of the calling thread's Faker.
+
+        Args:
+            name (str): The name of the formatter.
+
+        Returns:
+            Callable: The function.
+        """
+        thread_faker = self.current
+
+        def call(*args, **kwargs):
+            return getattr(thread_faker(), name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def add_provider(self, provider: Any) -> None:
+        """
+        Add a provider to the Faker of every thread.
+
+        Args:
+            provider (Any): A provider, or a provider class.
+
+        Returns:
+            None
+        """
+        fake = self.current()
+        with self._lock:
+            self._providers.append(provider)
+            others = [f for f in self._fakes if f is not fake]
+        fake.add_provider(provider)
+        for other in others:
+            other.add_provider(self._copy_provider(provider, other))
+
+        return None
+
+    def seed_instance(self, seed: Any = None) -> None:
+        """
+        Seed the generator that the Fakers of the threads are seeded from, and reseed the calling thread's Faker from
+        it.
+
+        Args:
+            seed (Any, optional): The seed. Defaults to None, to seed from the system.
+
+        Returns:
+            None
+        """
+        fake = self.current()
+        with self._lock:
+            self._seeds.seed(seed)
+            fake.seed_instance(self._seeds.getrandbits(64))
+
+        return None
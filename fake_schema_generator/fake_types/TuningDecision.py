@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class TuningDecision:
+    """
+    A change an `AutoTuner` made to the batch size of a model or to the number of workers, recorded in
+    `GenerationProgress.tuning`.
+
+    Attributes:
+        elapsed (float): The number of seconds into the run the decision was made.
+        reason (str): `"calibration"` for the first measurement of a model, `"throughput"` when the measured throughput
+            of a model changed, `"memory"` when a batch size was capped to fit the memory limits, or `"workers"` for a
+            change to the number of workers.
+        model (Optional[str]): The model whose batch size changed, `None` for a change to the number of workers.
+        batch_size (int): The batch size of the model after the decision, per worker. 0 for a change to the number of
+            workers.
+        workers (int): The number of workers after the decision.
+        rows_per_second (float): The throughput the decision was based on: that of the model for a batch size, across
+            all models for the number of workers.
+    """
+
+    elapsed: float
+    reason: str
+    model: Optional[str]
+    batch_size: int
+    workers: int
+    rows_per_second: float
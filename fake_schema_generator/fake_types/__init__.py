@@ -1,4 +1,24 @@
+from .AutoTuner import AutoTuner
+from .ChangeEvent import ChangeEvent
+from .ChangeStream import ChangeStream
+from .EmissionStats import EmissionStats
 from .FakeSchemaGenerator import FakeSchemaGenerator
 from .FakeType import FakeType
+from .FieldExplanation import FieldExplanation
+from .FieldPlan import FieldPlan
+from .GenerationController import GenerationController
+from .GenerationProgress import GenerationProgress
+from .GeneratorSnapshot import GeneratorSnapshot
+from .JoinPlan import JoinPlan
+from .LazyGenerator import LazyGenerator
+from .PlanExplanation import PlanExplanation
+from .RateEmitter import RateEmitter
 from .SchemaCondition import SchemaCondition
+from .SchemaValidationError import SchemaValidationError
+from .ShardCoordinator import ShardCoordinator
+from .ShardManifest import ShardManifest
+from .ShardResult import ShardResult
+from .SortedIndex import SortedIndex
+from .ThreadLocalFaker import ThreadLocalFaker
+from .TuningDecision import TuningDecision
 from .ValueOf import ValueOf
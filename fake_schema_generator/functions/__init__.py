@@ -1,3 +1,10 @@
+from .analyse_model import analyse_model
+from .arrow_table import arrow_table
+from .current_memory_usage import current_memory_usage
 from .dataclass_to_interface import dataclass_to_interface
+from .dataclass_to_row_type import dataclass_to_row_type
 from .extract_annotations import extract_annotations
+from .group_aggregate import group_aggregate
+from .load_models import load_models
+from .optional_import import optional_import
 from .resolve_annotated_type import resolve_annotated_type
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from .dataclass_to_row_type import dataclass_to_row_type
+from .extract_annotations import extract_annotations
+
+
+@cache
+def analyse_model(cls: type[dataclass]) -> tuple[dict[str, Any], type[dataclass]]:
+    """
+    Extract the annotations of a dataclass and build its row type. The result is memoized for the lifetime of the
+    process, so registering the same model with many `FakeSchemaGenerator`s only analyses it once.
+
+    Args:
+        cls (type[dataclass]): The dataclass to analyse.
+
+    Returns:
+        tuple[dict[str, Any], type[dataclass]]: The annotations as returned by `extract_annotations` and the row type
+        as returned by `dataclass_to_row_type`. Both are shared, so they must not be modified.
+    """
+    return extract_annotations(cls), dataclass_to_row_type(cls)
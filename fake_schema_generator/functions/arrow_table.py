@@ -0,0 +1,72 @@
+import types
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+from typing import Union
+from typing import get_args
+from typing import get_origin
+
+from .extract_annotations import extract_annotations
+from .optional_import import optional_import
+
+# The Arrow types of the values of fields by their type hint, as the names of pyarrow's type functions.
+_ARROW_TYPES = {
+    bool: "bool_",
+    int: "int64",
+    float: "float64",
+    str: "string",
+    bytes: "binary",
+    date: "date32",
+}
+
+
+def _value_type(hint: Any) -> Any:
+    """
+    The type of the values of a field with a type hint, without `Optional`.
+    """
+    if get_origin(hint) is Union or get_origin(hint) is types.UnionType:
+        args = [a for a in get_args(hint) if a is not type(None)]
+        return args[0] if len(args) == 1 else None
+    return hint
+
+
+def arrow_table(model: type[dataclass], columns: dict[str, list[Any]]) -> Any:
+    """
+    Build a `pyarrow.Table` from the columns of a model's rows, converting each column to an array in one call. The
+    type of a column is inferred from its values, e.g. `datetime` as a timestamp and `Decimal` as a decimal. A column
+    that's all `None`, or of numbers of another type than its field's hint, is cast to the type of the hint if that's
+    `bool`, `int`, `float`, `str`, `bytes` or `date`, `Optional` or not, and the values fit it, e.g. a `float` column of
+    whole numbers. Other values are left as they are.
+
+    Args:
+        model (type[dataclass]): The model of the rows.
+        columns (dict[str, list[Any]]): The values of each field of the rows, in order.
+
+    Returns:
+        pyarrow.Table: The table.
+
+    Raises:
+        ImportError: If pyarrow isn't installed.
+    """
+    pyarrow = optional_import("pyarrow")
+    if pyarrow is None:
+        raise ImportError("pyarrow is required to convert tables to Arrow, install it with `pip install pyarrow`")
+
+    def numeric(arrow_type: Any) -> bool:
+        return pyarrow.types.is_integer(arrow_type) or pyarrow.types.is_floating(arrow_type)
+
+    annotations = extract_annotations(model)
+    arrays = []
+    for field, values in columns.items():
+        array = pyarrow.array(values)
+        name = _ARROW_TYPES.get(_value_type(annotations[field]["type"])) if field in annotations else None
+        hinted = getattr(pyarrow, name)() if name is not None else array.type
+        if array.type != hinted and (pyarrow.types.is_null(array.type) or numeric(array.type) and numeric(hinted)):
+            try:
+                # Casts are checked, so 4.5 isn't cast to an int.
+                array = array.cast(hinted)
+            except pyarrow.ArrowInvalid:
+                pass
+        arrays.append(array)
+
+    return pyarrow.Table.from_arrays(arrays, names=list(columns))
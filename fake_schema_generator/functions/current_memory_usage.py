@@ -0,0 +1,27 @@
+import os
+import sys
+from typing import Optional
+
+
+def current_memory_usage() -> Optional[int]:
+    """
+    Get the memory used by the current process.
+
+    Returns:
+        Optional[int]: The resident set size in bytes where `/proc` is available, otherwise the peak resident set size
+        reported by `resource`, or `None` if neither is available.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, everything else reports kilobytes.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
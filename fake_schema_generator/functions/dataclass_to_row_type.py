@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from dataclasses import make_dataclass
+from operator import attrgetter
+from typing import Any
+from typing import Optional
+from typing import get_type_hints
+
+
+def dataclass_to_row_type(cls: type[dataclass]) -> type[dataclass]:
+    """
+    Create the row type that a dataclass's rows are filled in with while they're generated: a slotted dataclass with
+    the same fields, all optional and defaulting to None. Slots make the rows small and quick to create, and a
+    completed row is turned into the dataclass with `to_models`, which passes the values of its fields straight to the
+    dataclass instead of copying them into a dictionary first.
+
+    Args:
+        cls (type[dataclass]): A dataclass to create the row type of.
+
+    Returns:
+        type[dataclass]: A new slotted dataclass type named f"{cls.__name__}Row", with a `to_models(rows)` class method
+        that converts a list of rows to a list of `cls`.
+    """
+    type_hints = get_type_hints(cls)
+    cls_fields = fields(cls)
+    init_names = [f.name for f in cls_fields if f.init]
+    # `attrgetter` returns a bare value rather than a tuple for a single name.
+    values = attrgetter(*init_names) if len(init_names) > 1 else lambda row: tuple(getattr(row, n) for n in init_names)
+    positional = all(f.init and not f.kw_only for f in cls_fields)
+
+    def to_models(_row_type: type, rows: list[Any]) -> list[Any]:
+        if positional:
+            return [cls(*values(row)) for row in rows]
+        return [cls(**dict(zip(init_names, values(row)))) for row in rows]
+
+    return make_dataclass(
+        f"{cls.__name__}Row",
+        [(f.name, Optional[type_hints[f.name]], field(default=None)) for f in cls_fields],
+        namespace={"to_models": classmethod(to_models)},
+        slots=True,
+    )
@@ -0,0 +1,95 @@
+from typing import Any
+from typing import Callable
+
+from ..operators import typed_product
+from ..operators import typed_sum
+from .optional_import import optional_import
+
+# Floats represent every integer up to this exactly, so integers below it can be mixed with floats in NumPy.
+_MAX_EXACT_INTEGER = 2**53
+
+
+def _numpy_aggregate(codes: list[int], columns: list[list[Any]], groups: int, row_op: Callable) -> list[Any] | None:
+    """
+    Apply `typed_product` or `typed_sum` to each row and `typed_sum` to each group with NumPy, when it's installed and
+    the result is the same as in Python: at least one column holds floats and every value is an `int` or `float`.
+    """
+    numpy = optional_import("numpy")
+    if numpy is None:
+        return None
+
+    has_float = False
+    for column in columns:
+        for v in column:
+            t = type(v)
+            if t is float:
+                has_float = True
+            elif t is not int or not -_MAX_EXACT_INTEGER < v < _MAX_EXACT_INTEGER:
+                return None
+    if not has_float:
+        # Python integers don't overflow, int64 does.
+        return None
+
+    matrix = numpy.array(columns, dtype=numpy.float64)
+    values = matrix.prod(axis=0) if row_op is typed_product else matrix.sum(axis=0)
+    totals = numpy.zeros(groups, dtype=numpy.float64)
+    # Accumulates in row order, so the sums are the same as `typed_sum`'s.
+    numpy.add.at(totals, numpy.array(codes, dtype=numpy.intp), values)
+    return totals.tolist()
+
+
+def group_aggregate(
+    keys: list[Any],
+    rows: list[Any],
+    field: str,
+    fields: list[str],
+    row_op: Callable,
+    col_op: Callable,
+) -> list[Any]:
+    """
+    For each key, apply `row_op` to `fields` of every row whose `field` equals the key, then `col_op` to the results,
+    the way `FakeSchemaGenerator.calculate` does for a single key. Every row is read once, and the rows are grouped by
+    `field` in a single pass. When `row_op` is `typed_product` or `typed_sum`, `col_op` is `typed_sum` and NumPy is
+    installed, the rows and groups are computed as arrays instead of row by row.
+
+    Args:
+        keys (list[Any]): The values of `field` to aggregate the rows of.
+        rows (list[Any]): The rows to aggregate.
+        field (str): The field that groups the rows.
+        fields (list[str]): The fields to use in the calculation.
+        row_op (Callable): The operation to perform on each row.
+        col_op (Callable): The operation to perform on the results of each group.
+
+    Returns:
+        list[Any]: For each key, `0` if no row has the key, the result of `row_op` if one row does, otherwise the result
+        of `col_op`.
+    """
+
+    def aggregate(values: list[Any]) -> Any:
+        if len(values) == 0:
+            return 0
+        return values[0] if len(values) == 1 else col_op(values)
+
+    try:
+        groups: dict[Any, int] = {}
+        codes = [groups.setdefault(getattr(row, field), len(groups)) for row in rows]
+        hash(tuple(keys))
+    except TypeError:
+        # Unhashable keys can't be grouped, compare every row with every key instead.
+        return [
+            aggregate([row_op([getattr(row, f) for f in fields]) for row in rows if getattr(row, field) == key])
+            for key in keys
+        ]
+
+    columns = [[getattr(row, f) for row in rows] for f in fields]
+    results = None
+    if row_op in (typed_product, typed_sum) and col_op is typed_sum and len(rows) > 0:
+        results = _numpy_aggregate(codes, columns, len(groups), row_op)
+
+    if results is None:
+        values: list[list[Any]] = [[] for _ in groups]
+        for code, row_values in zip(codes, zip(*columns)):
+            values[code].append(row_op(list(row_values)))
+        results = [aggregate(v) for v in values]
+
+    return [results[groups[key]] if key in groups else 0 for key in keys]
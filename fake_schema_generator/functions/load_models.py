@@ -0,0 +1,53 @@
+import os
+import sys
+from dataclasses import dataclass
+from dataclasses import is_dataclass
+from importlib import import_module
+from importlib.util import module_from_spec
+from importlib.util import spec_from_file_location
+from pathlib import Path
+
+from fake_schema_generator.fake_types.FakeType import FakeType
+
+from .analyse_model import analyse_model
+
+
+def load_models(module: str | Path) -> list[type[dataclass]]:
+    """
+    Import a module of models and find the dataclasses in it with at least one field annotated with a `FakeType`,
+    including models the module imports from elsewhere.
+
+    Args:
+        module (str | Path): The dotted name of the module, importable from the current directory, or the path of its
+            file. The directory of the file is added to `sys.path`, so that it can import its neighbours.
+
+    Returns:
+        list[type[dataclass]]: The models, in the order the module defines or imports them.
+
+    Raises:
+        ImportError: If the module can't be imported.
+    """
+    path = Path(module)
+    if path.suffix == ".py" or path.is_file():
+        directory = str(path.resolve().parent)
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+        spec = spec_from_file_location(path.stem, path)
+        if spec is None:
+            raise ImportError(f"Can't import {module}")
+        loaded = module_from_spec(spec)
+        # Registered before running it, so that its models can be pickled by name.
+        sys.modules[path.stem] = loaded
+        spec.loader.exec_module(loaded)
+    else:
+        if os.getcwd() not in sys.path:
+            sys.path.insert(0, os.getcwd())
+        loaded = import_module(str(module))
+
+    return [
+        value
+        for value in vars(loaded).values()
+        if isinstance(value, type)
+        and is_dataclass(value)
+        and any(isinstance(m, FakeType) for a in analyse_model(value)[0].values() for m in a["metadata"])
+    ]
@@ -0,0 +1,22 @@
+from functools import cache
+from importlib import import_module
+from types import ModuleType
+from typing import Optional
+
+
+@cache
+def optional_import(name: str) -> Optional[ModuleType]:
+    """
+    Import an optional dependency the first time it's needed, so that importing `fake_schema_generator` doesn't pay for
+    it and doesn't require it.
+
+    Args:
+        name (str): The name of the module, e.g. `"numpy"`.
+
+    Returns:
+        Optional[ModuleType]: The module, or `None` if it isn't installed.
+    """
+    try:
+        return import_module(name)
+    except ImportError:
+        return None
@@ -4,6 +4,8 @@ from typing import get_args
 
 type SupportsSum = int | float | Decimal
 
+_SUPPORTED_TYPES = get_args(SupportsSum.__value__)
+
 
 def typed_sum(sequence: Sequence[SupportsSum]) -> SupportsSum | None:
     """
@@ -24,8 +26,7 @@ def typed_sum(sequence: Sequence[SupportsSum]) -> SupportsSum | None:
     if not sequence:
         return None
 
-    supported_types = get_args(SupportsSum.__value__)
-    if any(type(i) not in supported_types for i in sequence):
+    if any(type(i) not in _SUPPORTED_TYPES for i in sequence):
         raise TypeError(f"Unsupported type in sequence: {sequence}")
 
     accumulator = sequence[0]
@@ -0,0 +1,105 @@
+from array import array
+from random import Random
+from typing import Any
+from typing import Optional
+from typing import Sequence
+
+
+class AliasTable:
+    """
+    A categorical distribution compiled for sampling with Vose's alias method: every draw takes one random number and
+    one comparison, however many values there are and however skewed their weights. Draws are returned as integer
+    codes, the positions of the values in `values`, in an `array` of the smallest type that holds them.
+
+    Args:
+        values (Sequence[Any]): The values.
+        weights (Optional[Sequence[float]], optional): The relative weight of each value. Defaults to equal weights.
+
+    Raises:
+        ValueError: If there are no values, the number of weights doesn't match the number of values, a weight is
+            negative or every weight is 0.
+    """
+
+    def __init__(self, values: Sequence[Any], weights: Optional[Sequence[float]] = None):
+        self.values = tuple(values)
+        size = len(self.values)
+        if size == 0:
+            raise ValueError("At least one value is required")
+        weights = [1.0] * size if weights is None else [float(w) for w in weights]
+        if len(weights) != size:
+            raise ValueError(f"Got {len(weights)} weights for {size} values")
+        if any(w < 0 for w in weights):
+            raise ValueError("Weights can't be negative")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("At least one weight must be positive")
+
+        self.weights = tuple(w / total for w in weights)
+        self.typecode = "B" if size <= 1 << 8 else "H" if size <= 1 << 16 else "L"
+        scaled = [w * size for w in self.weights]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        probabilities = [1.0] * size
+        aliases = list(range(size))
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less], aliases[less] = scaled[less], more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left in `small` or `large` is 1 but for rounding errors. A draw picks a column `i` uniformly and
+        # then `i` or its alias, so the probability of keeping `i` is stored as a threshold on `u = random() * size`
+        # rather than on the fraction of `u` past `i`.
+        self._thresholds = tuple(i + p for i, p in enumerate(probabilities))
+        self._aliases = tuple(aliases)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self):
+        return f"AliasTable(values={len(self.values)})"
+
+    def code(self, rng: Random) -> int:
+        """
+        Draw the code of a value.
+
+        Args:
+            rng (Random): The random number generator.
+
+        Returns:
+            int: The position of the value in `values`.
+        """
+        u = rng.random() * len(self._aliases)
+        i = int(u)
+        return i if u < self._thresholds[i] else self._aliases[i]
+
+    def codes(self, rng: Random, count: int) -> array:
+        """
+        Draw the codes of `count` values at once, the codes that `count` calls to `code` would draw.
+
+        Args:
+            rng (Random): The random number generator.
+            count (int): The number of codes.
+
+        Returns:
+            array: The positions of the values in `values`.
+        """
+        random, size, thresholds, aliases = rng.random, len(self._aliases), self._thresholds, self._aliases
+        codes = array(self.typecode, bytes(array(self.typecode).itemsize * count))
+        for n in range(count):
+            u = random() * size
+            i = int(u)
+            codes[n] = i if u < thresholds[i] else aliases[i]
+        return codes
+
+    def sample(self, rng: Random, count: int) -> list[Any]:
+        """
+        Draw `count` values at once, see `codes`.
+
+        Args:
+            rng (Random): The random number generator.
+            count (int): The number of values.
+
+        Returns:
+            list[Any]: The values.
+        """
+        return list(map(self.values.__getitem__, self.codes(rng, count)))
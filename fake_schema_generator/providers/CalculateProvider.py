@@ -38,3 +38,24 @@ class CalculateProvider(SchemaReferenceBaseProvider):
             raise ValueError("Schema generator not set")
 
         return self.schema_generator.calculate(source_model, model, field, value, fields, row_op, col_op)
+
+    def calculate_batch(
+        self,
+        source_models: list[dataclass],
+        model: type[dataclass],
+        field: str,
+        value: Any,
+        fields: list[str],
+        row_op: Optional[Callable] = noop,
+        col_op: Optional[Callable] = noop,
+    ) -> list[Any]:
+        """
+        Wraps a call to the same function in `FakeSchemaGenerator`
+
+        Raises:
+            ValueError: If the schema generator is not set.
+        """
+        if self.schema_generator is None:
+            raise ValueError("Schema generator not set")
+
+        return self.schema_generator.calculate_batch(source_models, model, field, value, fields, row_op, col_op)
@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from typing import Any
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+from faker.providers import BaseProvider
+
+from .AliasTable import AliasTable
+
+
+class CategoricalProvider(BaseProvider):
+    """
+    A Faker provider for picking values from a weighted set, e.g. the status of an order, see `AliasTable`. The weights
+    are compiled into an alias table the first time a set is used, after which a value costs one random number
+    whatever the weights.
+
+    `elements` is either a sequence of values, picked with `weights` or with equal weights, or a mapping of values to
+    their weights:
+
+        FakeType("categorical", elements={"Pending": 0.1, "Shipped": 0.15, "Delivered": 0.7, "Returned": 0.05})
+    """
+
+    def __init__(self, generator):
+        super().__init__(generator)
+        self._tables: dict[tuple, AliasTable] = {}
+        # The last table compiled for the same `elements` and `weights` objects, which is the common case of a
+        # `FakeType` passing its arguments, so that their values aren't hashed for every row.
+        self._last: tuple[Any, Any, Optional[AliasTable]] = (None, None, None)
+
+    def alias_table(self, elements: Sequence[Any] | Mapping[Any, float], weights: Optional[Sequence[float]] = None):
+        """
+        Get the alias table of a weighted set, compiling it the first time. `elements` and `weights` must not be changed
+        once they've been used.
+
+        Args:
+            elements (Sequence[Any] | Mapping[Any, float]): The values, or a mapping of the values to their weights.
+            weights (Optional[Sequence[float]], optional): The weights of a sequence of values. Defaults to equal
+                weights.
+
+        Returns:
+            AliasTable: The alias table.
+
+        Raises:
+            ValueError: If both `elements` is a mapping and `weights` are given, or the weights are invalid (see
+                `AliasTable`).
+        """
+        last_elements, last_weights, last_table = self._last
+        if elements is last_elements and weights is last_weights:
+            return last_table
+
+        original = elements, weights
+        if isinstance(elements, Mapping):
+            if weights is not None:
+                raise ValueError("weights can't be given when elements is a mapping")
+            elements, weights = tuple(elements), tuple(elements.values())
+        key = (tuple(elements), None if weights is None else tuple(weights))
+        try:
+            hash(key)
+        except TypeError:
+            # Tables of unhashable values are only kept as the last table.
+            key = None
+        table = None if key is None else self._tables.get(key)
+        if table is None:
+            table = AliasTable(elements, weights)
+            if key is not None:
+                self._tables[key] = table
+        self._last = (*original, table)
+        return table
+
+    def categorical(
+        self, elements: Sequence[Any] | Mapping[Any, float], weights: Optional[Sequence[float]] = None
+    ) -> Any:
+        """
+        Pick a value from a weighted set.
+
+        Args:
+            elements (Sequence[Any] | Mapping[Any, float]): See `alias_table`.
+            weights (Optional[Sequence[float]], optional): See `alias_table`.
+
+        Returns:
+            Any: The value.
+        """
+        table = self.alias_table(elements, weights)
+        return table.values[table.code(self.generator.random)]
+
+    def batch(
+        self,
+        elements: Sequence[Any] | Mapping[Any, float],
+        source_models: list[dataclass],
+        weights: Optional[Sequence[float]] = None,
+    ) -> list[Any]:
+        """
+        Pick a value for each of a block of rows at once, the values that a call to `categorical` per row would pick.
+        The values are drawn as codes in bulk and mapped to the values, so every row refers to the same value object.
+
+        Args:
+            elements (Sequence[Any] | Mapping[Any, float]): See `alias_table`.
+            source_models (list[dataclass]): The rows being generated.
+            weights (Optional[Sequence[float]], optional): See `alias_table`.
+
+        Returns:
+            list[Any]: A value for each row.
+        """
+        return self.alias_table(elements, weights).sample(self.generator.random, len(source_models))
@@ -0,0 +1,134 @@
+import re
+import string
+from random import Random
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+# A formatter in double braces, or a run of characters that are replaced by random digits or letters.
+_TOKEN = re.compile(r"\{\{\s*(\w+)\s*\}\}|#+|%|\?+")
+_LETTERS = string.ascii_letters
+
+
+def _formatter_part(formatter: Callable[[], Any]) -> Callable[[Random], str]:
+    return lambda rng: str(formatter())
+
+
+def _digits_part(count: int) -> Callable[[Random], str]:
+    stop = 10**count
+    return lambda rng: str(rng.randrange(stop)).zfill(count)
+
+
+def _non_zero_digit(rng: Random) -> str:
+    return str(rng.randrange(1, 10))
+
+
+def _letters_part(count: int) -> Callable[[Random], str]:
+    if count == 1:
+        return lambda rng: rng.choice(_LETTERS)
+    return lambda rng: "".join(rng.choices(_LETTERS, k=count))
+
+
+class CompiledTemplate:
+    """
+    A pattern that has been parsed once into a format string and a tuple of parts, each of which generates the value
+    of one placeholder from a random number generator. Evaluating the template calls the parts and formats their
+    values, without parsing the pattern or looking formatters up again.
+
+    Patterns use Faker's syntax: `{{formatter}}` is replaced by a value of a Faker formatter, `#` by a digit, `%` by a
+    digit other than 0 and `?` by a letter. Everything else is copied as it is.
+
+    Args:
+        format_string (str): The literal text of the pattern with a `{}` for each part.
+        parts (tuple[Callable[[Random], str], ...]): The parts, in the order they appear in the pattern.
+        pattern (str, optional): The pattern the template was compiled from. Defaults to "".
+    """
+
+    def __init__(self, format_string: str, parts: tuple[Callable[[Random], str], ...], pattern: str = ""):
+        self.format_string = format_string
+        self.parts = parts
+        self.pattern = pattern
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.pattern!r})"
+
+    @classmethod
+    def compile(
+        cls,
+        pattern: str,
+        generator: Any,
+        parts: Optional[dict[str, Callable[[Random], str]]] = None,
+    ) -> "CompiledTemplate":
+        """
+        Parse a pattern into a template. The formatters it names are looked up once, on `generator`.
+
+        Args:
+            pattern (str): The pattern.
+            generator (Any): The Faker or Faker generator supplying the formatters.
+            parts (Optional[dict[str, Callable[[Random], str]]], optional): Parts to use for `{{name}}` instead of the
+                formatter `name`, each taking the random number generator. Defaults to None.
+
+        Returns:
+            CompiledTemplate: The template.
+
+        Raises:
+            ValueError: If the pattern names a formatter that doesn't exist.
+        """
+        parts = parts or {}
+        literals: list[str] = []
+        compiled: list[Callable[[Random], str]] = []
+        position = 0
+        for match in _TOKEN.finditer(pattern):
+            literals.append(pattern[position : match.start()].replace("{", "{{").replace("}", "}}"))
+            position = match.end()
+            name, token = match.group(1), match.group(0)
+            if name is not None:
+                if name in parts:
+                    compiled.append(parts[name])
+                    continue
+                try:
+                    formatter = getattr(generator, name)
+                except AttributeError:
+                    raise ValueError(f"Unknown formatter {name!r} in template {pattern!r}") from None
+                compiled.append(_formatter_part(formatter))
+            elif token[0] == "#":
+                compiled.append(_digits_part(len(token)))
+            elif token == "%":
+                compiled.append(_non_zero_digit)
+            else:
+                compiled.append(_letters_part(len(token)))
+        literals.append(pattern[position:].replace("{", "{{").replace("}", "}}"))
+
+        return cls("{}".join(literals), tuple(compiled), pattern)
+
+    def __call__(self, rng: Random) -> str:
+        """
+        Generate a value.
+
+        Args:
+            rng (Random): The random number generator.
+
+        Returns:
+            str: The value.
+        """
+        return self.format_string.format(*[part(rng) for part in self.parts])
+
+    def batch(self, rng: Random, count: int) -> list[str]:
+        """
+        Generate `count` values at once. The values are the ones `count` calls would generate, so they don't depend on
+        how a column is split into batches.
+
+        Args:
+            rng (Random): The random number generator.
+            count (int): The number of values.
+
+        Returns:
+            list[str]: The values.
+        """
+        if not self.parts:
+            return [self.format_string.replace("{{", "{").replace("}}", "}")] * count
+        render, parts = self.format_string.format, self.parts
+        if len(parts) == 1:
+            (part,) = parts
+            return [render(part(rng)) for _ in range(count)]
+        return [render(*[part(rng) for part in parts]) for _ in range(count)]
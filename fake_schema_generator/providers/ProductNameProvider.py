@@ -1,5 +1,9 @@
+from typing import Optional
+
 from faker.providers import BaseProvider
 
+from .CompiledTemplate import CompiledTemplate
+
 
 class ProductNameProvider(BaseProvider):
     """
@@ -8,6 +12,18 @@ class ProductNameProvider(BaseProvider):
 
     def __init__(self, generator):
         super().__init__(generator)
+        self._template: Optional[CompiledTemplate] = None
+
+    def _word_part(self, part_of_speech: str):
+        """
+        A template part picking a word of a part of speech the way `word(part_of_speech=...)` does, from the word list
+        of the lorem provider bound once rather than looked up for every word.
+        """
+        words = getattr(self.generator.word.__self__, "parts_of_speech", {}).get(part_of_speech)
+        if words is None:
+            # Let `word` raise its error for locales without parts of speech.
+            return lambda rng: self.generator.word(part_of_speech=part_of_speech)
+        return lambda rng: rng.choice(words)
 
     def product_name(self) -> str:
         """
@@ -16,4 +32,7 @@ class ProductNameProvider(BaseProvider):
         Returns:
             str: A product name.
         """
-        return f"{self.generator.word(part_of_speech='adjective')} {self.generator.word(part_of_speech='noun')}"
+        if self._template is None:
+            parts = {"adjective": self._word_part("adjective"), "noun": self._word_part("noun")}
+            self._template = CompiledTemplate.compile("{{adjective}} {{noun}}", self.generator, parts)
+        return self._template(self.generator.random)
@@ -22,6 +22,7 @@ class ReferenceProvider(SchemaReferenceBaseProvider):
         model: type[dataclass],
         field: Optional[str] = None,
         conditions: Optional[list["SchemaCondition"]] = None,
+        random_match: bool = False,
     ) -> Any:
         """
         Wraps a call to the same function in `FakeSchemaGenerator`
@@ -32,4 +33,23 @@ class ReferenceProvider(SchemaReferenceBaseProvider):
         if self.schema_generator is None:
             raise ValueError("Schema generator not set")
 
-        return self.schema_generator.reference(source_model, model, field, conditions)
+        return self.schema_generator.reference(source_model, model, field, conditions, random_match)
+
+    def reference_batch(
+        self,
+        source_models: list[dataclass],
+        model: type[dataclass],
+        field: Optional[str] = None,
+        conditions: Optional[list["SchemaCondition"]] = None,
+        random_match: bool = False,
+    ) -> list[Any]:
+        """
+        Wraps a call to the same function in `FakeSchemaGenerator`
+
+        Raises:
+            ValueError: If the schema generator is not set.
+        """
+        if self.schema_generator is None:
+            raise ValueError("Schema generator not set")
+
+        return self.schema_generator.reference_batch(source_models, model, field, conditions, random_match)
@@ -1,3 +1,6 @@
+from dataclasses import dataclass
+from typing import Any
+
 from faker.providers import BaseProvider
 
 
@@ -6,6 +9,11 @@ class SchemaReferenceBaseProvider(BaseProvider):
     A base class for providers that reference other models in a schema. This class is not meant to be used directly, but
     rather to be subclassed by other providers.
 
+    A reference function `function(source_model, **kwargs)` can be paired with a batch function
+    `function_batch(source_models, **kwargs)` that returns a value for each of a block of rows at once, e.g. by
+    resolving the whole block with a single lookup. `FakeSchemaGenerator` generates rows in blocks and calls `batch`
+    for each block.
+
     Attributes:
         schema_generator: The schema generator to use for reference functions.
         reference_functions: The names of reference functions to provide to the `FakeSchemaGenerator`.
@@ -15,3 +23,23 @@ class SchemaReferenceBaseProvider(BaseProvider):
         super().__init__(fake_generator)
         self.schema_generator = fake_schema_generator
         self.reference_functions = set()
+
+    def batch(self, function: str, source_models: list[dataclass], **kwargs) -> list[Any]:
+        """
+        Call a reference function for a block of rows. Uses the function's batch function if the provider has one,
+        otherwise calls the function once per row.
+
+        Args:
+            function (str): The name of the reference function.
+            source_models (list[dataclass]): The models whose field is being filled in.
+            **kwargs: The keyword arguments of the reference function, apart from `source_model`.
+
+        Returns:
+            list[Any]: A value for each of the `source_models`, in order.
+        """
+        batch_function = getattr(self, f"{function}_batch", None)
+        if batch_function is not None:
+            return batch_function(source_models, **kwargs)
+
+        reference_function = getattr(self, function)
+        return [reference_function(source_model=source_model, **kwargs) for source_model in source_models]
@@ -0,0 +1,79 @@
+from threading import Lock
+from typing import Optional
+
+
+class SequenceAllocator:
+    """
+    Hands out blocks of sequential numbers to `SequentialNumberProvider`s that share the same sequences, such as the
+    providers of the threads of a thread-safe `FakeSchemaGenerator`. Each provider leases a block at a time and hands
+    out its numbers on its own, so the providers only synchronise once per block, to advance the shared counter of the
+    namespace.
+
+    Numbers are unique across providers but aren't handed out in order: each provider counts up through its own block,
+    and the numbers left in a block when its provider stops are never handed out.
+
+    Attributes:
+        numbers (dict[str, int]): The last number leased in each namespace.
+        block_size (int): The number of numbers leased at a time.
+    """
+
+    def __init__(self, block_size: int = 1000):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+
+        self.numbers: dict[str, int] = {}
+        self.block_size = block_size
+        self._lock = Lock()
+
+    def lease(self, namespace: str, count: Optional[int] = None) -> range:
+        """
+        Lease the next block of numbers in a namespace.
+
+        Args:
+            namespace (str): The namespace to lease numbers in.
+            count (Optional[int], optional): The number of numbers to lease. Defaults to `block_size`.
+
+        Returns:
+            range: The leased numbers, which no other lease in the namespace contains.
+        """
+        count = self.block_size if count is None else count
+        with self._lock:
+            start = self.numbers.get(namespace, 0)
+            self.numbers[namespace] = start + count
+
+        return range(start + 1, start + count + 1)
+
+    def continue_from(self, marks: dict[str, int]) -> None:
+        """
+        Lease the numbers of each namespace from past a mark, e.g. the `high_water_marks` of an earlier run, or from
+        past the last number leased if that's higher.
+
+        Args:
+            marks (dict[str, int]): The highest number handed out in each namespace.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for namespace, mark in marks.items():
+                self.numbers[namespace] = max(self.numbers.get(namespace, 0), mark)
+
+        return None
+
+    def reset(self, namespace: Optional[str] = None) -> None:
+        """
+        Lease the numbers of a namespace, or of every namespace if `namespace` is None, from the start again.
+
+        Args:
+            namespace (Optional[str], optional): The namespace to reset. Defaults to None.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if namespace is None:
+                self.numbers.clear()
+            else:
+                self.numbers.pop(namespace, None)
+
+        return None
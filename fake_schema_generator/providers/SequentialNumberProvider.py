@@ -2,6 +2,8 @@ from typing import Optional
 
 from faker.providers import BaseProvider
 
+from .SequenceAllocator import SequenceAllocator
+
 
 class SequentialNumberProvider(BaseProvider):
     """
@@ -11,11 +13,22 @@ class SequentialNumberProvider(BaseProvider):
     Attributes:
         generator (Faker): The Faker instance that this provider is attached to.
         numbers (dict[str, int]): A dictionary of the current number for each namespace.
+        offset (int): How far past the current number a new namespace starts, see `set_stride`.
+        stride (int): The step between consecutive numbers in a namespace, see `set_stride`.
+        allocator (Optional[SequenceAllocator]): The allocator that numbers are leased from in blocks when the
+            sequences are shared with other providers, in which case `offset` and `stride` don't apply.
     """
 
-    def __init__(self, generator):
+    def __init__(self, generator, allocator: Optional[SequenceAllocator] = None):
         super().__init__(generator)
         self.numbers: dict[str, int] = {}
+        self.offset: int = 0
+        self.stride: int = 1
+        self.allocator = allocator
+        # Namespaces that have handed out a number since the last `set_stride` and so step by `stride`.
+        self._stepping: set[str] = set()
+        # The numbers left in the block leased from `allocator` for each namespace.
+        self._leases: dict[str, range] = {}
 
     def sequential_number(self, namespace: str = "default") -> int:
         """
@@ -27,18 +40,115 @@ class SequentialNumberProvider(BaseProvider):
         Returns:
             int: The next number in the sequence for the given namespace.
         """
-        if namespace not in self.numbers:
-            self.numbers[namespace] = 0
-        self.numbers[namespace] += 1
+        if self.allocator is not None:
+            return self.reserve(namespace)[0]
+
+        if namespace in self._stepping:
+            self.numbers[namespace] += self.stride
+        else:
+            self.numbers[namespace] = self.numbers.get(namespace, 0) + self.offset + 1
+            self._stepping.add(namespace)
         return self.numbers[namespace]
 
+    def reserve(self, namespace: str = "default", count: int = 1) -> range:
+        """
+        Reserve the next `count` numbers of a namespace at once, the numbers that `count` calls to `sequential_number`
+        would return. The numbers are consecutive, or `stride` apart if the sequence is interleaved with those of other
+        providers (see `set_stride`).
+
+        Args:
+            namespace (str): The namespace to reserve numbers in, defaults to `"default"`.
+            count (int): The number of numbers to reserve, defaults to 1.
+
+        Returns:
+            range: The reserved numbers.
+
+        Raises:
+            ValueError: If `count` is less than 1.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+
+        if self.allocator is not None:
+            lease = self._leases.get(namespace)
+            if lease is None or len(lease) < count:
+                # The rest of the current lease is skipped, so that the reserved numbers are consecutive.
+                lease = self.allocator.lease(namespace, max(count, self.allocator.block_size))
+            numbers, self._leases[namespace] = lease[:count], lease[count:]
+        else:
+            if namespace in self._stepping:
+                first = self.numbers[namespace] + self.stride
+            else:
+                first = self.numbers.get(namespace, 0) + self.offset + 1
+                self._stepping.add(namespace)
+            numbers = range(first, first + count * self.stride, self.stride)
+
+        self.numbers[namespace] = numbers[-1]
+        return numbers
+
+    def set_stride(self, offset: int, stride: int) -> None:
+        """
+        Interleave the sequences of this provider with those of `stride - 1` other providers, so that each of them can
+        hand out numbers independently without ever handing out the same one. The next number in every namespace,
+        including namespaces that haven't been used yet, is `offset + 1` past the current one, and every number after
+        that is `stride` past the previous one.
+
+        Args:
+            offset (int): The position of this provider among the interleaved providers, from `0` to `stride - 1`.
+            stride (int): The number of interleaved providers.
+        """
+        self._stepping.clear()
+        self.offset = offset
+        self.stride = stride
+
+    def high_water_marks(self) -> dict[str, int]:
+        """
+        Get the highest number handed out, reserved or leased in each namespace. The marks can be saved, e.g. as JSON,
+        and passed to `continue_from` to continue the sequences in a later run.
+
+        Returns:
+            dict[str, int]: The highest number of each namespace.
+        """
+        marks = dict(self.numbers)
+        if self.allocator is not None:
+            for namespace, number in self.allocator.numbers.items():
+                marks[namespace] = max(marks.get(namespace, 0), number)
+
+        return marks
+
+    def continue_from(self, marks: dict[str, int]) -> None:
+        """
+        Continue the sequences past `high_water_marks`, e.g. those of an earlier run, so that no number is handed out
+        twice. The next number in each namespace is `offset + 1` past its mark, or past the current number if that's
+        higher.
+
+        Args:
+            marks (dict[str, int]): The highest number handed out in each namespace.
+        """
+        for namespace, mark in marks.items():
+            if mark > self.numbers.get(namespace, 0):
+                self.numbers[namespace] = mark
+                self._stepping.discard(namespace)
+                self._leases.pop(namespace, None)
+        if self.allocator is not None:
+            self.allocator.continue_from(marks)
+
     def reset_sequence(self, namespace: Optional[str] = None):
         """
-        Reset the sequence for the given namespace, or all namespaces if `namespace` is None.
+        Reset the sequence for the given namespace, or all namespaces if `namespace` is None. Sequences leased from an
+        `allocator` are reset in the allocator as well.
 
         Args:
             namespace (Optional[str]): The namespace to reset the sequence for, defaults to `None`. If `None`, all
             sequences will be reset.
         """
-        if namespace in self.numbers:
+        if namespace is None:
+            self.numbers.clear()
+            self._stepping.clear()
+            self._leases.clear()
+        elif namespace in self.numbers:
             del self.numbers[namespace]
+            self._stepping.discard(namespace)
+            self._leases.pop(namespace, None)
+        if self.allocator is not None:
+            self.allocator.reset(namespace)
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+from faker.providers import BaseProvider
+
+from .CompiledTemplate import CompiledTemplate
+
+
+class TemplateProvider(BaseProvider):
+    """
+    A Faker provider for generating strings from patterns like `"{{first_name}}.{{last_name}}@example.com"` or
+    `"+44 7### ######"`, see `CompiledTemplate`. Each pattern is compiled the first time it's used, so unlike
+    `Faker.parse` and `Faker.bothify` it isn't parsed, nor are its formatters looked up, again for every value.
+    """
+
+    def __init__(self, generator):
+        super().__init__(generator)
+        self._templates: dict[tuple[str, ...], tuple[CompiledTemplate, ...]] = {}
+
+    def compile(self, pattern: str | Sequence[str]) -> tuple[CompiledTemplate, ...]:
+        """
+        Get the compiled templates of a pattern or of a sequence of patterns, compiling them the first time.
+
+        Args:
+            pattern (str | Sequence[str]): The pattern, or patterns.
+
+        Returns:
+            tuple[CompiledTemplate, ...]: The templates.
+
+        Raises:
+            ValueError: If there are no patterns, or a pattern names a formatter that doesn't exist.
+        """
+        key = (pattern,) if isinstance(pattern, str) else tuple(pattern)
+        templates = self._templates.get(key)
+        if templates is None:
+            if not key:
+                raise ValueError("At least one pattern is required")
+            templates = self._templates[key] = tuple(CompiledTemplate.compile(p, self.generator) for p in key)
+        return templates
+
+    def template(self, pattern: str | Sequence[str]) -> str:
+        """
+        Generate a string from a pattern.
+
+        Args:
+            pattern (str | Sequence[str]): The pattern, or a sequence of patterns to pick one from at random for each
+                value.
+
+        Returns:
+            str: The string.
+        """
+        templates = self.compile(pattern)
+        rng = self.generator.random
+        template = templates[0] if len(templates) == 1 else rng.choice(templates)
+        return template(rng)
+
+    def batch(self, pattern: str | Sequence[str], source_models: list[dataclass]) -> list[str]:
+        """
+        Generate a string for each of a block of rows at once, the strings that a call to `template` per row would
+        generate.
+
+        Args:
+            pattern (str | Sequence[str]): See `template`.
+            source_models (list[dataclass]): The rows being generated.
+
+        Returns:
+            list[str]: A string for each row.
+        """
+        templates = self.compile(pattern)
+        rng = self.generator.random
+        if len(templates) == 1:
+            return templates[0].batch(rng, len(source_models))
+        choice = rng.choice
+        return [choice(templates)(rng) for _ in source_models]
@@ -1,5 +1,10 @@
+from .AliasTable import AliasTable
 from .CalculateProvider import CalculateProvider
+from .CategoricalProvider import CategoricalProvider
+from .CompiledTemplate import CompiledTemplate
 from .ProductNameProvider import ProductNameProvider
 from .ReferenceProvider import ReferenceProvider
 from .SchemaReferenceBaseProvider import SchemaReferenceBaseProvider
+from .SequenceAllocator import SequenceAllocator
 from .SequentialNumberProvider import SequentialNumberProvider
+from .TemplateProvider import TemplateProvider
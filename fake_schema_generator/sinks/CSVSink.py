@@ -0,0 +1,48 @@
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+
+from .Sink import Sink
+
+
+class CSVSink(Sink):
+    """
+    Writes the rows of each model to a CSV file named after the model, `<directory>/<Model>.csv`, with a header of
+    the field names. Dates and times are written in ISO 8601 and `None` as an empty string.
+
+    Args:
+        directory (str | Path): The directory to write the files to, created if it doesn't exist.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: dict[str, tuple[Any, Any]] = {}
+
+    def write(self, model: type[dataclass], rows: Iterable[dataclass]) -> None:
+        """
+        See `Sink.write`.
+        """
+        if model.__name__ not in self._files:
+            file = open(self.directory / f"{model.__name__}.csv", "w", newline="", encoding="utf-8")
+            writer = csv.writer(file)
+            writer.writerow(self.columns(model))
+            self._files[model.__name__] = (file, writer)
+
+        file, writer = self._files[model.__name__]
+        columns, plain = self.columns(model), self.plain_value
+        writer.writerows([plain(getattr(row, c)) for c in columns] for row in rows)
+
+        return None
+
+    def close(self) -> None:
+        """
+        See `Sink.close`.
+        """
+        for file, _ in self._files.values():
+            file.close()
+        self._files.clear()
+
+        return None
@@ -0,0 +1,48 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+
+from .Sink import Sink
+
+
+class NDJSONSink(Sink):
+    """
+    Writes the rows of each model to a newline-delimited JSON file named after the model, `<directory>/<Model>.ndjson`,
+    with an object per row. Dates and times are written in ISO 8601, and values JSON can't hold, e.g. `Decimal`s, as
+    strings.
+
+    Args:
+        directory (str | Path): The directory to write the files to, created if it doesn't exist.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: dict[str, Any] = {}
+
+    def write(self, model: type[dataclass], rows: Iterable[dataclass]) -> None:
+        """
+        See `Sink.write`.
+        """
+        if model.__name__ not in self._files:
+            self._files[model.__name__] = open(self.directory / f"{model.__name__}.ndjson", "w", encoding="utf-8")
+
+        columns, plain = self.columns(model), self.plain_value
+        self._files[model.__name__].writelines(
+            json.dumps({c: plain(getattr(row, c)) for c in columns}, ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        )
+
+        return None
+
+    def close(self) -> None:
+        """
+        See `Sink.close`.
+        """
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
+
+        return None
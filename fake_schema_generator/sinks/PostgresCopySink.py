@@ -0,0 +1,294 @@
+import datetime
+import types
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from struct import Struct
+from typing import Annotated
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import Union
+from typing import get_args
+from typing import get_origin
+
+from fake_schema_generator.functions import analyse_model
+
+from .Sink import Sink
+
+_HEADER = b"PGCOPY\n\xff\r\n\x00" + b"\x00\x00\x00\x00" + b"\x00\x00\x00\x00"
+_TRAILER = b"\xff\xff"
+_LENGTH = Struct("!i")
+_NULL = _LENGTH.pack(-1)
+_FIELD_COUNT = Struct("!h")
+_INT8 = Struct("!iq")
+_FLOAT8 = Struct("!id")
+_DATE = Struct("!ii")
+_INTERVAL = Struct("!iqii")
+_NUMERIC = Struct("!ihhHH")
+_TRUE = _LENGTH.pack(1) + b"\x01"
+_FALSE = _LENGTH.pack(1) + b"\x00"
+
+# PostgreSQL counts dates and times from 2000-01-01.
+_EPOCH = datetime.date(2000, 1, 1).toordinal()
+_MICROSECONDS = 1_000_000
+_NUMERIC_NEGATIVE = 0x4000
+_NUMERIC_SPECIAL = {"NaN": 0xC000, "Infinity": 0xD000, "-Infinity": 0xF000}
+
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _text(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+
+def _bytea(value: bytes) -> bytes:
+    return _LENGTH.pack(len(value)) + value
+
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _timestamp(value: datetime.datetime) -> bytes:
+    value = _naive_utc(value)
+    seconds = (value.toordinal() - _EPOCH) * 86400 + value.hour * 3600 + value.minute * 60 + value.second
+    return _INT8.pack(8, seconds * _MICROSECONDS + value.microsecond)
+
+
+def _time(value: datetime.time) -> bytes:
+    seconds = value.hour * 3600 + value.minute * 60 + value.second
+    return _INT8.pack(8, seconds * _MICROSECONDS + value.microsecond)
+
+
+def _interval(value: datetime.timedelta) -> bytes:
+    return _INTERVAL.pack(16, value.seconds * _MICROSECONDS + value.microseconds, value.days, 0)
+
+
+def _numeric(value: Decimal) -> bytes:
+    """
+    Encode a `Decimal` the way PostgreSQL stores a `numeric`: the sign, the scale and the digits in base 10000, the
+    first of which is multiplied by 10000 to the power of the weight.
+    """
+    if not value.is_finite():
+        special = "NaN" if value.is_nan() else str(value)
+        return _NUMERIC.pack(8, 0, 0, _NUMERIC_SPECIAL[special], 0)
+
+    sign, digits, exponent = value.as_tuple()
+    digits = "".join(map(str, digits))
+    if exponent > 0:
+        digits, exponent = digits + "0" * exponent, 0
+    scale = -exponent
+    point = len(digits) - scale
+    if point < 0:
+        integer, fraction = "", "0" * -point + digits
+    else:
+        integer, fraction = digits[:point], digits[point:]
+    # Pad both parts to whole groups of 4 digits, away from the decimal point.
+    integer = integer.rjust(-(-len(integer) // 4) * 4, "0")
+    fraction = fraction.ljust(-(-len(fraction) // 4) * 4, "0")
+    groups = [int(integer[i : i + 4]) for i in range(0, len(integer), 4)]
+    weight = len(groups) - 1
+    groups += [int(fraction[i : i + 4]) for i in range(0, len(fraction), 4)]
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+
+    header = _NUMERIC.pack(8 + 2 * len(groups), len(groups), weight, _NUMERIC_NEGATIVE if sign else 0, scale)
+    return header + Struct(f"!{len(groups)}h").pack(*groups)
+
+
+def _text_float(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "Infinity" if value > 0 else "-Infinity"
+    return repr(value)
+
+
+def _text_interval(value: datetime.timedelta) -> str:
+    return f"{value.days} days {value.seconds}.{value.microseconds:06d} seconds"
+
+
+# The PostgreSQL column type, binary encoder and text encoder of each Python type. Binary encoders return the length
+# of the value and the value, text encoders a string that doesn't need escaping.
+_COLUMN_TYPES: dict[type, tuple[str, Callable[[Any], bytes], Callable[[Any], str]]] = {
+    bool: ("boolean", lambda v: _TRUE if v else _FALSE, lambda v: "t" if v else "f"),
+    int: ("bigint", lambda v: _INT8.pack(8, v), str),
+    float: ("double precision", lambda v: _FLOAT8.pack(8, v), _text_float),
+    Decimal: ("numeric", _numeric, str),
+    str: ("text", _text, lambda v: v.translate(_TEXT_ESCAPES)),
+    bytes: ("bytea", _bytea, lambda v: "\\\\x" + v.hex()),
+    datetime.datetime: ("timestamp", _timestamp, lambda v: _naive_utc(v).isoformat(" ")),
+    datetime.date: ("date", lambda v: _DATE.pack(4, v.toordinal() - _EPOCH), lambda v: v.isoformat()),
+    datetime.time: ("time", _time, lambda v: v.replace(tzinfo=None).isoformat()),
+    datetime.timedelta: ("interval", _interval, _text_interval),
+    uuid.UUID: ("uuid", lambda v: _bytea(v.bytes), str),
+}
+# Values of other types are written as text.
+_OTHER = (
+    "text",
+    lambda v: _text(str(Sink.plain_value(v))),
+    lambda v: str(Sink.plain_value(v)).translate(_TEXT_ESCAPES),
+)
+
+
+def _column_type(hint: Any) -> Optional[type]:
+    """
+    The type of the values of a field with a type hint, without `Optional` and `Annotated`, or `None` if it has no
+    PostgreSQL column type.
+    """
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _column_type(get_args(hint)[0])
+    if origin is Union or origin is types.UnionType:
+        args = [a for a in get_args(hint) if a is not type(None)]
+        return _column_type(args[0]) if len(args) == 1 else None
+    return hint if hint in _COLUMN_TYPES else None
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class PostgresCopySink(Sink):
+    """
+    Writes the rows of each model to a file in the format of PostgreSQL's `COPY`, the fastest way to load rows into
+    PostgreSQL: `<directory>/<Model>.copy` in the binary format, or `<directory>/<Model>.tsv` in the text format.
+    `<directory>/load.sql` creates a table per model and loads its file with `psql`:
+
+        psql -f out/load.sql
+
+    The column types are mapped from the type hints of the fields: `int` to `bigint`, `float` to `double precision`,
+    `Decimal` to `numeric`, `datetime` to `timestamp`, and `str`, `bytes`, `bool`, `date`, `time`, `timedelta` and
+    `UUID` to their PostgreSQL types, `Optional` or not. Fields with other types are written as text. Timestamps with a
+    time zone are written in UTC.
+
+    The binary format needs no quoting or escaping, and its values are read by PostgreSQL without parsing them. The
+    text format escapes backslashes, tabs and line breaks with a backslash, and writes `None` as `\\N`. Rows are encoded
+    and written `chunk_size` at a time.
+
+    Args:
+        directory (str | Path): The directory to write the files to, created if it doesn't exist.
+        binary (bool, optional): Whether to write the binary format rather than the text format. Defaults to True.
+        chunk_size (int, optional): The number of rows encoded before they're written. Defaults to 10000.
+    """
+
+    def __init__(self, directory: str | Path, binary: bool = True, chunk_size: int = 10_000):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.binary = binary
+        self.chunk_size = chunk_size
+        self._files: dict[str, Any] = {}
+        self._encoders: dict[str, list[Callable[[Any], Any]]] = {}
+        self._load = None
+
+    @staticmethod
+    def column_types(model: type[dataclass]) -> dict[str, str]:
+        """
+        Get the PostgreSQL column type of each field of a model.
+
+        Args:
+            model (type[dataclass]): The model.
+
+        Returns:
+            dict[str, str]: The column type of each field, in the order they're written in.
+        """
+        annotations = analyse_model(model)[0]
+        return {
+            c: _COLUMN_TYPES.get(_column_type(annotations[c]["type"]), _OTHER)[0]
+            for c in PostgresCopySink.columns(model)
+        }
+
+    def _open(self, model: type[dataclass]) -> None:
+        """
+        Open the file of a model and add its table to `load.sql`.
+        """
+        name = model.__name__
+        path = self.directory / f"{name}.{'copy' if self.binary else 'tsv'}"
+        annotations = analyse_model(model)[0]
+        mapped = [_COLUMN_TYPES.get(_column_type(annotations[c]["type"]), _OTHER) for c in self.columns(model)]
+        self._encoders[name] = [t[1] if self.binary else t[2] for t in mapped]
+        if self.binary:
+            self._files[name] = open(path, "wb")
+            self._files[name].write(_HEADER)
+        else:
+            self._files[name] = open(path, "w", encoding="utf-8", newline="\n")
+
+        if self._load is None:
+            self._load = open(self.directory / "load.sql", "w", encoding="utf-8")
+        columns = [f"{_quote(c)} {t}" for c, t in self.column_types(model).items()]
+        self._load.write(f"CREATE TABLE IF NOT EXISTS {_quote(name)} ({', '.join(columns)});\n")
+        copy_format = "binary" if self.binary else "text"
+        # `\copy` reads the file relative to where psql runs, so the path is written as it was given.
+        quoted_path = path.as_posix().replace("'", "''")
+        self._load.write(f"\\copy {_quote(name)} FROM '{quoted_path}' WITH (FORMAT {copy_format})\n")
+
+        return None
+
+    def _encode_binary(self, model: type[dataclass], rows: list[dataclass]) -> bytes:
+        columns, encoders = self.columns(model), self._encoders[model.__name__]
+        field_count = _FIELD_COUNT.pack(len(columns))
+        pairs = list(zip(columns, encoders))
+        parts = []
+        for row in rows:
+            parts.append(field_count)
+            for column, encode in pairs:
+                value = getattr(row, column)
+                parts.append(_NULL if value is None else encode(value))
+        return b"".join(parts)
+
+    def _encode_text(self, model: type[dataclass], rows: list[dataclass]) -> str:
+        pairs = list(zip(self.columns(model), self._encoders[model.__name__]))
+        lines = []
+        for row in rows:
+            values = [(getattr(row, column), encode) for column, encode in pairs]
+            lines.append("\t".join("\\N" if v is None else encode(v) for v, encode in values))
+        return "\n".join(lines) + "\n"
+
+    def write(self, model: type[dataclass], rows: Iterable[dataclass]) -> None:
+        """
+        See `Sink.write`.
+        """
+        if model.__name__ not in self._files:
+            self._open(model)
+
+        file = self._files[model.__name__]
+        encode = self._encode_binary if self.binary else self._encode_text
+        chunk: list[dataclass] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                file.write(encode(model, chunk))
+                chunk.clear()
+        if chunk:
+            file.write(encode(model, chunk))
+
+        return None
+
+    def close(self) -> None:
+        """
+        See `Sink.close`. The binary files get their trailer.
+        """
+        for file in self._files.values():
+            if self.binary:
+                file.write(_TRAILER)
+            file.close()
+        self._files.clear()
+        if self._load is not None:
+            self._load.close()
+            self._load = None
+
+        return None
@@ -0,0 +1,75 @@
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+
+from fake_schema_generator.functions import analyse_model
+
+from .Sink import Sink
+
+# The SQLite column type of each Python type, other types get no type and are written as text.
+_COLUMN_TYPES: dict[type, str] = {int: "INTEGER", bool: "INTEGER", float: "REAL", str: "TEXT", bytes: "BLOB"}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteSink(Sink):
+    """
+    Writes the rows of each model to a table named after the model in an SQLite database, with a column per field.
+    The table is created if it doesn't exist. Each call to `write` is committed in one transaction. Dates and times are
+    written in ISO 8601, and values SQLite can't hold as strings.
+
+    Args:
+        path (str | Path): The path of the database.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._inserts: dict[str, str] = {}
+
+    def _create_table(self, model: type[dataclass]) -> str:
+        """
+        Create the table of a model.
+
+        Returns:
+            str: The statement that inserts a row into it.
+        """
+        annotations = analyse_model(model)[0]
+        columns = [f"{_quote(c)} {_COLUMN_TYPES.get(annotations[c]['type'], '')}".rstrip() for c in self.columns(model)]
+        table = _quote(model.__name__)
+        self._connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+
+        return f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})"
+
+    def _sql_value(self, value: Any) -> Any:
+        value = self.plain_value(value)
+        if value is None or isinstance(value, (int, float, str, bytes)):
+            return value
+        return str(value)
+
+    def write(self, model: type[dataclass], rows: Iterable[dataclass]) -> None:
+        """
+        See `Sink.write`.
+        """
+        if model.__name__ not in self._inserts:
+            self._inserts[model.__name__] = self._create_table(model)
+
+        columns, value = self.columns(model), self._sql_value
+        with self._connection:
+            self._connection.executemany(
+                self._inserts[model.__name__], ([value(getattr(row, c)) for c in columns] for row in rows)
+            )
+
+        return None
+
+    def close(self) -> None:
+        """
+        See `Sink.close`.
+        """
+        self._connection.close()
+
+        return None
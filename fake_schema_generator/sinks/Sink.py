@@ -0,0 +1,64 @@
+import datetime
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from dataclasses import fields as dataclass_fields
+from typing import Any
+from typing import Iterable
+
+
+class Sink(ABC):
+    """
+    Writes generated rows somewhere as they're generated, e.g. to a file per model. Rows of a model can be written in
+    any number of calls to `write`, in the order they were generated.
+    """
+
+    @abstractmethod
+    def write(self, model: type[dataclass], rows: Iterable[dataclass]) -> None:
+        """
+        Write rows of a model.
+
+        Args:
+            model (type[dataclass]): The model the rows belong to.
+            rows (Iterable[dataclass]): The rows.
+
+        Returns:
+            None
+        """
+
+    @staticmethod
+    def columns(model: type[dataclass]) -> list[str]:
+        """
+        Get the names of the fields of a model, in the order they're written in.
+
+        Args:
+            model (type[dataclass]): The model.
+
+        Returns:
+            list[str]: The names of the fields.
+        """
+        return [f.name for f in dataclass_fields(model)]
+
+    @staticmethod
+    def plain_value(value: Any) -> Any:
+        """
+        Convert dates and times to ISO 8601 strings, which every format can hold. Other values are returned as they are.
+
+        Args:
+            value (Any): The value.
+
+        Returns:
+            Any: The value to write.
+        """
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        return value
+
+    def close(self) -> None:
+        """
+        Flush and close anything the sink has open.
+
+        Returns:
+            None
+        """
+        return None
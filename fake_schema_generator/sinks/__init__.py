@@ -0,0 +1,5 @@
+from .CSVSink import CSVSink
+from .NDJSONSink import NDJSONSink
+from .PostgresCopySink import PostgresCopySink
+from .Sink import Sink
+from .SQLiteSink import SQLiteSink
@@ -0,0 +1,38 @@
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any
+from typing import Iterator
+
+
+class ChainedRows(Sequence):
+    """
+    The rows of several sequences one after the other, read from them as they're iterated or indexed instead of being
+    copied into a list, so a table in an SQLite database or spilled to disk is streamed rather than loaded in full.
+
+    Args:
+        *parts (Sequence[Any]): The sequences, in order.
+    """
+
+    def __init__(self, *parts: Sequence[Any]):
+        self.parts = parts
+
+    def __repr__(self):
+        return f"ChainedRows({len(self)} rows)"
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self.parts)
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self.parts)
+
+    def __getitem__(self, position: int | slice) -> Any:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if position >= 0:
+            for part in self.parts:
+                if position < len(part):
+                    return part[position]
+                position -= len(part)
+        raise IndexError("ChainedRows index out of range")
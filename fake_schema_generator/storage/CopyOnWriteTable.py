@@ -0,0 +1,156 @@
+from copy import copy
+from dataclasses import dataclass
+from operator import attrgetter
+from random import Random
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+
+from ..fake_types.SortedIndex import SortedIndex
+from .TableStorage import TableStorage
+
+
+class _FrozenRows(Sequence):
+    """
+    The rows of a `CopyOnWriteTable` without copying them, see `CopyOnWriteTable.read`.
+    """
+
+    def __init__(self, table: "CopyOnWriteTable"):
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, position: int | slice) -> Any:
+        if isinstance(position, slice):
+            return [self.table._read(p) for p in range(len(self))[position]]
+        return self.table._read(range(len(self))[position])
+
+    def __iter__(self) -> Iterator[dataclass]:
+        copies = self.table._copies
+        if len(copies) == 0:
+            yield from self.table._frozen
+        else:
+            for position, row in enumerate(self.table._frozen):
+                yield copies.get(position, row)
+        yield from self.table._rows
+
+
+class CopyOnWriteTable(TableStorage):
+    """
+    A table that starts out with the rows of a frozen table, e.g. a table of a `GeneratorSnapshot`, without copying
+    them. A frozen row is copied the first time it's handed out, by its position, by iterating over the table or by
+    `sample`, and `set_column` copies the rows whose value it changes, so the frozen table stays as it is whatever is
+    done with the rows. Appended rows are kept apart from the frozen ones.
+
+    Reading the rows without handing them out doesn't copy them: `value`, `columns`, `read` and the indexes the table
+    builds read the frozen rows, or their copies once they're copied. Indexes shared with the frozen table (see
+    `SortedIndex.fork`) return the frozen rows, so references that look rows up in an index see them as they were
+    frozen.
+
+    Args:
+        frozen (Sequence[dataclass]): The frozen rows, which must never change.
+    """
+
+    def __init__(self, frozen: Sequence[dataclass]):
+        self._frozen = frozen
+        self._copies: dict[int, dataclass] = {}
+        self._rows: list[dataclass] = []
+
+    def __repr__(self):
+        return f"CopyOnWriteTable(frozen={len(self._frozen)}, copied={len(self._copies)}, appended={len(self._rows)})"
+
+    def __len__(self) -> int:
+        return len(self._frozen) + len(self._rows)
+
+    def extend(self, rows: Iterable[dataclass]) -> None:
+        """
+        See `TableStorage.extend`.
+        """
+        self._rows.extend(rows)
+
+        return None
+
+    def _row(self, position: int) -> dataclass:
+        row = self._copies.get(position)
+        if row is None:
+            row = self._copies[position] = copy(self._frozen[position])
+        return row
+
+    def _read(self, position: int) -> dataclass:
+        """
+        Get the row at a position to read it, the frozen row unless it was copied.
+        """
+        if position >= len(self._frozen):
+            return self._rows[position - len(self._frozen)]
+        row = self._copies.get(position)
+        return self._frozen[position] if row is None else row
+
+    def __getitem__(self, position: int | slice) -> Any:
+        if isinstance(position, slice):
+            return [self[p] for p in range(len(self))[position]]
+
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("table index out of range")
+        if position >= len(self._frozen):
+            return self._rows[position - len(self._frozen)]
+        return self._row(position)
+
+    def __iter__(self) -> Iterator[dataclass]:
+        for position in range(len(self._frozen)):
+            yield self._row(position)
+        yield from self._rows
+
+    def read(self) -> Sequence[dataclass]:
+        """
+        See `TableStorage.read`. The frozen rows aren't copied, so they mustn't be changed.
+        """
+        return _FrozenRows(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, TableStorage)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self.read(), other.read() if isinstance(other, TableStorage) else other)
+            )
+        return NotImplemented
+
+    def value(self, position: int, field: str) -> Any:
+        """
+        See `TableStorage.value`.
+        """
+        return getattr(self._read(position), field)
+
+    def columns(self, fields: Iterable[str]) -> dict[str, list[Any]]:
+        """
+        See `TableStorage.columns`. The rows aren't copied.
+        """
+        rows = self.read()
+        return {field: list(map(attrgetter(field), rows)) for field in fields}
+
+    def build_index(self, fields: tuple[str, ...], range_field: Optional[str] = None) -> SortedIndex:
+        """
+        See `TableStorage.build_index`.
+        """
+        index = SortedIndex(fields, range_field)
+        index.extend(self.read())
+        return index
+
+    def set_column(self, field: str, values: list[Any]) -> None:
+        """
+        See `TableStorage.set_column`. Only the frozen rows whose value changes are copied.
+        """
+        values = iter(values)
+        for position, (row, value) in enumerate(zip(self._frozen, values)):
+            if position not in self._copies:
+                current = getattr(row, field)
+                if current is value or type(current) is type(value) and current == value:
+                    continue
+            setattr(self._row(position), field, value)
+        for row, value in zip(self._rows, values):
+            setattr(row, field, value)
+
+        return None
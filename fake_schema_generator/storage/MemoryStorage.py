@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+from .MemoryTable import MemoryTable
+from .Storage import Storage
+
+
+class MemoryStorage(Storage):
+    """
+    Holds every table in memory, in a `MemoryTable`. This is the default storage of `FakeSchemaGenerator`.
+    """
+
+    def table(self, model: type[dataclass]) -> MemoryTable:
+        """
+        See `Storage.table`.
+        """
+        return MemoryTable()
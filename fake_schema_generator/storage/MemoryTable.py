@@ -0,0 +1,36 @@
+from operator import attrgetter
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+from ..fake_types.SortedIndex import SortedIndex
+from .TableStorage import TableStorage
+
+
+class MemoryTable(list, TableStorage):
+    """
+    A table held in a Python list, indexed by `SortedIndex`es. It's a `list`, so it can be used as one.
+    """
+
+    def build_index(self, fields: tuple[str, ...], range_field: Optional[str] = None) -> SortedIndex:
+        """
+        See `TableStorage.build_index`.
+        """
+        index = SortedIndex(fields, range_field)
+        index.extend(self)
+        return index
+
+    def columns(self, fields: Iterable[str]) -> dict[str, list[Any]]:
+        """
+        See `TableStorage.columns`. The rows are already in memory, so each field is read in one go.
+        """
+        return {field: list(map(attrgetter(field), self)) for field in fields}
+
+    def set_column(self, field: str, values: list[Any]) -> None:
+        """
+        See `TableStorage.set_column`.
+        """
+        for row, value in zip(self, values):
+            setattr(row, field, value)
+
+        return None
@@ -0,0 +1,40 @@
+import sqlite3
+from dataclasses import dataclass
+
+from .SQLiteTable import SQLiteTable
+from .Storage import Storage
+
+
+class SQLiteStorage(Storage):
+    """
+    Holds every table in an SQLite database, in a `SQLiteTable`, so that tables don't have to fit in memory and
+    references are resolved through SQLite indexes.
+
+    Args:
+        path (str, optional): The database file. Tables with the same names as the models are replaced. Defaults to
+            `":memory:"`.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # The data can always be generated again, so don't wait for it to reach the disk.
+        self.connection.execute("PRAGMA synchronous = OFF")
+
+    def __repr__(self):
+        return f"SQLiteStorage(path={self.path!r})"
+
+    def table(self, model: type[dataclass]) -> SQLiteTable:
+        """
+        See `Storage.table`.
+        """
+        return SQLiteTable(self.connection, model)
+
+    def close(self) -> None:
+        """
+        See `Storage.close`.
+        """
+        self.connection.commit()
+        self.connection.close()
+
+        return None
@@ -0,0 +1,266 @@
+import datetime
+import operator
+import pickle
+import sqlite3
+from dataclasses import dataclass
+from random import Random
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from .TableStorage import TableStorage
+
+# How each range comparison of a source value with a row's value, `comparison(value, row_value)`, reads in SQL.
+_RANGE_OPERATORS: dict[Callable, str] = {operator.ge: "<=", operator.gt: "<", operator.le: ">=", operator.lt: ">"}
+_CHUNK_SIZE = 1000
+
+
+def _sql_value(value: Any) -> Any:
+    """
+    Convert a value to one that SQLite compares the way Python does.
+
+    Raises:
+        TypeError: If SQLite can't compare the value the way Python does.
+    """
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    if isinstance(value, (datetime.date, datetime.time)):
+        # ISO 8601 strings sort in the same order as the values they represent.
+        return value.isoformat()
+    raise TypeError(f"Values of type {type(value).__name__} can't be indexed in SQLite")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class _SQLiteIndex:
+    """
+    An index of a `SQLiteTable`, answering the queries of `SortedIndex` with SQL over the table's key columns.
+    """
+
+    def __init__(self, table: "SQLiteTable", fields: tuple[str, ...], range_field: Optional[str]):
+        self.table = table
+        self.fields = fields
+        self.range_field = range_field
+        self._length = len(table)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self):
+        return f"SQLiteIndex(table={self.table.name}, fields={self.fields}, range_field={self.range_field})"
+
+    def extend(self, rows: list[dataclass]) -> None:
+        # The table stores the key columns of appended rows, so this only checks that they could be stored.
+        for row in rows:
+            for f in (*self.fields, self.range_field):
+                if f is not None:
+                    _sql_value(getattr(row, f))
+        self._length += len(rows)
+
+        return None
+
+    def _where(self, key: tuple, comparison: Optional[Callable], value: Any) -> tuple[str, list[Any]]:
+        clauses = [f"{_quote('k_' + f)} IS ?" for f in self.fields]
+        params = [_sql_value(k) for k in key]
+        if comparison is not None and self.range_field is not None:
+            if comparison not in _RANGE_OPERATORS:
+                raise ValueError(f"Comparison {comparison} can't be answered by a SQLite index")
+            clauses.append(f"{_quote('k_' + self.range_field)} {_RANGE_OPERATORS[comparison]} ?")
+            params.append(_sql_value(value))
+        return " AND ".join(clauses) or "1", params
+
+    def first(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> Optional[Any]:
+        """
+        See `SortedIndex.first`.
+        """
+        where, params = self._where(key, comparison, value)
+        found = self.table.query(f"SELECT row FROM {{table}} WHERE {where} ORDER BY id LIMIT 1", params)
+        return found[0] if found else None
+
+    def count(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> int:
+        """
+        See `SortedIndex.count`.
+        """
+        where, params = self._where(key, comparison, value)
+        return self.table.connection.execute(
+            f"SELECT count(*) FROM {self.table.name} WHERE {where}", params
+        ).fetchone()[0]
+
+    def nth(self, key: tuple, comparison: Optional[Callable], value: Any, n: int) -> Any:
+        """
+        See `SortedIndex.nth`.
+        """
+        where, params = self._where(key, comparison, value)
+        order = f"{_quote('k_' + self.range_field)}, id" if self.range_field is not None else "id"
+        found = self.table.query(
+            f"SELECT row FROM {{table}} WHERE {where} ORDER BY {order} LIMIT 1 OFFSET ?", [*params, n]
+        )
+        if not found:
+            raise IndexError(n)
+        return found[0]
+
+    def rows(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> list[Any]:
+        """
+        See `SortedIndex.rows`.
+        """
+        where, params = self._where(key, comparison, value)
+        order = f"{_quote('k_' + self.range_field)}, id" if self.range_field is not None else "id"
+        return self.table.query(f"SELECT row FROM {{table}} WHERE {where} ORDER BY {order}", params)
+
+    def choice(
+        self, rng: Random, key: tuple, comparison: Optional[Callable] = None, value: Any = None
+    ) -> Optional[Any]:
+        """
+        See `SortedIndex.choice`.
+        """
+        count = self.count(key, comparison, value)
+        if count == 0:
+            return None
+        return self.nth(key, comparison, value, rng.randrange(count))
+
+
+class SQLiteTable(TableStorage):
+    """
+    A table held in an SQLite database. Each row is pickled into a row of an SQLite table, so models must be picklable,
+    and the fields that are indexed are also stored in key columns with an SQLite index on them. Reading a row unpickles
+    a new copy of it.
+
+    Args:
+        connection (sqlite3.Connection): The database to store the table in.
+        model (type[dataclass]): The model whose rows are stored. A table with the same name is replaced.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, model: type[dataclass]):
+        self.connection = connection
+        self.model = model
+        self.name = _quote(model.__name__)
+        self._key_fields: list[str] = []
+        self._length = 0
+        self._indexes = 0
+        connection.execute(f"DROP TABLE IF EXISTS {self.name}")
+        connection.execute(f"CREATE TABLE {self.name} (id INTEGER PRIMARY KEY, row BLOB NOT NULL)")
+        connection.commit()
+
+    def __repr__(self):
+        return f"SQLiteTable(model={self.model.__name__}, rows={self._length})"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def query(self, sql: str, params: list[Any]) -> list[dataclass]:
+        """
+        Run a query that selects the `row` column from `{table}` and unpickle the rows.
+        """
+        cursor = self.connection.execute(sql.format(table=self.name), params)
+        return [pickle.loads(row) for (row,) in cursor.fetchall()]
+
+    def _keys(self, row: dataclass) -> list[Any]:
+        keys = []
+        for f in self._key_fields:
+            try:
+                keys.append(_sql_value(getattr(row, f)))
+            except TypeError:
+                # The indexes on the field are dropped when they're extended with this row.
+                keys.append(None)
+        return keys
+
+    def extend(self, rows: Iterable[dataclass]) -> None:
+        """
+        See `TableStorage.extend`.
+        """
+        columns = ", ".join(["row", *(_quote("k_" + f) for f in self._key_fields)])
+        placeholders = ", ".join("?" * (len(self._key_fields) + 1))
+        data = [(pickle.dumps(row, pickle.HIGHEST_PROTOCOL), *self._keys(row)) for row in rows]
+        self.connection.executemany(f"INSERT INTO {self.name} ({columns}) VALUES ({placeholders})", data)
+        self.connection.commit()
+        self._length += len(data)
+
+        return None
+
+    def __getitem__(self, position: int | slice) -> Any:
+        if isinstance(position, slice):
+            positions = range(self._length)[position]
+            if positions.step == 1:
+                return self.query(
+                    "SELECT row FROM {table} WHERE id >= ? AND id < ? ORDER BY id",
+                    [positions.start + 1, positions.stop + 1],
+                )
+            return [self[p] for p in positions]
+
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("table index out of range")
+        return self.query("SELECT row FROM {table} WHERE id = ?", [position + 1])[0]
+
+    def _chunks(self) -> Iterator[list[tuple[int, bytes]]]:
+        last = 0
+        while True:
+            chunk = self.connection.execute(
+                f"SELECT id, row FROM {self.name} WHERE id > ? ORDER BY id LIMIT ?", [last, _CHUNK_SIZE]
+            ).fetchall()
+            if not chunk:
+                return
+            yield chunk
+            last = chunk[-1][0]
+
+    def __iter__(self) -> Iterator[dataclass]:
+        for chunk in self._chunks():
+            for _, row in chunk:
+                yield pickle.loads(row)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, TableStorage)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def build_index(self, fields: tuple[str, ...], range_field: Optional[str] = None) -> _SQLiteIndex:
+        """
+        See `TableStorage.build_index`. The fields are added as key columns if they aren't already.
+        """
+        key_fields = [f for f in (*fields, range_field) if f is not None]
+        new_fields = [f for f in dict.fromkeys(key_fields) if f not in self._key_fields]
+        for f in new_fields:
+            self.connection.execute(f"ALTER TABLE {self.name} ADD COLUMN {_quote('k_' + f)}")
+        self._key_fields += new_fields
+        if new_fields:
+            assignments = ", ".join(f"{_quote('k_' + f)} = ?" for f in new_fields)
+            for chunk in self._chunks():
+                rows = [(i, pickle.loads(row)) for i, row in chunk]
+                self.connection.executemany(
+                    f"UPDATE {self.name} SET {assignments} WHERE id = ?",
+                    [(*(_sql_value(getattr(row, f)) for f in new_fields), i) for i, row in rows],
+                )
+
+        self._indexes += 1
+        index_name = _quote(f"{self.model.__name__}_index_{self._indexes}")
+        columns = ", ".join([*(_quote("k_" + f) for f in key_fields), "id"])
+        self.connection.execute(f"CREATE INDEX {index_name} ON {self.name} ({columns})")
+        self.connection.commit()
+
+        return _SQLiteIndex(self, fields, range_field)
+
+    def set_column(self, field: str, values: list[Any]) -> None:
+        """
+        See `TableStorage.set_column`.
+        """
+        key = field in self._key_fields
+        assignments = "row = ?" + (f", {_quote('k_' + field)} = ?" if key else "")
+        values = iter(values)
+        for chunk in self._chunks():
+            updates = []
+            for i, data in chunk:
+                row = pickle.loads(data)
+                setattr(row, field, next(values))
+                update = [pickle.dumps(row, pickle.HIGHEST_PROTOCOL)]
+                if key:
+                    update.append(_sql_value(getattr(row, field)))
+                updates.append((*update, i))
+            self.connection.executemany(f"UPDATE {self.name} SET {assignments} WHERE id = ?", updates)
+        self.connection.commit()
+
+        return None
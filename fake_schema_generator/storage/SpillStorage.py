@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .SpillTable import SpillTable
+from .Storage import Storage
+
+
+class SpillStorage(Storage):
+    """
+    Holds every table in a `SpillTable`, in memory until the table grows past `memory_budget` bytes, after which its
+    oldest rows are moved to a temporary file. The keys and positions of the rows that other models reference stay in
+    memory, so generation slows down as tables grow instead of running out of memory.
+
+    Args:
+        memory_budget (int): The number of bytes of rows each table keeps in memory.
+        directory (Optional[str], optional): Where to create the temporary files. Defaults to the system's temporary
+            directory.
+        chunk_size (int, optional): The number of rows spilled at a time. Defaults to 1000.
+        cached_chunks (int, optional): The number of spilled chunks each table keeps in memory once read. Defaults to
+            8.
+    """
+
+    def __init__(
+        self, memory_budget: int, directory: Optional[str] = None, chunk_size: int = 1000, cached_chunks: int = 8
+    ):
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.cached_chunks = cached_chunks
+        self._tables: list[SpillTable] = []
+
+    def __repr__(self):
+        return f"SpillStorage(memory_budget={self.memory_budget}, directory={self.directory!r})"
+
+    def table(self, model: type[dataclass]) -> SpillTable:
+        """
+        See `Storage.table`.
+        """
+        table = SpillTable(model, self.memory_budget, self.directory, self.chunk_size, self.cached_chunks)
+        self._tables.append(table)
+        return table
+
+    def close(self) -> None:
+        """
+        See `Storage.close`. The temporary files are deleted.
+        """
+        for table in self._tables:
+            table.close()
+
+        return None
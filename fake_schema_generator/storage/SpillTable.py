@@ -0,0 +1,343 @@
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from dataclasses import fields as dataclass_fields
+from operator import attrgetter
+from random import Random
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from ..fake_types.SortedIndex import SortedIndex
+from .TableStorage import TableStorage
+
+
+class _SpillIndex:
+    """
+    A `SortedIndex` of a `SpillTable` that keeps the positions of the rows instead of the rows, so that indexing a row
+    doesn't keep it in memory. Rows found by a query are read from the table.
+    """
+
+    def __init__(self, table: "SpillTable", fields: tuple[str, ...], range_field: Optional[str]):
+        self.table = table
+        self._index = SortedIndex(fields, range_field)
+        for position, row in enumerate(table):
+            self._index.add(row, position)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return self._index.fields
+
+    @property
+    def range_field(self) -> Optional[str]:
+        return self._index.range_field
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self):
+        return f"SpillIndex(fields={self.fields}, range_field={self.range_field}, rows={len(self)})"
+
+    def extend(self, rows: list[dataclass]) -> None:
+        # Rows are indexed in the order they're appended to the table, so their positions follow on.
+        start = len(self._index)
+        for position, row in enumerate(rows, start):
+            self._index.add(row, position)
+
+        return None
+
+    def first(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> Optional[Any]:
+        """
+        See `SortedIndex.first`.
+        """
+        position = self._index.first(key, comparison, value)
+        return None if position is None else self.table[position]
+
+    def count(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> int:
+        """
+        See `SortedIndex.count`.
+        """
+        return self._index.count(key, comparison, value)
+
+    def nth(self, key: tuple, comparison: Optional[Callable], value: Any, n: int) -> Any:
+        """
+        See `SortedIndex.nth`.
+        """
+        return self.table[self._index.nth(key, comparison, value, n)]
+
+    def rows(self, key: tuple, comparison: Optional[Callable] = None, value: Any = None) -> list[Any]:
+        """
+        See `SortedIndex.rows`.
+        """
+        return [self.table[position] for position in self._index.rows(key, comparison, value)]
+
+    def choice(
+        self, rng: Random, key: tuple, comparison: Optional[Callable] = None, value: Any = None
+    ) -> Optional[Any]:
+        """
+        See `SortedIndex.choice`.
+        """
+        position = self._index.choice(rng, key, comparison, value)
+        return None if position is None else self.table[position]
+
+
+class SpillTable(TableStorage):
+    """
+    A table held in memory until its rows take up more than `memory_budget` bytes, after which its oldest rows are
+    moved to a temporary file, a chunk of `chunk_size` rows at a time, until the rows left in memory fit the budget
+    again. The newest chunk always stays in memory. A spilled chunk is stored as a pickled list of the values of the
+    fields of its rows, without the field names, and its rows are rebuilt without calling `__init__` when it's read.
+    The last `cached_chunks` chunks read are kept in memory.
+
+    The indexes of the table keep the key values and positions of every row in memory, so references are looked up
+    without reading the file, and only the rows they find are read from it. The columns passed to `keep_column` are
+    kept in memory too, so that random references to them never read the file. The size of a row is estimated from
+    the first rows appended, and the kept columns and indexes don't count towards the budget.
+
+    Args:
+        model (type[dataclass]): The model whose rows are stored.
+        memory_budget (int): The number of bytes of rows to keep in memory.
+        directory (Optional[str], optional): Where to create the temporary file. Defaults to the system's temporary
+            directory.
+        chunk_size (int, optional): The number of rows spilled at a time. Defaults to 1000.
+        cached_chunks (int, optional): The number of spilled chunks to keep in memory once read. Defaults to 8.
+    """
+
+    def __init__(
+        self,
+        model: type[dataclass],
+        memory_budget: int,
+        directory: Optional[str] = None,
+        chunk_size: int = 1000,
+        cached_chunks: int = 8,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.model = model
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.cached_chunks = cached_chunks
+        self._names = [f.name for f in dataclass_fields(model)]
+        self._has_dict = hasattr(model.__new__(model), "__dict__")
+        # `attrgetter` returns a bare value rather than a tuple for a single name.
+        self._values: Callable[[Any], tuple] = (
+            attrgetter(*self._names)
+            if len(self._names) > 1
+            else lambda row: tuple(getattr(row, n) for n in self._names)
+        )
+        # The rows of each chunk, or None once the chunk is spilled. Chunks are spilled oldest first.
+        self._chunks: list[Optional[list[dataclass]]] = []
+        self._spilled: dict[int, tuple[int, int]] = {}
+        self._cache: OrderedDict[int, list[dataclass]] = OrderedDict()
+        self._columns: dict[str, list[Any]] = {}
+        self._length = 0
+        self._rows_in_memory = 0
+        self._row_size: Optional[int] = None
+        self._file = None
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"SpillTable(model={self.model.__name__}, rows={self._length}, spilled_chunks={len(self._spilled)})"
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def spilled_rows(self) -> int:
+        """
+        The number of rows that are only kept in the file.
+        """
+        return self._length - self._rows_in_memory
+
+    def extend(self, rows: Iterable[dataclass]) -> None:
+        """
+        See `TableStorage.extend`.
+        """
+        rows = list(rows)
+        if len(rows) == 0:
+            return None
+
+        start = 0
+        while start < len(rows):
+            if len(self._chunks) == 0 or len(self._chunks[-1]) >= self.chunk_size:
+                self._chunks.append([])
+            chunk = self._chunks[-1]
+            taken = rows[start : start + self.chunk_size - len(chunk)]
+            chunk.extend(taken)
+            start += len(taken)
+        for field, column in self._columns.items():
+            column.extend(getattr(row, field) for row in rows)
+        self._length += len(rows)
+        self._rows_in_memory += len(rows)
+        self._spill()
+
+        return None
+
+    def _estimate_row_size(self, rows: list[dataclass]) -> int:
+        """
+        Estimate the number of bytes a row takes up in memory from a sample of rows: the row, its `__dict__` and its
+        values, plus the pointer to it in its chunk.
+        """
+        sample = rows[:100]
+        size = 0
+        for row in sample:
+            size += sys.getsizeof(row) + sys.getsizeof(getattr(row, "__dict__", None))
+            size += sum(sys.getsizeof(v) for v in self._values(row))
+        return size // len(sample) + 8
+
+    def _spill(self) -> None:
+        """
+        Move the oldest chunks in memory to the file until the rows left in memory fit the budget.
+        """
+        if self._row_size is None:
+            self._row_size = self._estimate_row_size(self._chunks[0])
+
+        oldest = len(self._spilled)
+        while self._rows_in_memory * self._row_size > self.memory_budget and oldest < len(self._chunks) - 1:
+            chunk = self._chunks[oldest]
+            self._write(oldest, chunk)
+            self._chunks[oldest] = None
+            self._rows_in_memory -= len(chunk)
+            oldest += 1
+
+        return None
+
+    def _write(self, chunk_index: int, rows: list[dataclass]) -> None:
+        data = pickle.dumps([self._values(row) for row in rows], pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(dir=self.directory)
+            # Rewritten chunks are appended, the space of the old copy isn't reused.
+            offset = self._file.seek(0, 2)
+            self._file.write(data)
+            self._spilled[chunk_index] = (offset, len(data))
+
+        return None
+
+    def _rows(self, data: list[tuple]) -> list[dataclass]:
+        """
+        Rebuild rows from the values of their fields, the way `pickle` does, without calling `__init__`.
+        """
+        model, names, rows = self.model, self._names, []
+        if self._has_dict:
+            for values in data:
+                row = model.__new__(model)
+                row.__dict__.update(zip(names, values))
+                rows.append(row)
+            return rows
+
+        for values in data:
+            row = model.__new__(model)
+            for name, value in zip(names, values):
+                object.__setattr__(row, name, value)
+            rows.append(row)
+        return rows
+
+    def _read(self, chunk_index: int) -> list[dataclass]:
+        """
+        Read the rows of a spilled chunk, from the cache if it was read recently.
+        """
+        with self._lock:
+            rows = self._cache.get(chunk_index)
+            if rows is not None:
+                self._cache.move_to_end(chunk_index)
+                return rows
+
+            offset, length = self._spilled[chunk_index]
+            self._file.seek(offset)
+            rows = self._rows(pickle.loads(self._file.read(length)))
+            self._cache[chunk_index] = rows
+            if len(self._cache) > self.cached_chunks:
+                self._cache.popitem(last=False)
+
+        return rows
+
+    def _chunk(self, chunk_index: int) -> list[dataclass]:
+        chunk = self._chunks[chunk_index]
+        return chunk if chunk is not None else self._read(chunk_index)
+
+    def __getitem__(self, position: int | slice) -> Any:
+        if isinstance(position, slice):
+            return [self[p] for p in range(self._length)[position]]
+
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("table index out of range")
+        return self._chunk(position // self.chunk_size)[position % self.chunk_size]
+
+    def __iter__(self) -> Iterator[dataclass]:
+        for chunk_index in range(len(self._chunks)):
+            yield from self._chunk(chunk_index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, TableStorage)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def value(self, position: int, field: str) -> Any:
+        """
+        See `TableStorage.value`.
+        """
+        column = self._columns.get(field)
+        if column is not None:
+            return column[position]
+        return getattr(self[position], field)
+
+    def columns(self, fields: Iterable[str]) -> dict[str, list[Any]]:
+        """
+        See `TableStorage.columns`. The columns kept in memory are copied, and the others are read a chunk at a time.
+        """
+        fields = list(fields)
+        columns = super().columns([f for f in fields if f not in self._columns])
+        return {f: self._columns[f].copy() if f in self._columns else columns[f] for f in fields}
+
+    def keep_column(self, field: str) -> None:
+        """
+        See `TableStorage.keep_column`.
+        """
+        if field not in self._columns:
+            self._columns[field] = [getattr(row, field) for row in self]
+
+        return None
+
+    def build_index(self, fields: tuple[str, ...], range_field: Optional[str] = None) -> _SpillIndex:
+        """
+        See `TableStorage.build_index`.
+        """
+        return _SpillIndex(self, fields, range_field)
+
+    def set_column(self, field: str, values: list[Any]) -> None:
+        """
+        See `TableStorage.set_column`. Spilled chunks are read, updated and written again.
+        """
+        values = list(values)
+        if field in self._columns:
+            self._columns[field] = values.copy()
+        values = iter(values)
+        for chunk_index in range(len(self._chunks)):
+            rows = self._chunk(chunk_index)
+            for row in rows:
+                setattr(row, field, next(values))
+            if chunk_index in self._spilled:
+                self._write(chunk_index, rows)
+
+        return None
+
+    def close(self) -> None:
+        """
+        See `TableStorage.close`. The file is deleted.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+        return None
@@ -0,0 +1,32 @@
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+
+from .TableStorage import TableStorage
+
+
+class Storage(ABC):
+    """
+    Creates the `TableStorage` that holds the rows of each model registered with a `FakeSchemaGenerator`.
+    """
+
+    @abstractmethod
+    def table(self, model: type[dataclass]) -> TableStorage:
+        """
+        Create the table for a model.
+
+        Args:
+            model (type[dataclass]): The model.
+
+        Returns:
+            TableStorage: An empty table.
+        """
+
+    def close(self) -> None:
+        """
+        Release anything the storage holds on to.
+
+        Returns:
+            None
+        """
+        return None
@@ -0,0 +1,163 @@
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from itertools import batched
+from operator import attrgetter
+from random import Random
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+
+from .ChainedRows import ChainedRows
+
+
+class TableStorage(ABC):
+    """
+    Stores the generated rows of one model, in the order they were generated. `FakeSchemaGenerator` only appends rows,
+    reads them by position or in order, and looks them up through indexes, so any store that can do that can hold a
+    table. `FakeSchemaGenerator.data` returns the tables as they are.
+
+    An index is any object with the query methods of `SortedIndex`: `first`, `count`, `nth`, `rows` and `choice`, plus
+    `extend`, called with every row appended to the table after the index was created, and `__len__`, the number of
+    rows indexed.
+    """
+
+    @abstractmethod
+    def extend(self, rows: Iterable[dataclass]) -> None:
+        """
+        Append rows to the table.
+
+        Args:
+            rows (Iterable[dataclass]): The rows to append.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __getitem__(self, position: int | slice) -> Any:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[dataclass]:
+        pass
+
+    @abstractmethod
+    def build_index(self, fields: tuple[str, ...], range_field: Optional[str] = None) -> Any:
+        """
+        Index the rows on the values of `fields`, compared for equality, and optionally `range_field`, compared with
+        `operator.lt`, `operator.le`, `operator.gt` or `operator.ge`, the way `SortedIndex` does.
+
+        Args:
+            fields (tuple[str, ...]): The fields compared for equality.
+            range_field (Optional[str], optional): The field compared with a range comparison. Defaults to None.
+
+        Returns:
+            Any: The index.
+
+        Raises:
+            TypeError: If the values of the rows can't be indexed.
+        """
+
+    @abstractmethod
+    def set_column(self, field: str, values: list[Any]) -> None:
+        """
+        Set a field of every row, in order.
+
+        Args:
+            field (str): The field to set.
+            values (list[Any]): The value of the field for each row.
+
+        Returns:
+            None
+        """
+
+    def value(self, position: int, field: str) -> Any:
+        """
+        Get a field of the row at a position.
+
+        Args:
+            position (int): The position of the row.
+            field (str): The field.
+
+        Returns:
+            Any: The value of the field.
+        """
+        return getattr(self[position], field)
+
+    def columns(self, fields: Iterable[str]) -> dict[str, list[Any]]:
+        """
+        Get the values of fields of every row, in order, as a list per field. The rows are read once, a few thousand at
+        a time, and each field of a few thousand rows is read in one go.
+
+        Args:
+            fields (Iterable[str]): The fields.
+
+        Returns:
+            dict[str, list[Any]]: The values of each field.
+        """
+        columns = {field: [] for field in fields}
+        if len(columns) == 0:
+            return columns
+        getters = [(columns[field].extend, attrgetter(field)) for field in columns]
+        for rows in batched(self, 4096):
+            for extend, getter in getters:
+                extend(map(getter, rows))
+        return columns
+
+    def read(self) -> Sequence[dataclass]:
+        """
+        Get the rows to read them without changing them, e.g. to index or aggregate them. Returns the table itself by
+        default, a table that copies its rows before handing them out returns them without copying.
+
+        Returns:
+            Sequence[dataclass]: The rows, in order.
+        """
+        return self
+
+    def keep_column(self, field: str) -> None:
+        """
+        Tell the table that `value` is going to be called with `field`, so that a table that doesn't keep its rows in
+        memory can keep the field's values in memory apart from them. Does nothing by default.
+
+        Args:
+            field (str): The field.
+
+        Returns:
+            None
+        """
+        return None
+
+    def sample(self, rng: Random, k: int = 1) -> list[dataclass]:
+        """
+        Pick `k` random rows, with replacement.
+
+        Args:
+            rng (Random): The random number generator to pick with.
+            k (int, optional): The number of rows to pick. Defaults to 1.
+
+        Returns:
+            list[dataclass]: The rows.
+        """
+        return [self[rng.randrange(len(self))] for _ in range(k)]
+
+    def __add__(self, other: Sequence[dataclass]) -> ChainedRows:
+        return ChainedRows(self, other)
+
+    def __radd__(self, other: Sequence[dataclass]) -> ChainedRows:
+        return ChainedRows(other, self)
+
+    def close(self) -> None:
+        """
+        Release anything the table holds on to.
+
+        Returns:
+            None
+        """
+        return None
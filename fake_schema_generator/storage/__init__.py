@@ -0,0 +1,10 @@
+from .ChainedRows import ChainedRows
+from .CopyOnWriteTable import CopyOnWriteTable
+from .MemoryStorage import MemoryStorage
+from .MemoryTable import MemoryTable
+from .SpillStorage import SpillStorage
+from .SpillTable import SpillTable
+from .SQLiteStorage import SQLiteStorage
+from .SQLiteTable import SQLiteTable
+from .Storage import Storage
+from .TableStorage import TableStorage
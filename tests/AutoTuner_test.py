@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+from fake_schema_generator import AutoTuner
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import GenerationController
+
+
+@dataclass
+class Author:
+    id: Annotated[int, FakeType("sequential_number", namespace="author")]
+    name: Annotated[str, FakeType("name")]
+
+
+@dataclass
+class Book:
+    id: Annotated[int, FakeType("sequential_number", namespace="book")]
+    author_id: Annotated[int, FakeType("reference", model="Author", field="id")]
+    blurb: Annotated[str, FakeType("text", max_nb_chars=400)]
+
+
+@pytest.fixture
+def schema_generator():
+    sg = FakeSchemaGenerator()
+    sg.register(Book)
+    return sg
+
+
+class TestAutoTuner:
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            AutoTuner(batch_seconds=0)
+        with pytest.raises(ValueError):
+            AutoTuner(calibration_rows=0)
+        with pytest.raises(ValueError):
+            AutoTuner(min_batch_size=100, max_batch_size=10)
+
+    def test_batch_size_from_throughput(self):
+        tuner = AutoTuner(batch_seconds=0.1, min_batch_size=5, max_batch_size=1000)
+        assert tuner.batch_size("Book") == tuner.calibration_rows
+
+        tuner.observe("Book", 50, 0.5)
+        tuner.observe("Author", 50, 0.0001)
+        assert tuner.batch_sizes == {"Book": 10, "Author": 1000}
+        assert [(d.reason, d.model, d.batch_size) for d in tuner.decisions] == [
+            ("calibration", "Book", 10),
+            ("calibration", "Author", 1000),
+        ]
+
+    def test_batch_size_capped_by_memory(self, schema_generator):
+        schema_generator.generate(count=20)
+        tuner = AutoTuner(max_batch_memory=10_000, min_batch_size=1)
+        tuner.start(schema_generator)
+        tuner.observe("Book", 20, 0.0001)
+
+        row_size = tuner._row_sizes["Book"]
+        assert row_size > 400
+        assert tuner.batch_sizes["Book"] == 10_000 // row_size
+
+    def test_workers(self):
+        tuner = AutoTuner()
+        tuner.start(max_workers=8)
+        tuner._revise_workers(100)
+        assert tuner.workers == 2
+        tuner._revise_workers(150)
+        assert tuner.workers == 4
+        # No gain, so back to the best number of workers, where it settles.
+        tuner._revise_workers(150)
+        assert tuner.workers == 2
+        tuner._revise_workers(160)
+        assert tuner.workers == 2
+        # The throughput drifted, so more workers are tried again.
+        tuner._revise_workers(300)
+        assert tuner.workers == 4
+        assert [d.workers for d in tuner.decisions if d.reason == "workers"] == [2, 4, 2, 4]
+
+    def test_fewer_workers(self):
+        tuner = AutoTuner()
+        tuner.start(max_workers=8)
+        tuner.workers = 4
+        tuner._revise_workers(100)
+        tuner._revise_workers(90)
+        assert tuner.workers == 4
+        tuner._revise_workers(100)
+        assert tuner.workers == 2
+        tuner._revise_workers(150)
+        assert tuner.workers == 1
+
+    def test_controller(self, schema_generator):
+        tuner = AutoTuner(calibration_rows=20, retune_interval=0)
+        progress = GenerationController(rows={"Book": 500}, tuner=tuner).run(schema_generator)
+
+        assert progress.stop_reason == "completed"
+        assert len(schema_generator.data(Book)) == 500
+        assert len(schema_generator.data(Author)) >= 500
+        assert set(progress.batch_sizes) == {"Author", "Book"}
+        assert [d.model for d in progress.tuning[:2]] == ["Author", "Book"]
+        assert progress.tuning == tuner.decisions
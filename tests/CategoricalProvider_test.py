@@ -0,0 +1,92 @@
+from collections import Counter
+from dataclasses import dataclass
+from random import Random
+from typing import Annotated
+
+import pytest
+from faker import Faker
+
+from fake_schema_generator import AliasTable
+from fake_schema_generator import CategoricalProvider
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+
+STATUSES = {"Pending": 0.1, "Shipped": 0.15, "Delivered": 0.7, "Returned": 0.05}
+
+
+@pytest.fixture
+def faker():
+    fake = Faker()
+    fake.add_provider(CategoricalProvider)
+    fake.seed_instance(0)
+    return fake
+
+
+@dataclass
+class Shipment:
+    status: Annotated[str, FakeType("categorical", elements=STATUSES)]
+    carrier: Annotated[str, FakeType("categorical", elements=("DHL", "UPS", "FedEx"), weights=(0, 1, 3))]
+
+
+class TestAliasTable:
+    def test_invalid_weights(self):
+        with pytest.raises(ValueError):
+            AliasTable([])
+        with pytest.raises(ValueError):
+            AliasTable(["a", "b"], [1])
+        with pytest.raises(ValueError):
+            AliasTable(["a", "b"], [1, -1])
+        with pytest.raises(ValueError):
+            AliasTable(["a", "b"], [0, 0])
+
+    def test_distribution(self):
+        table = AliasTable(list(STATUSES), list(STATUSES.values()))
+        codes = table.codes(Random(0), 100_000)
+
+        assert codes.typecode == "B"
+        counts = Counter(codes)
+        for code, weight in enumerate(STATUSES.values()):
+            assert counts[code] / len(codes) == pytest.approx(weight, abs=0.01)
+
+    def test_codes_match_draws(self):
+        table = AliasTable(range(300), range(300))
+        rng = Random(1)
+        draws = [table.code(rng) for _ in range(50)]
+
+        assert table.typecode == "H"
+        assert list(table.codes(Random(1), 50)) == draws
+        assert 0 not in table.codes(Random(2), 10_000)
+
+
+class TestCategoricalProvider:
+    def test_categorical(self, faker):
+        assert faker.categorical(("a",)) == "a"
+        assert faker.categorical({"a": 0, "b": 1}) == "b"
+        assert faker.categorical(["a", "b"], weights=[1, 0]) == "a"
+        with pytest.raises(ValueError):
+            faker.categorical({"a": 1}, weights=[1])
+
+    def test_compiled_once(self, faker):
+        provider = faker.categorical.__self__
+        table = provider.alias_table(STATUSES)
+
+        assert provider.alias_table(dict(STATUSES)) is table
+        assert provider.alias_table(list(STATUSES), list(STATUSES.values())) is table
+        assert provider.alias_table(list(STATUSES)) is not table
+
+    def test_batch_matches_calls(self, faker):
+        faker.seed_instance(1)
+        values = [faker.categorical(STATUSES) for _ in range(100)]
+        faker.seed_instance(1)
+
+        assert faker.categorical.__self__.batch(STATUSES, [None] * 100) == values
+
+    def test_schema(self):
+        schema_generator = FakeSchemaGenerator()
+        schema_generator.register(Shipment)
+        schema_generator.generate(count=2000, batch_size=100)
+
+        shipments = list(schema_generator.data(Shipment))
+        assert Counter(s.status for s in shipments)["Delivered"] / len(shipments) == pytest.approx(0.7, abs=0.05)
+        assert {s.carrier for s in shipments} == {"UPS", "FedEx"}
+        assert all(p.batch_function is not None for p in schema_generator._plan)
@@ -0,0 +1,219 @@
+import json
+import operator
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+from fake_schema_generator import ChangeStream
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import SchemaCondition
+from fake_schema_generator import ValueOf
+from fake_schema_generator import typed_product
+from fake_schema_generator import typed_sum
+
+
+@pytest.fixture
+def schema_generator():
+    sg = FakeSchemaGenerator()
+    sg._fake.seed_instance(0)
+    sg.register(Shipment)
+    sg.register(Payment)
+    sg.generate(200, batch_size=50)
+    return sg
+
+
+@dataclass
+class Order:
+    id: Annotated[int, FakeType("sequential_number", namespace="order")]
+    status: Annotated[str, FakeType("random_element", elements=("Pending", "Shipped", "Delivered"))]
+    total: Annotated[
+        float,
+        FakeType(
+            "derived",
+            model="Line",
+            field="order_id",
+            value=ValueOf("id"),
+            fields=["quantity", "price"],
+            row_op=typed_product,
+            col_op=typed_sum,
+        ),
+    ]
+
+
+@dataclass
+class Line:
+    id: Annotated[int, FakeType("sequential_number", namespace="line")]
+    order_id: Annotated[int, FakeType("reference", model="Order", field="id")]
+    quantity: Annotated[int, FakeType("random_int", min=1, max=10)]
+    price: Annotated[float, FakeType("pyfloat", positive=True, max_value=100, right_digits=2)]
+
+
+@dataclass
+class Shipment:
+    id: Annotated[int, FakeType("sequential_number", namespace="shipment")]
+    line_id: Annotated[int, FakeType("reference", model="Line", field="id")]
+
+
+@dataclass
+class Payment:
+    id: Annotated[int, FakeType("sequential_number", namespace="payment")]
+    order_id: Annotated[int, FakeType("reference", model="Order", field="id")]
+    amount: Annotated[
+        float,
+        FakeType(
+            "derived",
+            model="Order",
+            field="id",
+            value=ValueOf("order_id"),
+            fields=["total"],
+            row_op=typed_sum,
+            col_op=typed_sum,
+        ),
+    ]
+
+
+@dataclass
+class Invoice:
+    id: Annotated[int, FakeType("sequential_number", namespace="invoice")]
+    state: Annotated[str, FakeType("random_element", elements=("Cancelled",))]
+    order_id: Annotated[
+        int,
+        FakeType(
+            "reference",
+            model="Order",
+            field="id",
+            conditions=[SchemaCondition("state", operator.ne, ValueOf("status"))],
+        ),
+    ]
+
+
+class TestChangeStream:
+    def test_fields_that_cant_be_updated(self, schema_generator):
+        stream = ChangeStream(schema_generator)
+        for model, field in [("Order", "id"), ("Line", "order_id"), ("Order", "total"), ("Payment", "amount")]:
+            with pytest.raises(ValueError):
+                stream.update(model, field)
+        with pytest.raises(ValueError):
+            stream.update("Order", "missing")
+        with pytest.raises(ValueError):
+            stream.delete("Order", weight=0)
+
+    def test_fields_compared_by_conditions(self):
+        sg = FakeSchemaGenerator()
+        sg.register(Invoice)
+        sg.generate(20)
+        stream = ChangeStream(sg)
+        for model, field in [("Invoice", "state"), ("Order", "status")]:
+            with pytest.raises(ValueError, match="the conditions of Invoice.order_id read it"):
+                stream.update(model, field)
+
+    def test_deletes_follow_references_with_conditions(self):
+        sg = FakeSchemaGenerator()
+        sg._fake.seed_instance(0)
+        sg.register(Invoice)
+        sg.register(Line)
+        sg.generate(50, batch_size=10)
+        stream = ChangeStream(sg, seed=0)
+        stream.delete("Order")
+        events = list(stream.events(20))
+
+        orders = {o.id for o in stream.rows("Order")}
+        assert len(orders) == 30
+        assert all(invoice.order_id in orders for invoice in stream.rows("Invoice"))
+        assert any(e.operation == "delete" and e.model == "Invoice" for e in events)
+
+    def test_transitions(self, schema_generator):
+        stream = ChangeStream(schema_generator, seed=0)
+        stream.update("Order", "status", {"Pending": "Shipped", "Shipped": ["Delivered"]})
+        events = list(stream.events())
+
+        # Every order ends up delivered, through every status in between.
+        assert {o.status for o in stream.rows("Order")} == {"Delivered"}
+        assert all(e.before["status"] in ("Pending", "Shipped") for e in events)
+        assert [e.sequence for e in events] == list(range(1, len(events) + 1))
+        assert len(events) == sum(
+            {"Pending": 2, "Shipped": 1, "Delivered": 0}[o.status] for o in schema_generator.data("Order")
+        )
+        # The generator's rows are left as they were generated.
+        assert {o.status for o in schema_generator.data("Order")} == {"Pending", "Shipped", "Delivered"}
+
+    def test_seed(self, schema_generator):
+        def events():
+            stream = ChangeStream(schema_generator, seed=1)
+            stream.update(Order, "status", {"Pending": "Shipped", "Shipped": "Pending"})
+            stream.delete(Line)
+            return list(stream.events(50))
+
+        assert events() == events()
+
+    def test_consistency(self, schema_generator):
+        stream = ChangeStream(schema_generator, seed=0)
+        stream.update("Line", "quantity", weight=5)
+        stream.update("Line", "price", weight=2)
+        stream.delete("Line")
+        stream.delete("Order", weight=0.5)
+        events = list(stream.events(300))
+
+        orders = {o.id: o for o in stream.rows("Order")}
+        lines = {line.id: line for line in stream.rows("Line")}
+        assert 0 < len(orders) < 200
+        assert all(line.order_id in orders for line in lines.values())
+        assert all(s.line_id in lines for s in stream.rows("Shipment"))
+        for order in orders.values():
+            expected = sum(line.quantity * line.price for line in lines.values() if line.order_id == order.id)
+            assert order.total == pytest.approx(expected)
+        assert all(p.amount == pytest.approx(orders[p.order_id].total) for p in stream.rows("Payment"))
+
+        # A row is deleted after the rows that reference it.
+        deleted = [(e.model, e.key["id"]) for e in events if e.operation == "delete"]
+        position = {key: i for i, key in enumerate(deleted)}
+        for (model, key), i in position.items():
+            if model == "Order":
+                old_lines = [line for line in schema_generator.data("Line") if line.order_id == key]
+                assert all(position[("Line", line.id)] < i for line in old_lines)
+        # Derived columns are updated as the rows they aggregate change.
+        assert {e.model for e in events if e.operation == "update"} == {"Line", "Order", "Payment"}
+
+    def test_totals_of_large_groups(self):
+        sg = FakeSchemaGenerator()
+        sg._fake.seed_instance(0)
+        sg.register(Shipment)
+        sg.register(Payment)
+        sg.generate_from_dag(rows=5)
+        sg.generate_from_dag({"Line"}, 500)
+        sg.derive()
+
+        stream = ChangeStream(sg, seed=0)
+        stream.update("Line", "quantity", weight=5)
+        stream.update("Line", "price")
+        stream.delete("Line", weight=0.5)
+        events = list(stream.events(3000))
+
+        # The totals are kept from the differences the changes make, and stay those of the rows.
+        lines = stream.rows("Line")
+        assert 0 < len(lines) < 505
+        orders = {o.id: o for o in stream.rows("Order")}
+        for order in orders.values():
+            group = [line.quantity * line.price for line in lines if line.order_id == order.id]
+            assert order.total == pytest.approx(sum(group), abs=1e-6)
+            if len(group) <= 1:
+                # A group of one row is aggregated again, exactly.
+                assert order.total == (group[0] if group else 0)
+        assert all(p.amount == orders[p.order_id].total for p in stream.rows("Payment"))
+        assert sum(e.model == "Order" for e in events) > 1000
+
+    def test_write(self, schema_generator, tmp_path):
+        stream = ChangeStream(schema_generator, seed=0)
+        stream.update("Line", "quantity")
+        stream.delete("Order", weight=0.1)
+        written = stream.write(tmp_path / "changes.ndjson", 100)
+
+        lines = (tmp_path / "changes.ndjson").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == written > 100
+        event = json.loads(lines[0])
+        assert list(event) == ["sequence", "operation", "model", "key", "before", "after"]
+        assert event["sequence"] == 1
+        deletes = [json.loads(line) for line in lines if '"delete"' in line]
+        assert all(e["after"] is None and e["key"]["id"] == e["before"]["id"] for e in deletes)
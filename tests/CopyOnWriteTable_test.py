@@ -0,0 +1,44 @@
+import random
+
+from fake_schema_generator import CopyOnWriteTable
+
+from .SQLiteStorage_test import Event
+
+
+def test_copy_on_write():
+    frozen = (Event(0, 1, 10), Event(1, 2, 20))
+    table = CopyOnWriteTable(frozen)
+    table.extend([Event(2, 1, 30)])
+    assert len(table) == 3
+    assert table[-1] == Event(2, 1, 30)
+    assert table[:2] == list(frozen)
+
+    table[0].day = 11
+    table.set_column("group", [5, 6, 7])
+    assert frozen == (Event(0, 1, 10), Event(1, 2, 20))
+    assert table == [Event(0, 5, 11), Event(1, 6, 20), Event(2, 7, 30)]
+    assert (table.value(0, "day"), table.value(2, "group")) == (11, 7)
+    assert table.build_index(("group",)).first((6,)) == Event(1, 6, 20)
+
+
+def test_reads_dont_copy():
+    frozen = tuple(Event(i, i % 3, 10) for i in range(10))
+    table = CopyOnWriteTable(frozen)
+    assert list(table.read()) == list(frozen) and table.read()[-1] is frozen[-1]
+    assert table.columns(["group"])["group"] == [e.group for e in frozen]
+    assert table.build_index(("group",)).count((1,)) == 3
+    assert table.value(4, "day") == 10
+    table.set_column("day", [10] * 9 + [11])
+    assert repr(table) == "CopyOnWriteTable(frozen=10, copied=1, appended=0)"
+    assert frozen[9].day == 10 and table.read()[9].day == 11
+
+
+def test_rows_handed_out_are_copies():
+    frozen = tuple(Event(i, i % 3, 10) for i in range(10))
+    table = CopyOnWriteTable(frozen)
+    for event in table:
+        event.day = 0
+    table.sample(random.Random(0), 5)[0].group = 9
+    assert all(e.day == 10 and e.group == e.id % 3 for e in frozen)
+    assert [e.day for e in table] == [0] * 10
+    assert all(table.read()[i] is row for i, row in enumerate(table))
@@ -1,4 +1,5 @@
 import operator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Annotated
 
@@ -7,6 +8,7 @@ import pytest
 from fake_schema_generator import FakeSchemaGenerator
 from fake_schema_generator import FakeType
 from fake_schema_generator import SchemaCondition
+from fake_schema_generator import SchemaValidationError
 from fake_schema_generator import ValueOf
 from fake_schema_generator import typed_product
 from fake_schema_generator import typed_sum
@@ -90,6 +92,77 @@ class OrderProduct:
     ]
 
 
+@dataclass
+class Refund:
+    id: Annotated[int, FakeType("sequential_number", namespace="refund")]
+    order_id: Annotated[
+        int,
+        FakeType(
+            "reference",
+            model="Order",
+            field="id",
+            conditions=[SchemaCondition("id", operator.ge, ValueOf("id"))],
+            random_match=True,
+        ),
+    ]
+    first_order_id: Annotated[
+        int,
+        FakeType(
+            "reference", model="Order", field="id", conditions=[SchemaCondition("id", operator.ge, ValueOf("id"))]
+        ),
+    ]
+
+
+@dataclass
+class Invoice:
+    id: Annotated[int, FakeType("sequential_number", namespace="invoice")]
+    total: Annotated[
+        float,
+        FakeType(
+            "derived",
+            model="InvoiceLine",
+            field="invoice_id",
+            value=ValueOf("id"),
+            fields=["price", "quantity"],
+            row_op=typed_product,
+            col_op=typed_sum,
+        ),
+    ]
+
+
+@dataclass
+class InvoiceLine:
+    id: Annotated[int, FakeType("sequential_number", namespace="invoice_line")]
+    invoice_id: Annotated[int, FakeType("reference", model="Invoice", field="id")]
+    price: Annotated[float, FakeType("pyfloat", positive=True, min_value=1, max_value=100, right_digits=2)]
+    quantity: Annotated[int, FakeType("random_int", min=1, max=10)]
+
+
+@dataclass
+class InvoicePayment:
+    id: Annotated[int, FakeType("sequential_number", namespace="invoice_payment")]
+    invoice_id: Annotated[int, FakeType("reference", model="Invoice", field="id")]
+    amount: Annotated[float, FakeType("reference", model="Invoice", field="total")]
+
+
+@dataclass
+class InvalidOrderProduct:
+    id: Annotated[int, FakeType("sequential_number", namespace="invalid", step=2)]
+    order_id: Annotated[int, FakeType("reference", model="Order", field="order_id")]
+    product_id: Annotated[int, FakeType("reference", model="MissingProduct", field="id")]
+    note: Annotated[str, FakeType("not_a_provider")]
+    unit_price: Annotated[
+        float,
+        FakeType(
+            "reference",
+            model="Product",
+            field="price",
+            conditions=[SchemaCondition("missing_id", operator.eq, ValueOf("missing_id"))],
+        ),
+    ]
+    total: Annotated[float, FakeType("calculate", model="Product", field="id", value=ValueOf("id"), fields=[])]
+
+
 class TestFakeSchemaGenerator:
     def test_exists(self, schema_generator):
         assert schema_generator is not None
@@ -212,3 +285,226 @@ class TestFakeSchemaGenerator:
         assert data["Order"][0].customer_id == data["Customer"][0].id
         assert data["OrderProduct"][0].order_id == data["Order"][0].id
         assert data["OrderProduct"][0].product_id == data["Product"][0].id
+
+    def test_generate_count(self, schema_generator):
+        schema_generator.register(CustomerDetails)
+        schema_generator.generate(5)
+        assert [c.id for c in schema_generator.data("Customer")] == [1, 2, 3, 4, 5]
+        assert len(schema_generator.data("CustomerDetails")) == 5
+
+    def test_generate_with_workers(self, schema_generator):
+        schema_generator.register(OrderProduct)
+        schema_generator.generate(2)
+        schema_generator.generate(10, workers=3)
+        data = schema_generator.data()
+        assert all(len(rows) == 12 for rows in data.values())
+        for model in ["Customer", "Order", "OrderProduct", "Product"]:
+            ids = [row.id for row in data[model]]
+            assert len(set(ids)) == len(ids)
+        customer_ids = {c.id for c in data["Customer"]}
+        assert all(o.customer_id in customer_ids for o in data["Order"])
+        prices = {p.id: p.price for p in data["Product"]}
+        assert all(op.unit_price == prices[op.product_id] for op in data["OrderProduct"])
+        # Sequences continue past the numbers handed out by the workers.
+        schema_generator.generate()
+        assert data["Customer"][-1].id > max(c.id for c in data["Customer"][:-1])
+
+    def test_thread_safe_generation(self):
+        schema_generator = FakeSchemaGenerator(thread_safe=True)
+        schema_generator._fake.seed_instance(0)
+        schema_generator.register(OrderProduct)
+        schema_generator.generate(2)
+        assert [c.id for c in schema_generator.data("Customer")] == [1, 2]
+        schema_generator.generate(60, workers=4, batch_size=5)
+        data = schema_generator.data()
+        assert all(len(rows) == 62 for rows in data.values())
+        for model in ["Customer", "Order", "OrderProduct", "Product"]:
+            ids = [row.id for row in data[model]]
+            assert len(set(ids)) == len(ids)
+        customer_ids = {c.id for c in data["Customer"]}
+        assert all(o.customer_id in customer_ids for o in data["Order"])
+        prices = {p.id: p.price for p in data["Product"]}
+        assert all(op.unit_price == prices[op.product_id] for op in data["OrderProduct"])
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            names = list(
+                executor.map(lambda _: schema_generator.reference(data["Order"][0], Customer, "name"), range(8))
+            )
+        assert set(names) <= {c.name for c in data["Customer"]}
+
+        # Each table has its own lock, so a locked table doesn't hold up looking up the others.
+        with ThreadPoolExecutor(max_workers=2) as executor, schema_generator._table_locks["Customer"]:
+            blocked = executor.submit(schema_generator.reference, data["Order"][0], Customer, "name")
+            price = executor.submit(schema_generator.reference, data["OrderProduct"][0], Product, "price")
+            assert price.result(timeout=5) in prices.values()
+            assert not blocked.done()
+        assert blocked.result() in {c.name for c in data["Customer"]}
+
+    def test_data_is_a_list(self, schema_generator):
+        schema_generator.register(Customer)
+        schema_generator.generate(3)
+        customers = schema_generator.data("Customer")
+        assert isinstance(customers, list)
+        assert customers.index(customers[1]) == 1 and customers.count(customers[2]) == 1
+
+    def test_continue_sequences(self, schema_generator):
+        schema_generator.register(CustomerDetails)
+        schema_generator.generate(5, batch_size=2)
+        marks = schema_generator.high_water_marks()
+        assert marks == {"customer": 5, "customer_details": 5}
+
+        next_run = FakeSchemaGenerator()
+        next_run.register(CustomerDetails)
+        next_run.continue_from(marks)
+        next_run.generate(3, batch_size=3)
+        assert [c.id for c in next_run.data("Customer")] == [6, 7, 8]
+
+    def test_invalid_schema_reports_every_error(self, schema_generator):
+        schema_generator.register(InvalidOrderProduct)
+        with pytest.raises(SchemaValidationError) as e:
+            schema_generator.generate()
+        assert sorted(e.value.errors) == [
+            "InvalidOrderProduct.id: provider sequential_number has no keyword argument step",
+            "InvalidOrderProduct.note: provider not_a_provider not found",
+            "InvalidOrderProduct.order_id: field order_id not found in model Order",
+            "InvalidOrderProduct.product_id: Model MissingProduct not found",
+            "InvalidOrderProduct.total: at least one field is required",
+            "InvalidOrderProduct.unit_price: condition field missing_id not found in model InvalidOrderProduct",
+            "InvalidOrderProduct.unit_price: condition value field missing_id not found in model Product",
+        ]
+
+    def test_invalid_schema_raises_every_time(self, schema_generator):
+        schema_generator.register(InvalidOrderProduct)
+        for _ in range(2):
+            with pytest.raises(SchemaValidationError):
+                schema_generator.generate()
+        assert len(schema_generator.data("InvalidOrderProduct")) == 0
+
+    def test_generate_in_blocks(self, schema_generator):
+        schema_generator.register(OrderProduct)
+        schema_generator.generate(25, batch_size=10)
+        data = schema_generator.data()
+        assert all(len(rows) == 25 for rows in data.values())
+        assert [p.id for p in data["Product"]] == list(range(1, 26))
+        prices = {p.id: p.price for p in data["Product"]}
+        assert all(op.unit_price == prices[op.product_id] for op in data["OrderProduct"])
+        order_ids = {o.id for o in data["Order"]}
+        assert all(op.order_id in order_ids for op in data["OrderProduct"])
+
+    def test_range_reference_uses_index(self, schema_generator):
+        schema_generator.register(Refund)
+        schema_generator.generate(40, batch_size=3)
+        data = schema_generator.data()
+        assert len(schema_generator._indexes["Order"][((), "id")]) == 40
+        assert all(r.order_id <= r.id for r in data["Refund"])
+        assert len({r.order_id for r in data["Refund"]}) > 10
+        assert all(r.first_order_id == 1 for r in data["Refund"])
+        assert (
+            schema_generator.reference(
+                data["Refund"][9], Order, "id", [SchemaCondition("id", operator.lt, ValueOf("id"))]
+            )
+            == 11
+        )
+
+    def test_derived_columns(self, schema_generator):
+        schema_generator.register(Invoice)
+        schema_generator.generate(30, batch_size=7)
+        schema_generator.generate(10, workers=2)
+        data = schema_generator.data()
+        assert ("Invoice", "total") not in [(p.model, p.field) for p in schema_generator._plan]
+        assert schema_generator._field_dependencies[("Invoice", "total")] == set()
+        for invoice in data["Invoice"]:
+            lines = [line.price * line.quantity for line in data["InvoiceLine"] if line.invoice_id == invoice.id]
+            assert invoice.total == (0 if len(lines) == 0 else pytest.approx(sum(lines)))
+
+    def test_explain(self, schema_generator):
+        schema_generator.register(OrderProduct)
+        schema_generator.register(Refund)
+        schema_generator.register(Invoice)
+        explanation = schema_generator.explain(rows=1000, batch_size=10)
+        fields = {f"{f.model}.{f.field}": f for f in explanation.fields + explanation.derived}
+        assert [(f.model, f.field) for f in explanation.fields] == [(p.model, p.field) for p in schema_generator._plan]
+        assert all(len(rows) == 0 for rows in schema_generator.data().values())
+
+        assert (fields["Customer.id"].strategy, fields["Customer.name"].strategy) == ("batch", "scalar")
+        assert fields["OrderProduct.product_id"].detail == "random Product.id"
+        assert fields["OrderProduct.unit_price"].strategy == "index lookup"
+        assert fields["OrderProduct.unit_price"].wave > fields["OrderProduct.product_id"].wave
+        assert fields["Refund.order_id"].cost > fields["Refund.first_order_id"].cost
+        assert fields["Order.total_amount"].strategy == "index lookup"
+        assert fields["Order.total_amount"].detail == "OrderProduct rows by order_id"
+        assert (fields["Invoice.total"].strategy, fields["Invoice.total"].wave) == ("derived", None)
+        assert explanation.warnings == []
+
+        # Without the index on the joined field, a calculation scans the table for every block.
+        schema_generator._indexes["OrderProduct"].clear()
+        explanation = schema_generator.explain(rows=1000, batch_size=10)
+        fields = {f"{f.model}.{f.field}": f for f in explanation.fields}
+        assert (fields["Order.total_amount"].strategy, fields["Order.total_amount"].cost) == ("scan", 51)
+        assert [w.split(":")[0] for w in explanation.warnings] == ["Order.total_amount"]
+        assert "Order.total_amount" in str(explanation)
+
+    @pytest.mark.usefixtures("frozen_now")
+    def test_snapshot_and_fork(self, schema_generator):
+        for model in (OrderProduct, Refund, Invoice):
+            schema_generator.register(model)
+        schema_generator.generate(20, batch_size=3)
+        snapshot = schema_generator.snapshot()
+        first, second = snapshot.fork(), snapshot.fork()
+
+        second.data("Order")[0].order_status = "Lost"
+        for order in second.data("Order"):
+            order.order_status = "Mutated"
+        assert {o.order_status for o in snapshot.fork().data("Order")} != {"Mutated"}
+        assert "Mutated" not in {o.order_status for o in snapshot.tables["Order"]}
+        second.generate(5)
+        assert snapshot.tables["Order"][0].order_status != "Lost"
+        assert schema_generator.data("Order")[0].order_status != "Lost"
+        assert (len(second.data("Order")), len(snapshot.tables["Order"])) == (25, 20)
+
+        first.generate(10, batch_size=3)
+        schema_generator.generate(10, batch_size=3)
+        assert first.data() == schema_generator.data()
+        assert first.high_water_marks() == schema_generator.high_water_marks()
+        assert len(schema_generator.fork().data("Refund")) == 30
+
+        # Generating and reading a fork doesn't copy the rows of the snapshot, only deriving the total of an invoice of
+        # the snapshot that a new invoice line belongs to does.
+        third = snapshot.fork()
+        third.generate_from_dag({"Customer", "Order", "OrderProduct"}, 3)
+        third.derive()
+        third.data("Order").columns(["id", "customer_id"])
+        assert {m: len(t._copies) for m, t in third.data().items() if t._copies} == {}
+
+        # Without new invoices, the new line belongs to one of the snapshot's.
+        third.generate_from_dag({"InvoiceLine"}, 1)
+        third.derive()
+        assert {m: len(t._copies) for m, t in third.data().items() if t._copies} == {"Invoice": 1}
+
+    def test_subset(self, schema_generator):
+        schema_generator.register(OrderProduct)
+        schema_generator.register(Invoice)
+        schema_generator.generate(200, batch_size=10)
+        subset = schema_generator.subset(Order, 0.05, seed=0)
+        assert len(subset["Order"]) == 10
+        assert len(subset["OrderProduct"]) < 200 and len(subset["Invoice"]) == 0
+        ids = {model: {row.id for row in rows} for model, rows in subset.items()}
+        assert all(o.customer_id in ids["Customer"] for o in subset["Order"])
+        assert all(op.order_id in ids["Order"] and op.product_id in ids["Product"] for op in subset["OrderProduct"])
+        assert subset == schema_generator.subset("Order", 0.05, seed=0)
+
+        subset = schema_generator.subset(Invoice, lambda invoice: invoice.id <= 3)
+        assert [invoice.id for invoice in subset["Invoice"]] == [1, 2, 3]
+        for invoice in subset["Invoice"]:
+            lines = [line.price * line.quantity for line in subset["InvoiceLine"] if line.invoice_id == invoice.id]
+            assert invoice.total == (0 if len(lines) == 0 else pytest.approx(sum(lines)))
+        assert {line.invoice_id for line in subset["InvoiceLine"]} <= {1, 2, 3}
+        assert len(subset["InvoiceLine"]) == sum(line.invoice_id <= 3 for line in schema_generator.data("InvoiceLine"))
+        assert len(schema_generator.subset(Customer, 0.1, children=False)["Order"]) == 0
+
+    def test_reading_derived_column(self, schema_generator):
+        schema_generator.register(InvoicePayment)
+        with pytest.raises(SchemaValidationError) as e:
+            schema_generator.generate()
+        assert e.value.errors == [
+            "InvoicePayment.amount: reads derived column Invoice.total, which is only computed after generation"
+        ]
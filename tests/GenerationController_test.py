@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import GenerationController
+
+
+@pytest.fixture
+def schema_generator():
+    sg = FakeSchemaGenerator()
+    sg._fake.seed_instance(0)
+    sg.register(Account)
+    return sg
+
+
+@dataclass
+class User:
+    id: Annotated[int, FakeType("sequential_number", namespace="user")]
+    name: Annotated[str, FakeType("name")]
+
+
+@dataclass
+class Account:
+    id: Annotated[int, FakeType("sequential_number", namespace="account")]
+    user_id: Annotated[int, FakeType("reference", model="User", field="id")]
+
+
+class TestGenerationController:
+    def test_requires_a_limit(self):
+        with pytest.raises(ValueError):
+            GenerationController()
+
+    def test_row_target(self, schema_generator):
+        progress = GenerationController(rows=25, batch_size=10).run(schema_generator)
+        assert progress.finished
+        assert progress.stop_reason == "completed"
+        assert progress.rows == {"User": 25, "Account": 25}
+        assert progress.completion == {"User": 1.0, "Account": 1.0}
+        assert len(schema_generator.data("Account")) == 25
+
+    def test_per_model_targets(self, schema_generator):
+        progress = GenerationController(rows={"User": 5, "Account": 20}, batch_size=3).run(schema_generator)
+        assert progress.rows == {"User": 5, "Account": 20}
+        user_ids = {u.id for u in schema_generator.data("User")}
+        assert len(user_ids) == 5
+        assert all(a.user_id in user_ids for a in schema_generator.data("Account"))
+
+    def test_unknown_model(self, schema_generator):
+        with pytest.raises(ValueError):
+            GenerationController(rows={"Missing": 5}).run(schema_generator)
+
+    def test_time_budget(self, schema_generator):
+        progress = GenerationController(time_budget=0.05, batch_size=5).run(schema_generator)
+        assert progress.stop_reason == "time_budget"
+        assert progress.elapsed >= 0.05
+        assert progress.rows["User"] > 0
+        assert progress.completion == {"User": None, "Account": None}
+
+    def test_memory_budget(self, schema_generator):
+        progress = GenerationController(rows=1000, memory_budget=1, batch_size=5).run(schema_generator)
+        assert progress.stop_reason == "memory_budget"
+        assert progress.rows["User"] == 0
+
+    def test_progress_and_cancellation(self, schema_generator):
+        reports = []
+
+        def callback(progress):
+            reports.append(progress)
+            if progress.rows["User"] >= 20:
+                controller.cancel()
+
+        controller = GenerationController(rows=100, callback=callback, interval=0, batch_size=10)
+        progress = controller.run(schema_generator)
+        assert progress.stop_reason == "cancelled"
+        assert progress.rows["User"] == 20
+        assert [r.rows["User"] for r in reports] == [10, 20, 20]
+        assert reports[0].rows_per_second > 0
+        assert reports[0].eta is not None
+        assert reports[-1].finished
+
+    def test_workers(self):
+        with pytest.raises(ValueError):
+            GenerationController(rows=10, workers=2).run(FakeSchemaGenerator())
+
+        schema_generator = FakeSchemaGenerator(thread_safe=True)
+        schema_generator.register(Account)
+        progress = GenerationController(rows={"User": 45, "Account": 100}, batch_size=10, workers=4).run(
+            schema_generator
+        )
+        assert progress.rows == {"User": 45, "Account": 100}
+        assert len({u.id for u in schema_generator.data("User")}) == 45
+        user_ids = {u.id for u in schema_generator.data("User")}
+        assert all(a.user_id in user_ids for a in schema_generator.data("Account"))
@@ -0,0 +1,123 @@
+import operator
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from fake_schema_generator import ChainedRows
+from fake_schema_generator import JoinPlan
+from fake_schema_generator import SchemaCondition
+from fake_schema_generator import SortedIndex
+from fake_schema_generator import ValueOf
+
+
+@dataclass
+class Row:
+    id: int
+    group: int
+    value: int
+
+
+class Streamed(list):
+    """
+    Rows that can only be iterated, like a table streamed from storage.
+    """
+
+    def __getitem__(self, position):
+        raise AssertionError("read by position")
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(0)
+    sources = [Row(i, rng.randint(0, 3), rng.randint(0, 20)) for i in range(50)]
+    targets = [Row(i, rng.randint(0, 3), rng.randint(0, 20)) for i in range(50)]
+    return sources, targets
+
+
+class TestJoinPlan:
+    @pytest.mark.parametrize(
+        "conditions,strategy",
+        [
+            ([SchemaCondition("group", operator.eq, ValueOf("group"))], "hash"),
+            ([SchemaCondition("value", operator.ge, ValueOf("value"))], "sort_merge"),
+            (
+                [
+                    SchemaCondition("group", operator.eq, ValueOf("group")),
+                    SchemaCondition("value", operator.lt, ValueOf("value")),
+                ],
+                "sort_merge",
+            ),
+            (
+                [
+                    SchemaCondition("group", operator.eq, ValueOf("group")),
+                    SchemaCondition("value", operator.ne, ValueOf("value")),
+                ],
+                "nested_loop",
+            ),
+            (
+                [
+                    SchemaCondition("value", operator.gt, ValueOf("value")),
+                    SchemaCondition("value", operator.le, ValueOf("id")),
+                ],
+                "nested_loop",
+            ),
+            ([SchemaCondition("value", operator.gt, 10)], "hash"),
+        ],
+    )
+    def test_matches_scan(self, rows, conditions, strategy):
+        sources, targets = rows
+        plan = JoinPlan(conditions)
+        assert plan.strategy == strategy
+        assert plan.execute(sources, Streamed(targets)) == plan._scan(sources, targets)
+
+    @pytest.mark.parametrize("comparison", [operator.lt, operator.le, operator.gt, operator.ge])
+    def test_sort_merge_matches_scan(self, rows, comparison):
+        sources, targets = rows
+        plan = JoinPlan(
+            [
+                SchemaCondition("group", operator.eq, ValueOf("group")),
+                SchemaCondition("value", comparison, ValueOf("value")),
+                SchemaCondition("id", operator.ne, 7),
+            ]
+        )
+        matches = plan.execute(sources, targets)
+        assert matches == plan._scan(sources, targets)
+        assert matches[7] is None
+        assert any(m is not None for m in matches)
+
+    def test_unorderable_values_fall_back_to_scan(self):
+        plan = JoinPlan([SchemaCondition("value", operator.eq, ValueOf("value"))])
+        sources = [Row(0, 0, [1]), Row(1, 0, [2])]
+        targets = [Row(0, 0, [2]), Row(1, 0, [1])]
+        assert plan.execute(sources, targets) == [targets[1], targets[0]]
+
+    def test_nested_loop_with_index(self, rows):
+        sources, targets = rows
+        plan = JoinPlan(
+            [
+                SchemaCondition("group", operator.eq, ValueOf("group")),
+                SchemaCondition("value", operator.ne, ValueOf("value")),
+                SchemaCondition("id", operator.gt, ValueOf("id")),
+            ]
+        )
+        assert plan.index_fields == (("group",), None)
+        index = SortedIndex(*plan.index_fields)
+        index.extend(targets[:30])
+        assert plan.resolve(sources, targets[30:], index) == plan.execute(sources, targets)
+
+        matches = plan.resolve(sources, targets[30:], index, random.Random(0))
+        for source, match, first in zip(sources, matches, plan.execute(sources, targets)):
+            assert (match is None) == (first is None)
+            assert match is None or plan._matches(source, match)
+
+    def test_chained_rows(self, rows):
+        sources, targets = rows
+        chained = ChainedRows(Streamed(targets[:20]), targets[20:])
+        assert len(chained) == 50 and list(chained) == targets
+        plan = JoinPlan([SchemaCondition("value", operator.ne, ValueOf("value"))])
+        assert (plan.strategy, plan.index_fields) == ("nested_loop", None)
+        assert plan.execute(sources, chained) == plan._scan(sources, targets)
+        assert ChainedRows(targets[:20], targets[20:])[-1] is targets[-1]
+        with pytest.raises(IndexError):
+            ChainedRows(targets)[50]
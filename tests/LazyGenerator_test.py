@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+from faker import Faker
+
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import LazyGenerator
+from fake_schema_generator import analyse_model
+
+
+@pytest.fixture
+def lazy_generator():
+    return LazyGenerator()
+
+
+@dataclass
+class Person:
+    id: Annotated[int, FakeType("sequential_number", namespace="person")]
+    name: Annotated[str, FakeType("name")]
+
+
+class TestLazyGenerator:
+    def test_no_providers_loaded_up_front(self, lazy_generator):
+        assert lazy_generator.loaded_providers == set()
+
+    def test_loads_provider_on_first_use(self, lazy_generator):
+        lazy_generator.name()
+        assert "faker.providers.person" in lazy_generator.loaded_providers
+        assert "faker.providers.automotive" not in lazy_generator.loaded_providers
+
+    def test_loads_dependent_providers(self, lazy_generator):
+        # `email` is parsed from a pattern that uses formatters from other providers.
+        assert "@" in lazy_generator.email()
+
+    def test_unknown_formatter(self, lazy_generator):
+        with pytest.raises(AttributeError):
+            lazy_generator.not_a_formatter()
+        assert not hasattr(lazy_generator, "not_a_formatter")
+
+    def test_matches_eager_faker(self, lazy_generator):
+        eager = Faker()
+        eager.seed_instance(0)
+        lazy_generator.seed_instance(0)
+        for formatter in ["name", "email", "street_address", "text", "random_int", "date_time_this_year"]:
+            assert getattr(lazy_generator, formatter)() == getattr(eager, formatter)()
+
+    def test_does_not_override_added_providers(self, lazy_generator):
+        class PersonOverride:
+            def name(self):
+                return "Override"
+
+        lazy_generator.set_formatter("name", PersonOverride().name)
+        lazy_generator.load_provider("faker.providers.person")
+        assert lazy_generator.name() == "Override"
+
+    def test_schema_generator_only_loads_registered_providers(self):
+        sg = FakeSchemaGenerator()
+        sg.register(Person)
+        sg.generate()
+        loaded = sg._fake.factories[0].loaded_providers
+        assert "faker.providers.person" in loaded
+        assert "faker.providers.internet" not in loaded
+
+    def test_model_analysis_is_memoized(self):
+        assert analyse_model(Person) is analyse_model(Person)
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from threading import Thread
+from time import sleep
+from typing import Annotated
+
+import pytest
+
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import RateEmitter
+
+
+@pytest.fixture
+def schema_generator():
+    sg = FakeSchemaGenerator()
+    sg._fake.seed_instance(0)
+    sg.register(Account)
+    return sg
+
+
+@dataclass
+class User:
+    id: Annotated[int, FakeType("sequential_number", namespace="user")]
+    name: Annotated[str, FakeType("name")]
+
+
+@dataclass
+class Account:
+    id: Annotated[int, FakeType("sequential_number", namespace="account")]
+    user_id: Annotated[int, FakeType("reference", model="User", field="id")]
+
+
+class TestRateEmitter:
+    def test_invalid_arguments(self, schema_generator):
+        with pytest.raises(ValueError):
+            RateEmitter(schema_generator, rate=0)
+        with pytest.raises(ValueError):
+            RateEmitter(schema_generator, rate=10, burst=0)
+
+    def test_rate(self, schema_generator):
+        emitter = RateEmitter(schema_generator, rate=2000, batch_size=50)
+        rows = list(emitter.emit(rows=400))
+
+        assert len(rows) == 400
+        stats = emitter.stats
+        assert stats.emitted == 400
+        # 400 rows at 2000 rows per second take 0.2 seconds, give or take the pacing of the last row.
+        assert 0.19 <= stats.elapsed < 1
+        assert stats.rows_per_second <= 2100
+
+    def test_references_are_emitted_first(self, schema_generator):
+        users = set()
+        for model, row in RateEmitter(schema_generator, rate=10_000, batch_size=20).emit(rows=200):
+            if model == "User":
+                users.add(row.id)
+            else:
+                assert row.user_id in users
+
+    def test_burst(self, schema_generator):
+        emitter = RateEmitter(schema_generator, rate=10, burst=50, batch_size=50)
+        assert len(list(emitter.emit(rows=50))) == 50
+        # A full bucket lets the whole burst through at once, instead of over 5 seconds.
+        assert emitter.stats.elapsed < 1
+        assert emitter.stats.max_lag < 1
+
+    def test_models_and_duration(self, schema_generator):
+        schema_generator.generate(10)
+        emitter = RateEmitter(schema_generator, rate=1000, models={"Account"})
+        rows = list(emitter.emit(duration=0.1))
+
+        assert 0 < len(rows) <= 110
+        assert {model for model, _ in rows} == {"Account"}
+        assert len(schema_generator.data("User")) == 10
+        assert all(row.user_id <= 10 for _, row in rows)
+
+    def test_stop_while_waiting_for_rows(self, schema_generator, monkeypatch):
+        generate = schema_generator.generate_from_dag
+
+        def slow_generate(*args, **kwargs):
+            sleep(0.2)
+            return generate(*args, **kwargs)
+
+        monkeypatch.setattr(schema_generator, "generate_from_dag", slow_generate)
+        emitter = RateEmitter(schema_generator, rate=100_000, batch_size=10, buffer=1)
+        rows = []
+        consumer = Thread(target=lambda: rows.extend(emitter.emit()))
+        consumer.start()
+        while emitter.stats.emitted == 0:
+            sleep(0.01)
+        # The buffer is empty and the consumer waits for the next block.
+        emitter.stop()
+        consumer.join(timeout=2)
+        assert not consumer.is_alive()
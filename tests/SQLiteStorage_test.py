@@ -0,0 +1,91 @@
+import operator
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import MemoryTable
+from fake_schema_generator import SQLiteStorage
+from fake_schema_generator import SQLiteTable
+
+from .FakeSchemaGenerator_test import Customer
+from .FakeSchemaGenerator_test import Invoice
+from .FakeSchemaGenerator_test import InvoiceLine
+from .FakeSchemaGenerator_test import Order
+from .FakeSchemaGenerator_test import OrderProduct
+from .FakeSchemaGenerator_test import Product
+from .FakeSchemaGenerator_test import Refund
+
+pytestmark = pytest.mark.usefixtures("frozen_now")
+
+
+@dataclass
+class Event:
+    id: int
+    group: int
+    day: int
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "data.db"))
+    yield storage
+    storage.close()
+
+
+def generate(storage=None):
+    sg = FakeSchemaGenerator(storage)
+    sg._fake.seed_instance(0)
+    for model in (Customer, Product, Order, OrderProduct, Refund, Invoice, InvoiceLine):
+        sg.register(model)
+    sg.generate(30, batch_size=4)
+    return sg
+
+
+class TestSQLiteStorage:
+    def test_same_data_as_memory(self, storage):
+        in_memory = generate().data()
+        sg = generate(storage)
+        in_sqlite = sg.data()
+        # References to stored rows are answered by SQLite.
+        assert len(sg._indexes["Order"][((), "id")]) == 30
+        assert sg._indexes["Product"][(("id",), None)].table is in_sqlite["Product"]
+        assert isinstance(in_memory["Order"], MemoryTable)
+        assert set(in_sqlite) == set(in_memory)
+        for model_name, rows in in_memory.items():
+            assert list(in_sqlite[model_name]) == rows
+
+    def test_tables_arent_read_in_full(self, storage, monkeypatch):
+        def read_in_full(table):
+            raise AssertionError(f"{table} was read in full")
+
+        sg = FakeSchemaGenerator(storage)
+        sg._fake.seed_instance(0)
+        for model in (Customer, Product, Order, OrderProduct, Refund):
+            sg.register(model)
+        # Calculations and references with conditions read the rows they need through indexes.
+        with monkeypatch.context() as patch:
+            patch.setattr(SQLiteTable, "__iter__", read_in_full)
+            sg.generate(30, batch_size=4)
+        assert len(sg.data("OrderProduct")) == 30
+
+    def test_table(self, storage):
+        table = storage.table(Event)
+        events = [Event(i, i % 3, i % 7) for i in range(20)]
+        table.extend(events[:10])
+        index = table.build_index(("group",), "day")
+        table.extend(events[10:])
+        index.extend(events[10:])
+        assert len(table) == len(index) == 20
+        assert table[3] == events[3] and table[-1] == events[-1] and table[5:8] == events[5:8]
+        assert index.first((1,), operator.ge, 2) == next(e for e in events if e.group == 1 and e.day <= 2)
+        assert index.count((1,), operator.lt, 2) == sum(e.group == 1 and e.day > 2 for e in events)
+        assert index.rows((1,), operator.lt, 2) == sorted(
+            (e for e in events if e.group == 1 and e.day > 2), key=lambda e: e.day
+        )
+        assert table.build_index(("group",)).rows((2,)) == [e for e in events if e.group == 2]
+        assert index.choice(random.Random(0), (2,), operator.le, 5).group == 2
+        table.set_column("day", [0] * 20)
+        assert index.count((0,), operator.ge, 0) == sum(e.group == 0 for e in events)
+        assert len(table.sample(random.Random(0), 5)) == 5
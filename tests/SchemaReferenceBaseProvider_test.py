@@ -0,0 +1,100 @@
+import operator
+from dataclasses import dataclass
+from typing import Annotated
+from typing import Any
+
+import pytest
+
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import SchemaCondition
+from fake_schema_generator import SchemaReferenceBaseProvider
+from fake_schema_generator import ValueOf
+
+
+class ShippingAddressProvider(SchemaReferenceBaseProvider):
+    """
+    Picks the street of an address belonging to the same customer, resolving a whole block with one lookup.
+    """
+
+    def __init__(self, fake_generator, schema_generator):
+        super().__init__(fake_generator, schema_generator)
+        self.reference_functions = {"shipping_address"}
+        self.blocks: list[int] = []
+
+    def shipping_address(self, source_model: Any, model: str, field: str, conditions: list[SchemaCondition]) -> str:
+        return self.shipping_address_batch([source_model], model, field, conditions)[0]
+
+    def shipping_address_batch(
+        self, source_models: list[Any], model: str, field: str, conditions: list[SchemaCondition]
+    ) -> list[str]:
+        self.blocks.append(len(source_models))
+        return self.schema_generator.reference_batch(source_models, model, field, conditions)
+
+
+class ScalarShippingAddressProvider(ShippingAddressProvider):
+    """
+    The same provider without a batch function.
+    """
+
+    shipping_address_batch = None
+
+    def shipping_address(self, source_model: Any, model: str, field: str, conditions: list[SchemaCondition]) -> str:
+        self.blocks.append(1)
+        return self.schema_generator.reference(source_model, model, field, conditions)
+
+
+@dataclass
+class Customer:
+    id: Annotated[int, FakeType("sequential_number", namespace="customer")]
+
+
+@dataclass
+class Address:
+    id: Annotated[int, FakeType("sequential_number", namespace="address")]
+    customer_id: Annotated[int, FakeType("reference", model="Customer", field="id")]
+    street: Annotated[str, FakeType("street_address")]
+
+
+@dataclass
+class Shipment:
+    id: Annotated[int, FakeType("sequential_number", namespace="shipment")]
+    address: Annotated[
+        str,
+        FakeType(
+            "shipping_address",
+            model="Address",
+            field="street",
+            conditions=[SchemaCondition("customer_id", operator.eq, ValueOf("customer_id"))],
+        ),
+    ]
+    customer_id: Annotated[int, FakeType("reference", model="Address", field="customer_id")]
+
+
+def schema_generator(provider_cls):
+    sg = FakeSchemaGenerator()
+    sg._fake.seed_instance(0)
+    provider = provider_cls(sg._fake, sg)
+    sg._fake.add_provider(provider)
+    sg._add_referring_provider(provider.reference_functions)
+    sg.register(Shipment)
+    return sg, provider
+
+
+class TestSchemaReferenceBaseProvider:
+    @pytest.mark.parametrize("provider_cls", [ShippingAddressProvider, ScalarShippingAddressProvider])
+    def test_batch_calls(self, provider_cls):
+        sg, provider = schema_generator(provider_cls)
+        sg.generate(12, batch_size=5)
+        expected = [5, 5, 2] if provider_cls is ShippingAddressProvider else [1] * 12
+        assert provider.blocks == expected
+        streets = {(a.customer_id, a.street) for a in sg.data("Address")}
+        assert all((s.customer_id, s.address) in streets for s in sg.data("Shipment"))
+
+    def test_batch_falls_back_to_reference_function(self):
+        sg, provider = schema_generator(ScalarShippingAddressProvider)
+        sg.generate(3)
+        rows = sg.data("Shipment")
+        conditions = [SchemaCondition("customer_id", operator.eq, ValueOf("customer_id"))]
+        values = provider.batch("shipping_address", rows, model="Address", field="street", conditions=conditions)
+        assert values == [r.address for r in rows]
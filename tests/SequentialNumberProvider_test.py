@@ -1,6 +1,9 @@
+import json
+
 import pytest
 from faker import Faker
 
+from fake_schema_generator import SequenceAllocator
 from fake_schema_generator import SequentialNumberProvider
 
 
@@ -33,3 +36,61 @@ class TestSequentialNumberProvider:
         assert faker.sequential_number("test") == 1
         assert faker.sequential_number("test") == 2
         assert faker.sequential_number("test") == 3
+
+    def test_strided_sequence(self, faker):
+        assert faker.sequential_number("test") == 1
+        faker.set_stride(1, 3)
+        assert faker.sequential_number("test") == 3
+        assert faker.sequential_number("test") == 6
+        assert faker.sequential_number("other") == 2
+        assert faker.sequential_number("other") == 5
+
+    def test_leased_sequence(self):
+        allocator = SequenceAllocator(block_size=3)
+        first, second = Faker(), Faker()
+        first.add_provider(SequentialNumberProvider(first, allocator))
+        second.add_provider(SequentialNumberProvider(second, allocator))
+        assert [first.sequential_number("test") for _ in range(2)] == [1, 2]
+        assert [second.sequential_number("test") for _ in range(4)] == [4, 5, 6, 7]
+        assert [first.sequential_number("test") for _ in range(2)] == [3, 10]
+        assert second.sequential_number("other") == 1
+        assert allocator.numbers == {"test": 12, "other": 3}
+
+    def test_reserve(self, faker):
+        assert faker.sequential_number("test") == 1
+        assert faker.reserve("test", 3) == range(2, 5)
+        assert faker.sequential_number("test") == 5
+        faker.set_stride(1, 3)
+        assert list(faker.reserve("test", 3)) == [7, 10, 13]
+        assert faker.sequential_number("test") == 16
+        with pytest.raises(ValueError):
+            faker.reserve("test", 0)
+
+    def test_leased_reserve(self):
+        allocator = SequenceAllocator(block_size=4)
+        fake = Faker()
+        fake.add_provider(SequentialNumberProvider(fake, allocator))
+        assert fake.sequential_number() == 1
+        assert fake.reserve(count=2) == range(2, 4)
+        assert fake.reserve(count=2) == range(5, 7)
+        assert fake.reserve(count=6) == range(9, 15)
+
+    def test_reset_every_sequence(self, faker):
+        faker.sequential_number("test")
+        faker.sequential_number("other")
+        faker.reset_sequence()
+        assert faker.sequential_number("test") == 1
+        assert faker.sequential_number("other") == 1
+
+    def test_continue_from_high_water_marks(self, faker):
+        faker.reserve("test", 10)
+        faker.sequential_number("other")
+        marks = json.loads(json.dumps(faker.high_water_marks()))
+        assert marks == {"test": 10, "other": 1}
+
+        fake = Faker()
+        fake.add_provider(SequentialNumberProvider(fake, SequenceAllocator()))
+        fake.continue_from(marks)
+        assert fake.sequential_number("test") == 11
+        assert fake.sequential_number("new") == 1
+        assert fake.high_water_marks()["test"] == 1010
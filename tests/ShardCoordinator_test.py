@@ -0,0 +1,148 @@
+import json
+import multiprocessing
+import operator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import SchemaCondition
+from fake_schema_generator import ShardCoordinator
+from fake_schema_generator import ShardManifest
+from fake_schema_generator import ShardResult
+from fake_schema_generator import ValueOf
+from fake_schema_generator import typed_sum
+
+
+@dataclass
+class Author:
+    id: Annotated[int, FakeType("sequential_number", namespace="author")]
+    name: Annotated[str, FakeType("name")]
+
+
+@dataclass
+class Book:
+    id: Annotated[int, FakeType("sequential_number", namespace="book")]
+    author_id: Annotated[int, FakeType("reference", model="Author", field="id")]
+    price: Annotated[float, FakeType("pyfloat", min_value=1, max_value=50, right_digits=2)]
+
+
+@dataclass
+class Sale:
+    id: Annotated[int, FakeType("sequential_number", namespace="sale")]
+    book_id: Annotated[int, FakeType("reference", model="Book", field="id")]
+    price: Annotated[
+        float,
+        FakeType(
+            "reference",
+            model="Book",
+            field="price",
+            conditions=[SchemaCondition("book_id", operator.eq, ValueOf("id"))],
+        ),
+    ]
+
+
+@dataclass
+class BookTotal:
+    id: Annotated[int, FakeType("sequential_number", namespace="book_total")]
+    book_id: Annotated[int, FakeType("reference", model="Book", field="id")]
+    sales: Annotated[
+        float,
+        FakeType(
+            "derived",
+            model="Sale",
+            field="book_id",
+            value=ValueOf("book_id"),
+            fields=["price"],
+            row_op=typed_sum,
+            col_op=typed_sum,
+        ),
+    ]
+
+
+def new_generator() -> FakeSchemaGenerator:
+    schema_generator = FakeSchemaGenerator()
+    schema_generator.register(BookTotal)
+    return schema_generator
+
+
+def generate_shard(manifest: ShardManifest) -> tuple[ShardResult, dict[str, list]]:
+    schema_generator = new_generator()
+    result = schema_generator.generate_shard(manifest, batch_size=25)
+    return result, {model: list(schema_generator.data(model)) for model in manifest.rows}
+
+
+@pytest.fixture
+def coordinator():
+    return ShardCoordinator(new_generator(), rows={"Author": 30, "Book": 100, "Sale": 300}, shards=3, seed=7)
+
+
+class TestShardCoordinator:
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ShardCoordinator(new_generator(), rows=10, shards=0)
+        with pytest.raises(ValueError):
+            ShardCoordinator(new_generator(), rows={"Missing": 10}, shards=2)
+        with pytest.raises(ValueError):
+            ShardCoordinator(new_generator(), rows=2, shards=3)
+
+    def test_manifests(self, coordinator, tmp_path):
+        manifests = coordinator.manifests()
+
+        assert [m.rows["Book"] for m in manifests] == [34, 33, 33]
+        assert [m.key_ranges["book"] for m in manifests] == [(1, 35), (35, 68), (68, 101)]
+        assert manifests[0].key_space["book"] == (1, 101)
+        # Sales are looked up by book_id, by the totals and by their prices, so they stay in their shard, as do totals.
+        assert manifests[0].key_references == {"Book.author_id": "author"}
+        assert len({m.seed for m in manifests}) == 3
+        assert coordinator.manifests() == manifests
+
+        paths = coordinator.write(tmp_path)
+        assert [ShardManifest.load(p) for p in paths] == manifests
+
+    def test_shards(self, coordinator):
+        manifests = coordinator.manifests()
+        results, tables = zip(*[generate_shard(m) for m in manifests])
+
+        assert ShardCoordinator.merge(manifests, results) == {"Author": 30, "Book": 100, "BookTotal": 300, "Sale": 300}
+        books = [b for t in tables for b in t["Book"]]
+        assert sorted(b.id for b in books) == list(range(1, 101))
+        assert {b.author_id for b in books} <= set(range(1, 31))
+        # Books reference the authors of every shard, not only those of their own.
+        assert {b.author_id for b in tables[0]["Book"]} - set(range(*manifests[0].key_ranges["author"]))
+        for shard in tables:
+            book_ids = {b.id for b in shard["Book"]}
+            assert all(s.book_id in book_ids for s in shard["Sale"])
+            for total in shard["BookTotal"]:
+                prices = [s.price for s in shard["Sale"] if s.book_id == total.book_id]
+                assert total.sales == pytest.approx(sum(prices))
+
+        assert generate_shard(manifests[1])[1] == tables[1]
+
+    def test_processes(self, coordinator):
+        manifests = coordinator.manifests()
+        # Other tests may have started threads, which forked processes would inherit half-way.
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = [result for result, _ in executor.map(generate_shard, manifests)]
+
+        results = [ShardResult.from_dict(json.loads(json.dumps(r.to_dict()))) for r in results]
+        assert ShardCoordinator.merge(manifests, reversed(results))["Sale"] == 300
+
+    def test_merge_mismatches(self, coordinator):
+        manifests = coordinator.manifests()
+        results = [generate_shard(m)[0] for m in manifests]
+        results[1].rows["Book"] -= 1
+        low, high, count = results[2].keys["author"]
+        results[2].keys["author"] = (low, high, count - 1)
+
+        with pytest.raises(ValueError) as error:
+            ShardCoordinator.merge(manifests, [*results, results[0]])
+        message = str(error.value)
+        assert "shard 0: more than one result" in message
+        assert "shard 1: 32 rows of Book instead of 33" in message
+        assert "shard 2: keys" in message
+        with pytest.raises(ValueError, match="shard 2: no result"):
+            ShardCoordinator.merge(manifests, results[:2])
@@ -0,0 +1,244 @@
+import csv
+import datetime
+import json
+import re
+import sqlite3
+import struct
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Annotated
+from typing import Optional
+
+from fake_schema_generator import CSVSink
+from fake_schema_generator import FakeType
+from fake_schema_generator import NDJSONSink
+from fake_schema_generator import PostgresCopySink
+from fake_schema_generator import SQLiteSink
+
+
+@dataclass
+class Event:
+    id: Annotated[int, FakeType("sequential_number")]
+    name: Annotated[str, FakeType("name")]
+    at: Annotated[datetime.datetime, FakeType("date_time")]
+    price: Annotated[Decimal, FakeType("pydecimal")]
+    note: Optional[str] = None
+
+
+@dataclass
+class Reading:
+    id: int
+    label: str
+    active: bool
+    ratio: float
+    price: Decimal
+    at: datetime.datetime
+    day: datetime.date
+    clock: datetime.time
+    took: datetime.timedelta
+    uid: uuid.UUID
+    blob: bytes
+    note: Optional[str] = None
+
+
+ROWS = [
+    Event(1, "Ann", datetime.datetime(2024, 6, 1, 12, 30), Decimal("1.50")),
+    Event(2, "Bob", datetime.datetime(2024, 6, 2), Decimal("2"), "late"),
+]
+
+
+def test_csv_sink(tmp_path):
+    sink = CSVSink(tmp_path / "csv")
+    sink.write(Event, ROWS[:1])
+    sink.write(Event, ROWS[1:])
+    sink.close()
+    with open(tmp_path / "csv" / "Event.csv", newline="") as file:
+        assert list(csv.reader(file)) == [
+            ["id", "name", "at", "price", "note"],
+            ["1", "Ann", "2024-06-01T12:30:00", "1.50", ""],
+            ["2", "Bob", "2024-06-02T00:00:00", "2", "late"],
+        ]
+
+
+def test_ndjson_sink(tmp_path):
+    sink = NDJSONSink(tmp_path)
+    sink.write(Event, ROWS)
+    sink.close()
+    with open(tmp_path / "Event.ndjson") as file:
+        assert [json.loads(line) for line in file] == [
+            {"id": 1, "name": "Ann", "at": "2024-06-01T12:30:00", "price": "1.50", "note": None},
+            {"id": 2, "name": "Bob", "at": "2024-06-02T00:00:00", "price": "2", "note": "late"},
+        ]
+
+
+def test_sqlite_sink(tmp_path):
+    sink = SQLiteSink(tmp_path / "events.db")
+    sink.write(Event, ROWS[:1])
+    sink.write(Event, ROWS[1:])
+    sink.close()
+    connection = sqlite3.connect(tmp_path / "events.db")
+    assert connection.execute('SELECT * FROM "Event"').fetchall() == [
+        (1, "Ann", "2024-06-01T12:30:00", "1.50", None),
+        (2, "Bob", "2024-06-02T00:00:00", "2", "late"),
+    ]
+    assert "INTEGER" in connection.execute("SELECT sql FROM sqlite_master").fetchone()[0]
+    connection.close()
+
+
+READINGS = [
+    Reading(
+        1,
+        "tab\there, line\nbreak, back\\slash and ünïcode",
+        True,
+        0.25,
+        Decimal("-12345.6789"),
+        datetime.datetime(2024, 6, 1, 12, 30, 15, 250),
+        datetime.date(1999, 12, 31),
+        datetime.time(23, 59, 59, 1),
+        datetime.timedelta(days=2, seconds=3, microseconds=4),
+        uuid.UUID(int=42),
+        b"\x00\xff",
+        "note",
+    ),
+    Reading(
+        2,
+        "",
+        False,
+        -1e300,
+        Decimal("0.00123"),
+        datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        datetime.date(2000, 1, 1),
+        datetime.time(0, 0),
+        datetime.timedelta(0),
+        uuid.UUID(int=0),
+        b"",
+    ),
+]
+POSTGRES_EPOCH = datetime.datetime(2000, 1, 1)
+
+
+def decode_numeric(data: bytes) -> Decimal:
+    ndigits, weight, sign, scale = struct.unpack("!hhHH", data[:8])
+    digits = struct.unpack(f"!{ndigits}h", data[8:])
+    value = sum(Decimal(d) * Decimal(10000) ** (weight - i) for i, d in enumerate(digits))
+    return (-value if sign == 0x4000 else value).quantize(Decimal(1).scaleb(-scale))
+
+
+BINARY_DECODERS = {
+    "bigint": lambda data: struct.unpack("!q", data)[0],
+    "boolean": lambda data: data == b"\x01",
+    "double precision": lambda data: struct.unpack("!d", data)[0],
+    "numeric": decode_numeric,
+    "text": lambda data: data.decode("utf-8"),
+    "bytea": bytes,
+    "timestamp": lambda data: POSTGRES_EPOCH + datetime.timedelta(microseconds=struct.unpack("!q", data)[0]),
+    "date": lambda data: datetime.date(2000, 1, 1) + datetime.timedelta(days=struct.unpack("!i", data)[0]),
+    "time": lambda data: (POSTGRES_EPOCH + datetime.timedelta(microseconds=struct.unpack("!q", data)[0])).time(),
+    "interval": lambda data: datetime.timedelta(
+        days=struct.unpack("!qii", data)[1], microseconds=struct.unpack("!qii", data)[0]
+    ),
+    "uuid": lambda data: uuid.UUID(bytes=data),
+}
+
+
+def decode_binary_copy(data: bytes, types: list[str]) -> list[tuple]:
+    """
+    A reference decoder of the binary COPY format, as described in the PostgreSQL documentation of COPY.
+    """
+    assert data[:11] == b"PGCOPY\n\xff\r\n\x00"
+    flags, extension = struct.unpack("!ii", data[11:19])
+    assert flags == 0
+    offset, rows = 19 + extension, []
+    while True:
+        (count,) = struct.unpack("!h", data[offset : offset + 2])
+        offset += 2
+        if count == -1:
+            assert offset == len(data)
+            return rows
+        assert count == len(types)
+        row = []
+        for column_type in types:
+            (length,) = struct.unpack("!i", data[offset : offset + 4])
+            offset += 4
+            if length == -1:
+                row.append(None)
+                continue
+            row.append(BINARY_DECODERS[column_type](data[offset : offset + length]))
+            offset += length
+        rows.append(tuple(row))
+
+
+TEXT_DECODERS = {
+    "bigint": int,
+    "boolean": lambda text: text == "t",
+    "double precision": float,
+    "numeric": Decimal,
+    "text": str,
+    "bytea": lambda text: bytes.fromhex(text[2:]),
+    "timestamp": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "interval": lambda text: datetime.timedelta(days=int(text.split()[0]), seconds=float(Decimal(text.split()[2]))),
+    "uuid": uuid.UUID,
+}
+
+
+def decode_text_copy(text: str, types: list[str]) -> list[tuple]:
+    """
+    A reference decoder of the text COPY format: a line per row, tab-separated columns, `\\N` for NULL and backslash
+    escapes.
+    """
+    escapes = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r"}
+    rows = []
+    for line in text.split("\n")[:-1]:
+        values = line.split("\t")
+        assert len(values) == len(types)
+        rows.append(
+            tuple(
+                None if value == "\\N" else TEXT_DECODERS[t](re.sub(r"\\.", lambda m: escapes[m.group()], value))
+                for value, t in zip(values, types)
+            )
+        )
+    return rows
+
+
+def expected_readings() -> list[tuple]:
+    rows = []
+    for r in READINGS:
+        at = r.at.astimezone(datetime.timezone.utc).replace(tzinfo=None) if r.at.tzinfo else r.at
+        rows.append((r.id, r.label, r.active, r.ratio, r.price, at, r.day, r.clock, r.took, r.uid, r.blob, r.note))
+    return rows
+
+
+def test_postgres_copy_sink_binary(tmp_path):
+    sink = PostgresCopySink(tmp_path, chunk_size=1)
+    sink.write(Reading, READINGS[:1])
+    sink.write(Reading, READINGS[1:])
+    sink.write(Event, ROWS)
+    sink.close()
+
+    types = list(PostgresCopySink.column_types(Reading).values())
+    assert types[:6] == ["bigint", "text", "boolean", "double precision", "numeric", "timestamp"]
+    assert types[-1] == "text"
+    assert decode_binary_copy((tmp_path / "Reading.copy").read_bytes(), types) == expected_readings()
+    events = decode_binary_copy(
+        (tmp_path / "Event.copy").read_bytes(), list(PostgresCopySink.column_types(Event).values())
+    )
+    assert events == [(e.id, e.name, e.at, e.price, e.note) for e in ROWS]
+
+    load = (tmp_path / "load.sql").read_text()
+    assert 'CREATE TABLE IF NOT EXISTS "Reading" ("id" bigint, "label" text, "active" boolean,' in load
+    assert "WITH (FORMAT binary)" in load
+
+
+def test_postgres_copy_sink_text(tmp_path):
+    sink = PostgresCopySink(tmp_path, binary=False)
+    sink.write(Reading, READINGS)
+    sink.close()
+
+    text = (tmp_path / "Reading.tsv").read_text(encoding="utf-8")
+    assert text.count("\n") == 2
+    types = list(PostgresCopySink.column_types(Reading).values())
+    assert decode_text_copy(text, types) == expected_readings()
+    assert "WITH (FORMAT text)" in (tmp_path / "load.sql").read_text()
@@ -0,0 +1,75 @@
+import operator
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from fake_schema_generator import SortedIndex
+
+COMPARISONS = [operator.lt, operator.le, operator.gt, operator.ge]
+
+
+@dataclass
+class Row:
+    id: int
+    group: int
+    value: int
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(0)
+    return [Row(i, rng.randint(0, 2), rng.randint(0, 30)) for i in range(200)]
+
+
+class TestSortedIndex:
+    @pytest.mark.parametrize("comparison", COMPARISONS)
+    def test_first_and_count(self, rows, comparison):
+        index = SortedIndex(("group",), "value")
+        for n, row in enumerate(rows, start=1):
+            index.add(row)
+            for value in (-1, 0, 15, 30, 31):
+                matching = [r for r in rows[:n] if r.group == row.group and comparison(value, r.value)]
+                assert index.first((row.group,), comparison, value) == (matching[0] if matching else None)
+                assert index.count((row.group,), comparison, value) == len(matching)
+        assert len(index) == len(rows)
+
+    def test_choice(self, rows):
+        index = SortedIndex((), "value")
+        index.extend(rows)
+        rng = random.Random(0)
+        picked = {index.choice(rng, (), operator.ge, 10).id for _ in range(500)}
+        assert picked == {r.id for r in rows if r.value <= 10}
+        assert index.choice(rng, (), operator.gt, 0) is None
+        assert index.choice(rng, (3,), operator.gt, 0) is None
+
+    def test_without_range(self, rows):
+        index = SortedIndex(("group",))
+        index.extend(rows)
+        assert index.first((1,)) == next(r for r in rows if r.group == 1)
+        assert index.count((1,)) == sum(r.group == 1 for r in rows)
+        assert index.first((3,)) is None
+
+    def test_unsupported_comparison(self, rows):
+        index = SortedIndex((), "value")
+        index.extend(rows)
+        with pytest.raises(ValueError):
+            index.first((), operator.ne, 1)
+
+    def test_fork(self, rows):
+        index = SortedIndex(("group",), "value")
+        index.extend(rows[:100])
+        fork = index.fork()
+        fork.extend(rows[100:150])
+        index.extend(rows[150:])
+        fork.add(Row(200, 3, 0))
+
+        expected = SortedIndex(("group",), "value")
+        expected.extend(rows[:150] + [Row(200, 3, 0)])
+        for group in range(4):
+            for value in (0, 15, 30):
+                assert fork.count((group,), operator.ge, value) == expected.count((group,), operator.ge, value)
+                assert fork.first((group,), operator.le, value) == expected.first((group,), operator.le, value)
+                matching = [r for r in rows if r.group == group and r.value <= value and (r.id < 100 or r.id >= 150)]
+                assert index.count((group,), operator.ge, value) == len(matching)
+        assert (len(index), len(fork)) == (150, 151)
@@ -0,0 +1,62 @@
+import operator
+import random
+
+import pytest
+
+from fake_schema_generator import SpillStorage
+from fake_schema_generator import SpillTable
+
+from .FakeSchemaGenerator_test import Order
+from .SQLiteStorage_test import Event
+from .SQLiteStorage_test import generate
+
+pytestmark = pytest.mark.usefixtures("frozen_now")
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SpillStorage(2_000, str(tmp_path), chunk_size=4, cached_chunks=2)
+    yield storage
+    storage.close()
+
+
+class TestSpillStorage:
+    def test_same_data_as_memory(self, storage):
+        in_memory = generate().data()
+        sg = generate(storage)
+        spilled = sg.data()
+        assert all(isinstance(table, SpillTable) for table in spilled.values())
+        assert spilled["Order"].spilled_rows > 0
+        assert len(sg._indexes["Order"][((), "id")]) == 30
+        assert set(spilled) == set(in_memory)
+        for model_name, rows in in_memory.items():
+            assert list(spilled[model_name]) == rows
+
+    def test_table(self, storage):
+        table = storage.table(Event)
+        events = [Event(i, i % 3, i % 7) for i in range(40)]
+        table.extend(events[:10])
+        index = table.build_index(("group",), "day")
+        table.extend(events[10:])
+        index.extend(events[10:])
+        assert 0 < table.spilled_rows < 40
+        assert len(table) == len(index) == 40
+        assert table[3] == events[3] and table[-1] == events[-1] and table[5:8] == events[5:8]
+        assert table == events
+        assert index.first((1,), operator.ge, 2) == next(e for e in events if e.group == 1 and e.day <= 2)
+        assert index.count((1,), operator.lt, 2) == sum(e.group == 1 and e.day > 2 for e in events)
+        assert index.choice(random.Random(0), (2,), operator.le, 5).group == 2
+        table.set_column("day", [0] * 40)
+        assert all(e.day == 0 for e in table)
+        assert len(table.sample(random.Random(0), 5)) == 5
+
+    def test_budget(self):
+        table = SpillTable(Order, 10**9, chunk_size=4)
+        table.extend([Order(i, 1, "2024-01-01", 1.0, "Pending") for i in range(20)])
+        assert table.spilled_rows == 0
+        table.memory_budget = 0
+        table.extend([Order(20, 1, "2024-01-01", 1.0, "Pending")])
+        # The newest chunk stays in memory.
+        assert table.spilled_rows == 20
+        assert [o.id for o in table] == list(range(21))
+        table.close()
@@ -0,0 +1,64 @@
+import re
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+from faker import Faker
+
+from fake_schema_generator import FakeSchemaGenerator
+from fake_schema_generator import FakeType
+from fake_schema_generator import TemplateProvider
+
+
+@pytest.fixture
+def faker():
+    fake = Faker()
+    fake.add_provider(TemplateProvider)
+    fake.seed_instance(0)
+    return fake
+
+
+@dataclass
+class Contact:
+    email: Annotated[str, FakeType("template", pattern="{{first_name}}.{{last_name}}@example.com")]
+    phone: Annotated[str, FakeType("template", pattern=["+44 7### ######", "(0%##) ### ####"])]
+
+
+class TestTemplateProvider:
+    def test_patterns(self, faker):
+        assert re.fullmatch(r"\w+\.\w+@example\.com", faker.template("{{first_name}}.{{ last_name }}@example.com"))
+        assert re.fullmatch(r"\+44 7\d{3} \d{6}", faker.template("+44 7### ######"))
+        assert re.fullmatch(r"[1-9][a-zA-Z]{3}", faker.template("%???"))
+        assert faker.template("{literal} braces") == "{literal} braces"
+        assert faker.template(["a", "b"]) in ("a", "b")
+
+    def test_compiled_once(self, faker):
+        provider = faker.template.__self__
+        templates = provider.compile("{{word}}-##")
+        assert provider.compile("{{word}}-##") is templates
+        assert templates[0].format_string == "{}-{}"
+        assert len(templates[0].parts) == 2
+
+    def test_errors(self, faker):
+        with pytest.raises(ValueError):
+            faker.template("{{not_a_formatter}}")
+        with pytest.raises(ValueError):
+            faker.template([])
+
+    def test_batch_matches_calls(self, faker):
+        pattern = ["{{word}} ##", "??-%"]
+        faker.seed_instance(1)
+        values = [faker.template(pattern) for _ in range(20)]
+        faker.seed_instance(1)
+        assert faker.template.__self__.batch(pattern, [None] * 20) == values
+
+    def test_schema(self):
+        schema_generator = FakeSchemaGenerator()
+        schema_generator.register(Contact)
+        schema_generator.generate(count=10, batch_size=4)
+
+        contacts = list(schema_generator.data(Contact))
+        assert len(contacts) == 10
+        assert all(re.fullmatch(r"\w+\.\w+@example\.com", c.email) for c in contacts)
+        assert all(re.fullmatch(r"\+44 7\d{3} \d{6}|\(0[1-9]\d\d\) \d{3} \d{4}", c.phone) for c in contacts)
+        assert all(p.batch_function is not None for p in schema_generator._plan)
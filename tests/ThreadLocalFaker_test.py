@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from faker import Faker
+from faker.providers import BaseProvider
+
+from fake_schema_generator import ThreadLocalFaker
+
+
+class GreetingProvider(BaseProvider):
+    def greeting(self) -> str:
+        return "hello"
+
+
+def thread_local_faker():
+    return ThreadLocalFaker(
+        Faker, lambda provider, fake: provider if isinstance(provider, type) else type(provider)(fake)
+    )
+
+
+def in_thread(function):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(function).result()
+
+
+class TestThreadLocalFaker:
+    def test_faker_per_thread(self):
+        fake = thread_local_faker()
+        own = fake.current()
+        assert fake.current() is own
+        other = in_thread(fake.current)
+        assert other is not own
+        assert other.random is not own.random
+
+    def test_seeding(self):
+        first, second = thread_local_faker(), thread_local_faker()
+        first.seed_instance(0)
+        second.seed_instance(0)
+        assert [first.random_int() for _ in range(5)] == [second.random_int() for _ in range(5)]
+        assert in_thread(lambda: first.pyint()) == in_thread(lambda: second.pyint())
+
+    def test_providers_are_added_to_every_thread(self):
+        fake = thread_local_faker()
+        other = in_thread(fake.current)
+        provider = GreetingProvider(fake.current())
+        fake.add_provider(provider)
+        assert fake.greeting.__self__ is provider
+        assert other.greeting() == "hello"
+        assert other.greeting.__self__ is not provider
+        assert in_thread(lambda: fake.greeting()) == "hello"
+
+    def test_formatter_calls_the_calling_thread(self):
+        fake = thread_local_faker()
+        fake.add_provider(GreetingProvider)
+        greeting = fake.formatter("greeting")
+        assert greeting() == "hello"
+        assert in_thread(greeting) == "hello"
@@ -0,0 +1,76 @@
+import sys
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from fake_schema_generator import SpillStorage
+from fake_schema_generator import SQLiteStorage
+from fake_schema_generator import arrow_table
+
+from .SQLiteStorage_test import generate
+
+pyarrow = pytest.importorskip("pyarrow")
+pytestmark = pytest.mark.usefixtures("frozen_now")
+
+
+@dataclass
+class Reading:
+    id: int
+    sensor: Optional[str]
+    value: int
+
+
+@pytest.fixture(params=["memory", "sqlite", "spill"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        yield None
+        return
+    storage = SQLiteStorage(str(tmp_path / "data.db")) if request.param == "sqlite" else SpillStorage(2_000)
+    yield storage
+    storage.close()
+
+
+class TestArrowTable:
+    def test_types(self):
+        table = arrow_table(Reading, {"id": [1, 2], "sensor": ["a", None], "value": [3, 4.5]})
+        assert table.schema.types == [pyarrow.int64(), pyarrow.string(), pyarrow.float64()]
+        assert table.to_pylist() == [{"id": 1, "sensor": "a", "value": 3}, {"id": 2, "sensor": None, "value": 4.5}]
+
+    def test_columns(self, storage):
+        sg = generate(storage)
+        orders = list(sg.data("Order"))
+        columns = sg.data("Order").columns(["total_amount", "id"])
+        assert list(columns) == ["total_amount", "id"]
+        assert columns["id"] == [o.id for o in orders]
+        assert columns["total_amount"] == [o.total_amount for o in orders]
+
+    def test_to_arrow(self, storage):
+        sg = generate(storage)
+        table = sg.to_arrow("Order")
+        assert table.num_rows == 30
+        assert table.column_names == ["id", "customer_id", "order_date", "total_amount", "order_status"]
+        # The order dates are hinted as str but are datetimes, so their type is inferred.
+        assert pyarrow.types.is_timestamp(table.schema.field("order_date").type)
+        assert table.to_pylist() == [asdict(o) for o in sg.data("Order")]
+
+    def test_to_pandas_and_polars(self):
+        pandas = pytest.importorskip("pandas")
+        polars = pytest.importorskip("polars")
+        sg = generate()
+        frame = sg.to_pandas("OrderProduct")
+        assert frame.shape == (len(sg.data("OrderProduct")), 5)
+        assert frame["quantity"].tolist() == [line.quantity for line in sg.data("OrderProduct")]
+        assert sg.to_polars("OrderProduct").to_dicts() == [asdict(line) for line in sg.data("OrderProduct")]
+
+        # Without pyarrow the frames are built from the columns as lists.
+        module = sys.modules["fake_schema_generator.fake_types.FakeSchemaGenerator"]
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(module, "optional_import", lambda name: None if name == "pyarrow" else pandas)
+            pandas.testing.assert_frame_equal(sg.to_pandas("OrderProduct"), frame, check_dtype=False)
+            monkeypatch.setattr(module, "optional_import", lambda name: None if name == "pyarrow" else polars)
+            assert sg.to_polars("OrderProduct").to_dicts() == [asdict(line) for line in sg.data("OrderProduct")]
+            monkeypatch.setattr(module, "optional_import", lambda name: None)
+            with pytest.raises(ImportError):
+                sg.to_polars("OrderProduct")
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+
+from fake_schema_generator import load_models
+from fake_schema_generator.cli import SINKS
+from fake_schema_generator.cli import main
+
+EXAMPLE = Path(__file__).parents[1] / "example" / "example_classes.py"
+
+
+def test_load_models():
+    assert [m.__name__ for m in load_models(EXAMPLE)] == ["Customer", "Order", "Product", "OrderProduct", "Payment"]
+    assert [m.__name__ for m in load_models("tests.cli_test")] == []
+
+
+def test_explain(capsys):
+    assert main(["explain", str(EXAMPLE), "--rows", "100", "--batch-size", "10"]) == 0
+    output = capsys.readouterr().out
+    assert output.startswith("Plan for 100 rows of each model in blocks of 10")
+    assert "OrderProduct.unit_price" in output and "index lookup" in output
+
+
+def test_explain_invalid_schema(capsys):
+    assert main(["explain", "tests.FakeSchemaGenerator_test"]) == 1
+    assert "InvalidOrderProduct.note: provider not_a_provider not found" in capsys.readouterr().err
+
+
+def test_help_lists_every_format(capsys, monkeypatch):
+    monkeypatch.setenv("COLUMNS", "200")
+    with pytest.raises(SystemExit):
+        main(["--help"])
+    assert f"as they're generated, as {', '.join(sorted(SINKS))}." in capsys.readouterr().out
+
+
+@pytest.mark.usefixtures("frozen_now")
+def test_generate(tmp_path, capsys):
+    args = ["generate", str(EXAMPLE), "--rows", "30", "--rows", "Customer=5", "--seed", "1", "--batch-size", "7"]
+    assert main([*args, "--format", "csv", "--output", str(tmp_path / "a")]) == 0
+    assert "Generated 125 rows" in capsys.readouterr().err
+    with open(tmp_path / "a" / "Customer.csv") as customers:
+        assert len(customers.readlines()) == 6
+    with open(tmp_path / "a" / "Payment.csv") as payments:
+        lines = payments.readlines()
+    assert lines[0] == "payment_id,order_id,payment_date,amount,payment_method,status\n"
+    assert len(lines) == 31
+
+    assert main([*args, "--format", "csv", "--output", str(tmp_path / "b")]) == 0
+    with open(tmp_path / "b" / "Payment.csv") as payments:
+        assert payments.readlines() == lines
+
+
+def test_generate_until_named_models_are_done(tmp_path, capsys):
+    assert main(["generate", str(EXAMPLE), "--rows", "Order=12", "--format", "ndjson", "--output", str(tmp_path)]) == 0
+    assert "  Customer: 12 rows" in capsys.readouterr().err
+    assert main(["generate", str(EXAMPLE), "--rows", "Missing=12", "--format", "ndjson", "--output", str(tmp_path)])
+    assert "Missing not found" in capsys.readouterr().err
+
+
+def test_generate_auto_batch_size(tmp_path, capsys):
+    args = [
+        "generate",
+        str(EXAMPLE),
+        "--rows",
+        "40",
+        "--batch-size",
+        "auto",
+        "--format",
+        "csv",
+        "--output",
+        str(tmp_path),
+    ]
+    assert main(args) == 0
+    err = capsys.readouterr().err
+    assert "Generated 200 rows" in err
+    assert "  Payment: 40 rows, batches of " in err
+
+
+def test_sharded_generation(tmp_path, capsys):
+    manifests = tmp_path / "manifests"
+    args = ["shard", str(EXAMPLE), "--rows", "60", "--shards", "3", "--seed", "5", "--output", str(manifests)]
+    assert main(args) == 0
+    assert "Wrote 3 manifests" in capsys.readouterr().err
+    for shard in range(3):
+        manifest = str(manifests / f"shard-{shard:04d}.json")
+        output = str(tmp_path / f"out-{shard}")
+        assert main(["generate", str(EXAMPLE), "--manifest", manifest, "--format", "csv", "--output", output]) == 0
+    assert "Shard 2 of 3" in capsys.readouterr().err
+
+    assert main(["merge", str(manifests)]) == 0
+    assert "3 shards, 300 rows" in capsys.readouterr().err
+    order_ids = []
+    for shard in range(3):
+        with open(tmp_path / f"out-{shard}" / "Order.csv") as orders:
+            order_ids += [int(line.split(",")[0]) for line in orders.readlines()[1:]]
+    assert sorted(order_ids) == list(range(1, 61))
+
+    (manifests / "shard-0001.result.json").unlink()
+    assert main(["merge", str(manifests)]) == 1
+    assert "shard 1: no result" in capsys.readouterr().err
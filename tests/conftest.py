@@ -0,0 +1,16 @@
+import datetime
+
+import faker.providers.date_time
+import pytest
+
+
+class FrozenDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 6, 1, 12, tzinfo=tz)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    # Faker's dates are relative to now, so generating the same data twice needs the same now.
+    monkeypatch.setattr(faker.providers.date_time, "datetime", FrozenDatetime)
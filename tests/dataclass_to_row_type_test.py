@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from dataclasses import field
+
+import pytest
+
+from fake_schema_generator import dataclass_to_row_type
+
+
+@dataclass
+class Product:
+    id: int
+    name: str
+    tags: list[str]
+
+
+@dataclass(kw_only=True)
+class Review:
+    id: int
+    product_id: int
+    score: int = field(default=0, init=False)
+
+
+class TestDataclassToRowType:
+    def test_row_type(self):
+        row_type = dataclass_to_row_type(Product)
+        row = row_type()
+        assert row_type.__name__ == "ProductRow"
+        assert (row.id, row.name, row.tags) == (None, None, None)
+        with pytest.raises(AttributeError):
+            row.missing = 1
+
+    def test_to_models(self):
+        row_type = dataclass_to_row_type(Product)
+        tags = ["a"]
+        models = row_type.to_models([row_type(1, "Chair", tags), row_type(2, "Table", [])])
+        assert models == [Product(1, "Chair", ["a"]), Product(2, "Table", [])]
+        # The values are passed through, not copied.
+        assert models[0].tags is tags
+
+    def test_to_models_with_keyword_only_fields(self):
+        row_type = dataclass_to_row_type(Review)
+        assert row_type.to_models([row_type(id=1, product_id=2)]) == [Review(id=1, product_id=2)]
@@ -0,0 +1,69 @@
+import random
+import sys
+from dataclasses import dataclass
+
+import pytest
+
+from fake_schema_generator import group_aggregate
+from fake_schema_generator import optional_import
+from fake_schema_generator import typed_product
+from fake_schema_generator import typed_sum
+
+
+@dataclass
+class Line:
+    order_id: object
+    unit_price: float
+    quantity: int
+
+
+@pytest.fixture
+def lines():
+    rng = random.Random(0)
+    return [Line(rng.randint(1, 20), round(rng.uniform(0.01, 100), 2), rng.randint(1, 10)) for _ in range(500)]
+
+
+def calculate(key, lines, row_op, col_op):
+    values = [row_op([line.unit_price, line.quantity]) for line in lines if line.order_id == key]
+    if len(values) == 0:
+        return 0
+    return values[0] if len(values) == 1 else col_op(values)
+
+
+class TestGroupAggregate:
+    @pytest.mark.parametrize("row_op", [typed_product, typed_sum])
+    def test_matches_calculate(self, lines, row_op):
+        keys = list(range(0, 22))
+        expected = [calculate(key, lines, row_op, typed_sum) for key in keys]
+        assert group_aggregate(keys, lines, "order_id", ["unit_price", "quantity"], row_op, typed_sum) == expected
+
+    def test_without_numpy(self, lines, monkeypatch):
+        keys = list(range(0, 22))
+        with_numpy = group_aggregate(keys, lines, "order_id", ["unit_price", "quantity"], typed_product, typed_sum)
+        module = sys.modules["fake_schema_generator.functions.group_aggregate"]
+        monkeypatch.setattr(module, "optional_import", lambda name: None)
+        assert (
+            group_aggregate(keys, lines, "order_id", ["unit_price", "quantity"], typed_product, typed_sum) == with_numpy
+        )
+
+    def test_custom_operators(self, lines):
+        keys = [1, 2, 99]
+        expected = [calculate(key, lines, max, min) for key in keys]
+        assert group_aggregate(keys, lines, "order_id", ["unit_price", "quantity"], max, min) == expected
+
+    def test_integers_stay_exact(self):
+        lines = [Line(1, 2**40, 2**40), Line(1, 1, 1)]
+        assert group_aggregate([1], lines, "order_id", ["unit_price", "quantity"], typed_product, typed_sum) == [
+            2**80 + 1
+        ]
+
+    def test_unhashable_keys(self, lines):
+        lines = [Line([1], 1.5, 2), Line([1], 2.0, 3), Line([2], 1.0, 1)]
+        assert group_aggregate([[1], [3]], lines, "order_id", ["unit_price", "quantity"], typed_product, typed_sum) == [
+            9.0,
+            0,
+        ]
+
+    def test_optional_import(self):
+        assert optional_import("a_module_that_does_not_exist") is None
+        assert optional_import("random") is random